@@ -0,0 +1,223 @@
+"""
+Simulador de MUCHAS CPUs en paralelo (vectorizado con NumPy)
+Mismo ISA que simulador_de_cpu.CPU, pero N máquinas avanzan en lockstep
+"""
+
+import time
+
+import numpy as np
+
+from simulador_de_cpu import CPU
+from trazas import SumideroNulo
+
+# Columnas de la matriz de flags
+FLAG_ZERO = 0
+FLAG_CARRY = 1
+FLAG_NEGATIVE = 2
+
+
+class CPUBatch:
+    """
+    N CPUs de 8 bits independientes guardadas como arrays:
+
+    - registros: N x 8   (uint8)
+    - memoria:   N x 256 (uint8)
+    - PC:        N
+    - flags:     N x 3   (ZERO, CARRY, NEGATIVE)
+
+    Cada paso() ejecuta UNA instrucción en todas las máquinas activas.
+    Las que hicieron HALT o salieron del programa quedan enmascaradas.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.registros = np.zeros((n, 8), dtype=np.uint8)
+        self.memoria = np.zeros((n, 256), dtype=np.uint8)
+        self.PC = np.zeros(n, dtype=np.int64)
+        self.IR = np.full(n, -1, dtype=np.int16)  # -1 = vacío (None en CPU)
+        self.flags = np.zeros((n, 3), dtype=bool)
+
+        # Estado de cada máquina
+        self.halt = np.zeros(n, dtype=bool)
+        self.error = np.zeros(n, dtype=bool)  # Donde CPU lanzaría IndexError
+
+        # Estadísticas (por máquina)
+        self.ciclos = np.zeros(n, dtype=np.int64)
+        self.instrucciones_ejecutadas = np.zeros(n, dtype=np.int64)
+        self.pasos_maquina = 0  # Instrucciones procesadas sumando todas las máquinas
+
+    def cargar(self, programa):
+        """Copia el mismo programa a la memoria de todas las máquinas"""
+        programa = np.asarray(programa, dtype=np.uint8)
+        self.memoria[:, :len(programa)] = programa
+
+    def paso(self, longitud):
+        """
+        Ejecuta un ciclo Fetch-Decode-Execute en todas las máquinas activas
+
+        Args:
+            longitud: tamaño del programa (una máquina para si PC >= longitud)
+
+        Returns:
+            int: número de máquinas que avanzaron
+        """
+        activos = np.flatnonzero((self.PC < longitud) & ~self.halt & ~self.error)
+        if activos.size == 0:
+            return 0
+
+        # FETCH + DECODE
+        pc = self.PC[activos]
+        ir = self.memoria[activos, pc]
+        self.IR[activos] = ir
+        pc += 1
+        opcode = ir >> 4
+        operando = ir & 0x0F
+        self.ciclos[activos] += 2
+
+        # Máquinas que en CPU lanzarían IndexError (R8-R15 o dirección fuera de memoria)
+        ls = (opcode == 0x1) | (opcode == 0x2)
+        fallo = ((opcode >= 0x1) & (opcode <= 0x4) & (operando > 7)) | (ls & (pc > 255))
+        if fallo.any():
+            self.error[activos[fallo]] = True
+            ok = ~fallo
+            activos, pc, opcode, operando, ls = activos[ok], pc[ok], opcode[ok], operando[ok], ls[ok]
+
+        # LOAD / STORE: la dirección está en el siguiente byte
+        if ls.any():
+            idx = activos[ls]
+            reg = operando[ls]
+            direccion = self.memoria[idx, pc[ls]]
+            pc[ls] += 1
+            es_load = opcode[ls] == 0x1
+            self.registros[idx[es_load], reg[es_load]] = \
+                self.memoria[idx[es_load], direccion[es_load]]
+            es_store = ~es_load
+            self.memoria[idx[es_store], direccion[es_store]] = \
+                self.registros[idx[es_store], reg[es_store]]
+
+        # ADD / SUB sobre R0
+        alu = (opcode == 0x3) | (opcode == 0x4)
+        if alu.any():
+            idx = activos[alu]
+            r0 = self.registros[idx, 0].astype(np.int16)
+            rn = self.registros[idx, operando[alu]].astype(np.int16)
+            resultado = np.where(opcode[alu] == 0x3, r0 + rn, r0 - rn)
+            self.flags[idx, FLAG_ZERO] = resultado == 0
+            self.flags[idx, FLAG_CARRY] = (resultado > 255) | (resultado < 0)
+            self.flags[idx, FLAG_NEGATIVE] = resultado < 0
+            self.registros[idx, 0] = (resultado & 0xFF).astype(np.uint8)
+
+        # MOV Rd, Rs
+        mov = opcode == 0x5
+        if mov.any():
+            idx = activos[mov]
+            op = operando[mov]
+            self.registros[idx, op >> 2] = self.registros[idx, op & 0x3]
+
+        # HALT: no cuenta ciclo de execute ni instrucción
+        halt = opcode == 0xF
+        self.halt[activos[halt]] = True
+        sigue = activos[~halt]
+        self.ciclos[sigue] += 1
+        self.instrucciones_ejecutadas[sigue] += 1
+
+        self.PC[activos] = pc
+        self.pasos_maquina += activos.size
+        return activos.size
+
+    def ejecutar_programa(self, programa):
+        """
+        Carga el programa y avanza todas las máquinas hasta que ninguna siga activa
+
+        Returns:
+            int: número de pasos (lockstep) ejecutados
+        """
+        self.cargar(programa)
+        pasos = 0
+        while self.paso(len(programa)):
+            pasos += 1
+        return pasos
+
+    def a_cpu(self, i):
+        """Copia el estado de la máquina i a un CPU normal (para comparar)"""
+        cpu = CPU(traza=SumideroNulo())
+        cpu.restaurar(self.registros[i], self.memoria[i])
+        cpu.PC = int(self.PC[i])
+        cpu.IR = None if self.IR[i] < 0 else int(self.IR[i])
+        cpu.flags['ZERO'] = bool(self.flags[i, FLAG_ZERO])
+        cpu.flags['CARRY'] = bool(self.flags[i, FLAG_CARRY])
+        cpu.flags['NEGATIVE'] = bool(self.flags[i, FLAG_NEGATIVE])
+        cpu.ciclos = int(self.ciclos[i])
+        cpu.instrucciones_ejecutadas = int(self.instrucciones_ejecutadas[i])
+        return cpu
+
+
+def mismo_estado(a, b):
+    """Compara dos CPU (registros, flags, PC, IR, contadores y memoria)"""
+    return (bytes(a.registros) == bytes(b.registros) and a.flags == b.flags
+            and a.PC == b.PC and a.IR == b.IR and a.ciclos == b.ciclos
+            and a.instrucciones_ejecutadas == b.instrucciones_ejecutadas
+            and bytes(a.memoria) == bytes(b.memoria))
+
+
+if __name__ == "__main__":
+    # ========================================
+    # EXPERIMENTO: ADD y SUB para TODOS los pares 256 x 256
+    # ========================================
+    print("=" * 70)
+    print("🧮 FLAGS DE ADD/SUB PARA LOS 65,536 PARES DE OPERANDOS")
+    print("=" * 70)
+
+    a, b = np.meshgrid(np.arange(256), np.arange(256), indexing='ij')
+    programas = {
+        "ADD": [0x31, 0xF0],  # ADD R0, R1 ; HALT
+        "SUB": [0x41, 0xF0],  # SUB R0, R1 ; HALT
+    }
+
+    for nombre, programa in programas.items():
+        lote = CPUBatch(256 * 256)
+        lote.registros[:, 0] = a.ravel()
+        lote.registros[:, 1] = b.ravel()
+
+        inicio = time.perf_counter()
+        lote.ejecutar_programa(programa)
+        segundos = time.perf_counter() - inicio
+
+        print(f"\n{nombre}:")
+        print(f"   ZERO:     {lote.flags[:, FLAG_ZERO].sum():,} casos")
+        print(f"   CARRY:    {lote.flags[:, FLAG_CARRY].sum():,} casos")
+        print(f"   NEGATIVE: {lote.flags[:, FLAG_NEGATIVE].sum():,} casos")
+        print(f"   {lote.pasos_maquina:,} pasos-máquina en {segundos * 1000:.1f} ms "
+              f"({lote.pasos_maquina / segundos / 1e6:.1f} M pasos/s)")
+
+        # Verifica una muestra contra el CPU normal
+        for i in np.random.default_rng(0).integers(0, lote.n, 200):
+            cpu = CPU(traza=SumideroNulo())
+            cpu.registros[0] = a.ravel()[i]
+            cpu.registros[1] = b.ravel()[i]
+            cpu.ejecutar_rapido(programa)
+            assert mismo_estado(cpu, lote.a_cpu(i))
+        print("   ✅ Coincide con CPU individual (muestra de 200)")
+
+    # ========================================
+    # VERIFICACIÓN: errores en modo rápido y JIT dejan el mismo estado
+    # ========================================
+    programas_con_error = {
+        "ADD R0, R8": [0x11, 5, 0x31, 0x38, 0xF0],
+        "LOAD R9": [0x31, 0x19, 3, 0xF0],
+        "STORE R10": [0x31, 0x2A, 3, 0xF0],
+        "LOAD sin dirección": [0x31] * 255 + [0x11],
+        "STORE en el código": [0x21, 3, 0x31, 0xF0, 0x39],
+    }
+    for nombre, programa in programas_con_error.items():
+        cpus = []
+        for modo in ("ejecutar_programa", "ejecutar_rapido", "ejecutar_jit"):
+            cpu = CPU(traza=SumideroNulo())
+            cpu.registros[:] = bytes(range(1, 9))
+            try:
+                getattr(cpu, modo)(programa)
+            except IndexError:
+                pass
+            cpus.append(cpu)
+        assert mismo_estado(cpus[0], cpus[1]) and mismo_estado(cpus[0], cpus[2]), nombre
+    print("\n✅ ejecutar_rapido y ejecutar_jit: mismo estado que ejecutar_programa tras un IndexError")
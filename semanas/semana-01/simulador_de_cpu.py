@@ -3,16 +3,158 @@ Simulador simplificado de CPU
 Demuestra el ciclo Fetch-Decode-Execute
 """
 
+from functools import lru_cache
+
+from trazas import SumideroConsola, flags_a_byte
+
+# Códigos internos de la tabla predecodificada (modo rápido)
+_NOP, _LOAD, _STORE, _ADD, _SUB, _MOV, _HALT, _DESCONOCIDO = range(8)
+
+
+def _decodificar_en(codigo, pc):
+    """
+    Decodifica UNA instrucción en la dirección pc
+
+    Returns:
+        tuple: (tipo, a, b, pc_siguiente)
+    """
+    ir = codigo[pc]
+    opcode = (ir & 0xF0) >> 4
+    operando = ir & 0x0F
+
+    if opcode == 0x1 or opcode == 0x2:  # LOAD / STORE llevan dirección en el siguiente byte
+        direccion = codigo[pc + 1] if pc + 1 < len(codigo) else None
+        return (_LOAD if opcode == 0x1 else _STORE, operando, direccion, pc + 2)
+    if opcode == 0x3 or opcode == 0x4:
+        return (_ADD if opcode == 0x3 else _SUB, operando, 0, pc + 1)
+    if opcode == 0x5:
+        return (_MOV, operando >> 2, operando & 0x3, pc + 1)
+    if opcode == 0x0:
+        return (_NOP, 0, 0, pc + 1)
+    if opcode == 0xF:
+        return (_HALT, 0, 0, pc + 1)
+    return (_DESCONOCIDO, opcode, 0, pc + 1)
+
+
+@lru_cache(maxsize=256)
+def _predecodificar(codigo, n):
+    """
+    Predecodifica un programa completo UNA sola vez
+
+    Args:
+        codigo: bytes del programa (+1 byte de memoria extra,
+                por si la última instrucción es LOAD/STORE)
+        n: longitud del programa
+
+    Returns:
+        tuple: una entrada (tipo, a, b, pc_siguiente) por dirección
+    """
+    return tuple(_decodificar_en(codigo, pc) for pc in range(n))
+
+
+def _redecodificar(tabla, memoria, direccion, n):
+    """Código auto-modificable: redecodifica (en la misma lista) las entradas que leen memoria[direccion]"""
+    for pc in (direccion - 1, direccion):
+        if 0 <= pc < n:
+            tabla[pc] = _decodificar_en(memoria, pc)
+
+
+@lru_cache(maxsize=1024)
+def _compilar_bloque(codigo, inicio, n):
+    """
+    Traduce un bloque básico a UNA función de Python (JIT de bloques)
+
+    El bloque va desde `inicio` hasta HALT, el fin del programa o un STORE
+    que escribe en la zona de código (ese STORE cierra el bloque).
+    La caché va por (código, inicio): si un STORE cambia el código, la
+    siguiente búsqueda usa bytes nuevos y la traducción vieja ya no se usa.
+    Una instrucción con registro o dirección fuera de rango también cierra
+    el bloque: la función vuelca registros y flags de las anteriores y
+    después lanza IndexError, y pc_siguiente queda donde lo deja execute.
+
+    Returns:
+        tuple: (funcion, pc_siguiente, instrucciones, halt, ir_final, fuente)
+    """
+    cuerpo = []
+    leidos, escritos = set(), set()
+    ultima_alu = None  # (tipo) de la última ADD/SUB: define los flags
+    pc = inicio
+    instrucciones = 0
+    halt = False
+    fallo = False
+    ir_final = None
+
+    def leer(r):
+        if r not in escritos:
+            leidos.add(r)
+        return f"r{r}"
+
+    while pc < n:
+        tipo, a, b, siguiente = _decodificar_en(codigo, pc)
+        ir_final = codigo[pc]
+
+        if tipo in (_LOAD, _STORE, _ADD, _SUB) and (a > 7 or b is None):
+            # Igual que el CPU normal: registro o dirección fuera de rango
+            # (el PC ya pasó el opcode y, si existe, el byte de dirección)
+            pc += 2 if tipo in (_LOAD, _STORE) and b is not None else 1
+            fallo = True
+            break
+        if tipo == _LOAD:
+            cuerpo.append(f"r{a} = M[{b}]")
+            escritos.add(a)
+        elif tipo == _STORE:
+            cuerpo.append(f"M[{b}] = {leer(a)}")
+        elif tipo == _ADD or tipo == _SUB:
+            signo = '+' if tipo == _ADD else '-'
+            cuerpo.append(f"t = {leer(0)} {signo} {leer(a)}")
+            cuerpo.append("r0 = t & 0xFF")
+            escritos.add(0)
+            ultima_alu = tipo
+        elif tipo == _MOV:
+            cuerpo.append(f"r{a} = {leer(b)}")
+            escritos.add(a)
+        elif tipo == _HALT:
+            pc = siguiente
+            halt = True
+            break
+
+        pc = siguiente
+        instrucciones += 1
+        if tipo == _STORE and b <= n:
+            break  # Escribe en la zona de código: fin del bloque
+
+    # Vuelca registros modificados y flags de la última operación ALU
+    for r in sorted(escritos):
+        cuerpo.append(f"R[{r}] = r{r}")
+    if ultima_alu == _ADD:
+        cuerpo.append("F['ZERO'] = t == 0; F['CARRY'] = t > 255; F['NEGATIVE'] = False")
+    elif ultima_alu == _SUB:
+        cuerpo.append("F['ZERO'] = t == 0; F['CARRY'] = F['NEGATIVE'] = t < 0")
+    if fallo:
+        cuerpo.append("raise IndexError('registro o dirección fuera de rango')")
+
+    cargas = [f"r{r} = R[{r}]" for r in sorted(leidos)]
+    lineas = cargas + cuerpo or ["pass"]
+    fuente = f"def bloque_{inicio}(R, M, F):\n" + "".join(f"    {l}\n" for l in lineas)
+
+    espacio = {}
+    exec(compile(fuente, f"<bloque pc={inicio}>", "exec"), espacio)
+    return espacio[f"bloque_{inicio}"], pc, instrucciones, halt, ir_final, fuente
+
+
 class CPU:
     """
     Simulador de CPU de 8 bits con arquitectura simple
+
+    Registros y memoria son bytearray de tamaño fijo (R0-R7 = registros[0..7]),
+    así miles de instancias ocupan poco y el bucle rápido indexa directo.
     """
-    def __init__(self):
+    __slots__ = ('registros', 'PC', 'IR', 'ACC', 'flags', 'memoria',
+                 'ciclos', 'instrucciones_ejecutadas', 'traza')
+
+    def __init__(self, traza=None):
         # Registros de propósito general (8 bits)
-        self.registros = {
-            'R0': 0, 'R1': 0, 'R2': 0, 'R3': 0,
-            'R4': 0, 'R5': 0, 'R6': 0, 'R7': 0
-        }
+        self.registros = bytearray(8)
         
         # Registros especiales
         self.PC = 0  # Program Counter (dirección de instrucción actual)
@@ -27,11 +169,42 @@ class CPU:
         }
         
         # Memoria (256 bytes)
-        self.memoria = [0] * 256
+        self.memoria = bytearray(256)
         
         # Estadísticas
         self.ciclos = 0
         self.instrucciones_ejecutadas = 0
+        
+        # Traza: consola por defecto (modo enseñanza); SumideroNulo para volumen
+        self.traza = traza if traza is not None else SumideroConsola()
+    
+    def cargar(self, programa, inicio=0):
+        """
+        Copia un programa a memoria a través de un memoryview
+
+        Args:
+            programa: bytes, bytearray, memoryview o lista de ints (0-255)
+            inicio: dirección donde empieza a cargarse
+        """
+        if isinstance(programa, list):
+            programa = bytes(programa)
+        datos = memoryview(programa).cast('B')
+        memoryview(self.memoria)[inicio:inicio + len(datos)] = datos
+    
+    def snapshot(self):
+        """
+        Vista de solo lectura (sin copiar) de registros y memoria
+
+        Returns:
+            tuple: (memoryview registros, memoryview memoria) — bytes(vista) para congelarla
+        """
+        return (memoryview(self.registros).toreadonly(),
+                memoryview(self.memoria).toreadonly())
+    
+    def restaurar(self, registros, memoria):
+        """Restaura registros y memoria desde cualquier buffer (p. ej. un snapshot)"""
+        memoryview(self.registros)[:] = registros
+        memoryview(self.memoria)[:] = memoria
     
     def actualizar_flags(self, resultado):
         """Actualiza flags según resultado de operación"""
@@ -44,11 +217,14 @@ class CPU:
         FASE 1: FETCH
         Busca instrucción de memoria apuntada por PC
         """
-        print(f"\n[FETCH] PC={self.PC}")
+        texto = self.traza.texto
+        if texto:
+            self.traza.escribir(f"\n[FETCH] PC={self.PC}")
         
         # Lee instrucción de memoria
         self.IR = self.memoria[self.PC]
-        print(f"  Instrucción cargada en IR: 0x{self.IR:02X}")
+        if texto:
+            self.traza.escribir(f"  Instrucción cargada en IR: 0x{self.IR:02X}")
         
         # Incrementa PC para siguiente instrucción
         self.PC += 1
@@ -59,13 +235,16 @@ class CPU:
         FASE 2: DECODE
         Decodifica instrucción y determina operación
         """
-        print(f"[DECODE] Analizando instrucción...")
+        texto = self.traza.texto
+        if texto:
+            self.traza.escribir(f"[DECODE] Analizando instrucción...")
         
         # En CPU real, esto es hardware. Aquí lo simulamos
         # Formato simple: [4 bits opcode][4 bits operando]
-        opcode = (self.IRContinuar10:16 p.m.& 0xF0) >> 4  # 4 bits superiores
-        in poperando = self.IR & 0x0F  # 4 bits inferiores
-        print(f"  Opcode: 0x{opcode:X}, Operando: 0x{operando:X}")
+        opcode = (self.IR & 0xF0) >> 4  # 4 bits superiores
+        operando = self.IR & 0x0F  # 4 bits inferiores
+        if texto:
+            self.traza.escribir(f"  Opcode: 0x{opcode:X}, Operando: 0x{operando:X}")
         
         self.ciclos += 1
         return opcode, operando
@@ -75,62 +254,76 @@ class CPU:
         FASE 3: EXECUTE
         Ejecuta la operación decodificada
         """
-        print(f"[EXECUTE] Ejecutando operación...")
+        texto = self.traza.texto
+        escribir = self.traza.escribir
+        if texto:
+            escribir(f"[EXECUTE] Ejecutando operación...")
         
         # Set de instrucciones simplificado
         if opcode == 0x0:  # NOP (No Operation)
-            print("  NOP - No hace nada")
+            if texto:
+                escribir("  NOP - No hace nada")
         
         elif opcode == 0x1:  # LOAD Rn, [memoria]
-            registro = f'R{operando}'
             direccion = self.memoria[self.PC]
             self.PC += 1
-            self.registros[registro] = self.memoria[direccion]
-            print(f"  LOAD {registro}, [{direccion}]")
-            print(f"  {registro} = {self.registros[registro]}")
+            self.registros[operando] = self.memoria[direccion]
+            if texto:
+                escribir(f"  LOAD R{operando}, [{direccion}]")
+                escribir(f"  R{operando} = {self.registros[operando]}")
         
         elif opcode == 0x2:  # STORE [memoria], Rn
-            registro = f'R{operando}'
             direccion = self.memoria[self.PC]
             self.PC += 1
-            self.memoria[direccion] = self.registros[registro]
-            print(f"  STORE [{direccion}], {registro}")
-            print(f"  Memoria[{direccion}] = {self.memoria[direccion]}")
+            self.memoria[direccion] = self.registros[operando]
+            if texto:
+                escribir(f"  STORE [{direccion}], R{operando}")
+                escribir(f"  Memoria[{direccion}] = {self.memoria[direccion]}")
         
         elif opcode == 0x3:  # ADD R0, Rn
-            registro = f'R{operando}'
-            resultado = self.registros['R0'] + self.registros[registro]
+            resultado = self.registros[0] + self.registros[operando]
             self.actualizar_flags(resultado)
-            self.registros['R0'] = resultado & 0xFF  # Mantener 8 bits
-            print(f"  ADD R0, {registro}")
-            print(f"  R0 = {self.registros['R0']} (Flags: Z={self.flags['ZERO']}, C={self.flags['CARRY']})")
+            self.registros[0] = resultado & 0xFF  # Mantener 8 bits
+            if texto:
+                escribir(f"  ADD R0, R{operando}")
+                escribir(f"  R0 = {self.registros[0]} (Flags: Z={self.flags['ZERO']}, C={self.flags['CARRY']})")
         
         elif opcode == 0x4:  # SUB R0, Rn
-            registro = f'R{operando}'
-            resultado = self.registros['R0'] - self.registros[registro]
+            resultado = self.registros[0] - self.registros[operando]
             self.actualizar_flags(resultado)
-            self.registros['R0'] = resultado & 0xFF
-            print(f"  SUB R0, {registro}")
-            print(f"  R0 = {self.registros['R0']}")
+            self.registros[0] = resultado & 0xFF
+            if texto:
+                escribir(f"  SUB R0, R{operando}")
+                escribir(f"  R0 = {self.registros[0]}")
         
         elif opcode == 0x5:  # MOV Rd, Rs
             rd = operando >> 2  # 2 bits para destino
             rs = operando & 0x3  # 2 bits para source
-            self.registros[f'R{rd}'] = self.registros[f'R{rs}']
-            print(f"  MOV R{rd}, R{rs}")
-            print(f"  R{rd} = {self.registros[f'R{rd}']}")
+            self.registros[rd] = self.registros[rs]
+            if texto:
+                escribir(f"  MOV R{rd}, R{rs}")
+                escribir(f"  R{rd} = {self.registros[rd]}")
         
         elif opcode == 0xF:  # HALT
-            print("  HALT - Deteniendo CPU")
+            if texto:
+                escribir("  HALT - Deteniendo CPU")
             return False  # Señal de parada
         
         else:
-            print(f"  ⚠️  Opcode desconocido: 0x{opcode:X}")
+            if texto:
+                escribir(f"  ⚠️  Opcode desconocido: 0x{opcode:X}")
         
         self.ciclos += 1
         self.instrucciones_ejecutadas += 1
         return True  # Continuar ejecución
 
+    def _registrar_traza(self, pc):
+        """Envía el estado tras una instrucción a un sumidero estructurado"""
+        self.traza.registrar(
+            self.ciclos, pc, self.IR, self.registros,
+            flags_a_byte(self.flags['ZERO'], self.flags['CARRY'], self.flags['NEGATIVE'])
+        )
+
     def ejecutar_programa(self, programa):
         """
         Ejecuta programa completo
@@ -138,58 +331,191 @@ class CPU:
         Args:
             programa: Lista de instrucciones (bytes)
         """
-        print("=" * 70)
-        print("INICIANDO EJECUCIÓN DE PROGRAMA")
-        print("=" * 70)
+        traza = self.traza
+        texto = traza.texto
+        if texto:
+            traza.escribir("=" * 70)
+            traza.escribir("INICIANDO EJECUCIÓN DE PROGRAMA")
+            traza.escribir("=" * 70)
         
         # Carga programa en memoria
-        for i, instruccion in enumerate(programa):
-            self.memoria[i] = instruccion
+        self.cargar(programa)
         
-        print(f"Programa cargado: {len(programa)} bytes")
-        print(f"Dirección inicial: 0x{0:04X}")
-        print()
+        if texto:
+            traza.escribir(f"Programa cargado: {len(programa)} bytes")
+            traza.escribir(f"Dirección inicial: 0x{0:04X}")
+            traza.escribir("")
         
         # Ciclo Fetch-Decode-Execute
         while self.PC < len(programa):
-            print(f"\n{'─' * 70}")
-            print(f"CICLO #{self.ciclos + 1}")
-            print(f"{'─' * 70}")
+            if texto:
+                traza.escribir(f"\n{'─' * 70}")
+                traza.escribir(f"CICLO #{self.ciclos + 1}")
+                traza.escribir(f"{'─' * 70}")
             
+            pc = self.PC
             self.fetch()
             opcode, operando = self.decode()
             continuar = self.execute(opcode, operando)
+            if traza.estructurado:
+                self._registrar_traza(pc)
             
             if not continuar:
                 break
             
             # Muestra estado de registros
-            self.mostrar_registros()
+            if texto:
+                self.mostrar_registros()
         
-        print("\n" + "=" * 70)
-        print("PROGRAMA FINALIZADO")
-        print("=" * 70)
-        self.mostrar_estadisticas()
+        if texto:
+            traza.escribir("\n" + "=" * 70)
+            traza.escribir("PROGRAMA FINALIZADO")
+            traza.escribir("=" * 70)
+            self.mostrar_estadisticas()
+
+    def ejecutar_rapido(self, programa):
+        """
+        Ejecuta programa en modo rápido (nunca imprime)
+
+        El programa se predecodifica UNA vez a una tabla (tipo, a, b, pc_siguiente)
+        y luego se despacha en un bucle compacto con registros en variables locales.
+        Produce los mismos registros, flags, ciclos e instrucciones_ejecutadas
+        que ejecutar_programa, también si una instrucción lanza IndexError
+        (registro o dirección fuera de rango). Si la traza es estructurada
+        (anillo, binaria), recibe un registro por instrucción como en el modo normal.
+
+        Args:
+            programa: Lista de instrucciones (bytes)
+        """
+        self.cargar(programa)
+        memoria = self.memoria
+        n = len(programa)
+
+        # Copia propia de la tabla cacheada: un STORE al código la parcha en el sitio
+        tabla = list(_predecodificar(bytes(memoria[:n + 1]), n))
+
+        # Estado en variables locales (sin atributos ni f-strings en el bucle)
+        R = self.registros
+        z = self.flags['ZERO']
+        c = self.flags['CARRY']
+        neg = self.flags['NEGATIVE']
+        pc = self.PC
+        ir = self.IR
+        ejecutadas = 0
+        halt = False
+        registra = self.traza.estructurado
+        registrar = self.traza.registrar
+        ciclos_base = self.ciclos
+
+        fallo = False
+        try:
+            while pc < n:
+                ir = memoria[pc]
+                tipo, a, b, siguiente = tabla[pc]
+
+                if tipo == _ADD:
+                    resultado = R[0] + R[a]
+                    z = resultado == 0
+                    neg = False  # Registros de 8 bits: la suma nunca es negativa
+                    c = resultado > 255
+                    R[0] = resultado & 0xFF
+                elif tipo == _SUB:
+                    resultado = R[0] - R[a]
+                    z = resultado == 0
+                    neg = c = resultado < 0
+                    R[0] = resultado & 0xFF
+                elif tipo == _LOAD:
+                    if b is None:
+                        raise IndexError('dirección fuera de la memoria')
+                    R[a] = memoria[b]
+                elif tipo == _MOV:
+                    R[a] = R[b]
+                elif tipo == _STORE:
+                    if b is None:
+                        raise IndexError('dirección fuera de la memoria')
+                    memoria[b] = R[a]
+                    if b <= n:
+                        _redecodificar(tabla, memoria, b, n)
+                elif tipo == _HALT:
+                    if registra:
+                        registrar(ciclos_base + 3 * ejecutadas + 2, pc, ir, R,
+                                  flags_a_byte(z, c, neg))
+                    pc = siguiente
+                    halt = True
+                    break
+
+                if registra:
+                    registrar(ciclos_base + 3 * ejecutadas + 3, pc, ir, R,
+                              flags_a_byte(z, c, neg))
+                pc = siguiente
+                ejecutadas += 1
+        except IndexError:
+            # Como execute: fetch y decode ya contaron sus ciclos y el PC pasó
+            # el opcode y, si se llegó a leer, el byte de dirección
+            fallo = True
+            pc += 2 if tipo in (_LOAD, _STORE) and b is not None else 1
+            raise
+        finally:
+            # Vuelca estado local al objeto (también si una instrucción falló)
+            self.flags['ZERO'] = z
+            self.flags['CARRY'] = c
+            self.flags['NEGATIVE'] = neg
+            self.PC = pc
+            self.IR = ir
+            self.instrucciones_ejecutadas += ejecutadas
+            self.ciclos += 3 * ejecutadas + (2 if halt or fallo else 0)
+
+    def ejecutar_jit(self, programa):
+        """
+        Ejecuta programa traduciendo cada bloque básico a una función compilada
+
+        Un programa en línea recta hasta HALT cuesta una búsqueda en la caché
+        y UNA llamada, en vez de fetch/decode/execute por byte. Mismo estado
+        final que ejecutar_programa (no genera traza por instrucción),
+        también si una instrucción lanza IndexError.
+
+        Args:
+            programa: Lista de instrucciones (bytes)
+        """
+        self.cargar(programa)
+        memoria = self.memoria
+        n = len(programa)
+
+        while self.PC < n:
+            bloque, siguiente, instrucciones, halt, ir, _ = _compilar_bloque(
+                bytes(memoria[:n + 1]), self.PC, n)
+            fallo = False
+            try:
+                bloque(self.registros, memoria, self.flags)
+            except IndexError:
+                fallo = True  # Fetch y decode de la instrucción que falló ya corrieron
+                raise
+            finally:
+                self.PC = siguiente
+                self.IR = ir
+                self.instrucciones_ejecutadas += instrucciones
+                self.ciclos += 3 * instrucciones + (2 if halt or fallo else 0)
+            if halt:
+                break
 
     def mostrar_registros(self):
-        """Muestra estado actual de registros"""
-        print("\n📊 Estado de Registros:")
-        for reg, valor in list(self.registros.items())[:4]:
-            print(f"  {reg} = {valor:3d} (0x{valor:02X})", end="    ")
-        print()
-        for reg, valor in list(self.registros.items())[4:8]:
-            print(f"  {reg} = {valor:3d} (0x{valor:02X})", end="    ")
-        print()
+        """Muestra estado actual de registros (por la traza de texto)"""
+        escribir = self.traza.escribir
+        escribir("\n📊 Estado de Registros:")
+        for inicio in (0, 4):
+            escribir("".join(f"  R{i} = {valor:3d} (0x{valor:02X})    "
+                             for i, valor in enumerate(self.registros[inicio:inicio + 4], start=inicio)))
 
     def mostrar_estadisticas(self):
-        """Muestra estadísticas de ejecución"""
-        print(f"\n📈 Estadísticas:")
-        print(f"  Ciclos totales: {self.ciclos}")
-        print(f"  Instrucciones ejecutadas: {self.instrucciones_ejecutadas}")
-        print(f"  CPI (Cycles Per Instruction): {self.ciclos / max(self.instrucciones_ejecutadas, 1):.2f}")
+        """Muestra estadísticas de ejecución (por la traza de texto)"""
+        escribir = self.traza.escribir
+        escribir(f"\n📈 Estadísticas:")
+        escribir(f"  Ciclos totales: {self.ciclos}")
+        escribir(f"  Instrucciones ejecutadas: {self.instrucciones_ejecutadas}")
+        escribir(f"  CPI (Cycles Per Instruction): {self.ciclos / max(self.instrucciones_ejecutadas, 1):.2f}")
         
         # Simula frecuencia
         frecuencia_ghz = 2.5  # Tu CPU
         tiempo_ciclo_ns = 1 / frecuencia_ghz  # nanosegundos
         tiempo_total = self.ciclos * tiempo_ciclo_ns
-        print(f"  Tiempo estimado a 2.5 GHz: {tiempo_total:.2f} ns")
\ No newline at end of file
+        escribir(f"  Tiempo estimado a 2.5 GHz: {tiempo_total:.2f} ns")
@@ -0,0 +1,116 @@
+"""
+Sumideros de traza para los simuladores de CPU
+Permiten usar el mismo simulador para enseñar (consola) o para correr en volumen
+"""
+
+import struct
+from collections import deque
+
+# Bits del byte de flags en los registros de traza
+FLAG_Z = 0x1  # Zero
+FLAG_C = 0x2  # Carry
+FLAG_N = 0x4  # Negative
+FLAG_V = 0x8  # Overflow (solo CPUDetallado)
+
+# Formato binario: cabecera + un registro fijo por instrucción
+MAGIC = b'CPUT'
+VERSION = 1
+CABECERA = struct.Struct('<4sH')
+# ciclo (u32), pc (u8), ir (u8), R0-R7 (8 x u8), flags (u8)
+REGISTRO = struct.Struct('<IBB8sB')
+
+
+def flags_a_byte(z, c, n, v=False):
+    """Empaqueta flags booleanos en un byte"""
+    return (FLAG_Z if z else 0) | (FLAG_C if c else 0) | (FLAG_N if n else 0) | (FLAG_V if v else 0)
+
+
+class SumideroTraza:
+    """
+    Interfaz base de una traza
+
+    - texto: el CPU solo formatea mensajes si es True
+    - estructurado: el CPU solo arma registros por instrucción si es True
+    """
+    texto = False
+    estructurado = False
+
+    def escribir(self, texto):
+        """Recibe un mensaje ya formateado (modo enseñanza)"""
+
+    def registrar(self, ciclo, pc, ir, registros, flags):
+        """Recibe el estado tras ejecutar una instrucción"""
+
+    def cerrar(self):
+        """Libera recursos (archivos, etc.)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class SumideroNulo(SumideroTraza):
+    """No guarda nada: el CPU no formatea ni un string (modo throughput)"""
+
+
+class SumideroConsola(SumideroTraza):
+    """Imprime todo en pantalla (comportamiento original, para aprender)"""
+    texto = True
+
+    def escribir(self, texto):
+        print(texto)
+
+
+class SumideroAnillo(SumideroTraza):
+    """Guarda solo los últimos N ciclos (ring buffer)"""
+    estructurado = True
+
+    def __init__(self, capacidad=1024):
+        self.buffer = deque(maxlen=capacidad)
+
+    def registrar(self, ciclo, pc, ir, registros, flags):
+        self.buffer.append((ciclo, pc, ir, tuple(registros), flags))
+
+    def ultimos(self):
+        """Devuelve los registros guardados (más antiguo primero)"""
+        return list(self.buffer)
+
+
+class SumideroBinario(SumideroTraza):
+    """Escribe registros empaquetados de tamaño fijo a un archivo"""
+    estructurado = True
+
+    def __init__(self, ruta):
+        self.archivo = open(ruta, 'wb')
+        self.archivo.write(CABECERA.pack(MAGIC, VERSION))
+        self._pack = REGISTRO.pack
+        self.registros_escritos = 0
+
+    def registrar(self, ciclo, pc, ir, registros, flags):
+        self.archivo.write(self._pack(ciclo, pc & 0xFF, ir & 0xFF, bytes(registros), flags))
+        self.registros_escritos += 1
+
+    def cerrar(self):
+        if not self.archivo.closed:
+            self.archivo.close()
+
+
+def leer_traza_binaria(ruta):
+    """
+    Lee un archivo escrito por SumideroBinario
+
+    Yields:
+        tuple: (ciclo, pc, ir, registros, flags)
+    """
+    with open(ruta, 'rb') as f:
+        magic, version = CABECERA.unpack(f.read(CABECERA.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Archivo de traza no reconocido: {ruta}")
+        while True:
+            bloque = f.read(REGISTRO.size)
+            if len(bloque) < REGISTRO.size:
+                break
+            ciclo, pc, ir, regs, flags = REGISTRO.unpack(bloque)
+            yield ciclo, pc, ir, tuple(regs), flags
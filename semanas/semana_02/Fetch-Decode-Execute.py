@@ -3,10 +3,78 @@ Simulador detallado del ciclo Fetch-Decode-Execute
 Muestra cada paso interno del CPU
 """
 
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+# Los sumideros de traza viven junto al CPU simple (semana 1)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "semana-01"))
+from trazas import SumideroConsola, flags_a_byte
+
+# Nombres de las instrucciones del ISA
+INSTRUCCIONES = {
+    0x0: "NOP",
+    0x1: "LOAD",
+    0x2: "STORE",
+    0x3: "ADD",
+    0x4: "SUB",
+    0x5: "MOV",
+    0xF: "HALT"
+}
+
+# Etapas del pipeline clásico
+ETAPAS = ('IF', 'ID', 'EX', 'MEM', 'WB')
+
+
+@dataclass(slots=True)
+class InstruccionPipeline:
+    """Una instrucción en vuelo dentro del pipeline"""
+    pc: int
+    ir: int
+    opcode: int
+    operando: int
+    direccion: int | None  # Solo LOAD/STORE (segundo byte)
+    lee: tuple             # Registros que necesita al entrar a EX
+    lee_en_mem: tuple      # Registros que necesita en MEM (dato de STORE)
+    escribe: int | None    # Registro destino
+
+    @classmethod
+    def decodificar(cls, memoria, pc):
+        """Decodifica la instrucción en memoria[pc] (lo hace el hardware en IF/ID)"""
+        ir = memoria[pc]
+        opcode = (ir & 0xF0) >> 4
+        operando = ir & 0x0F
+        direccion = None
+        lee, lee_en_mem, escribe = (), (), None
+
+        if opcode in (0x1, 0x2):  # LOAD/STORE: 2 bytes
+            direccion = memoria[pc + 1] if pc + 1 < len(memoria) else None
+            if opcode == 0x1:
+                escribe = operando
+            else:
+                lee_en_mem = (operando,)
+        elif opcode in (0x3, 0x4):  # ADD/SUB R0, Rn
+            lee = (0, operando)
+            escribe = 0
+        elif opcode == 0x5:  # MOV Rd, Rs
+            lee = (operando & 0x3,)
+            escribe = operando >> 2
+
+        return cls(pc, ir, opcode, operando, direccion, lee, lee_en_mem, escribe)
+
+    @property
+    def tamaño(self):
+        return 2 if self.opcode in (0x1, 0x2) else 1
+
+
 class CPUDetallado:
-    def __init__(self):
-        # Registros de propósito general
-        self.R = [0] * 8  # R0-R7
+    __slots__ = ('R', 'PC', 'IR', 'MAR', 'MDR', 'Z', 'C', 'N', 'V', 'memoria',
+                 'ciclo_actual', 'instrucciones_totales', 'address_bus', 'data_bus',
+                 'control_bus', 'traza', 'pausas')
+
+    def __init__(self, traza=None, pausas=True):
+        # Registros de propósito general (8 bits, array compacto)
+        self.R = bytearray(8)  # R0-R7
         
         # Registros especiales
         self.PC = 0  # Program Counter
@@ -21,7 +89,7 @@ class CPUDetallado:
         self.V = False  # Overflow
         
         # Memoria (256 bytes)
-        self.memoria = [0] * 256
+        self.memoria = bytearray(256)
         
         # Estadísticas
         self.ciclo_actual = 0
@@ -31,6 +99,10 @@ class CPUDetallado:
         self.address_bus = 0
         self.data_bus = 0
         self.control_bus = ""
+        
+        # Traza: consola por defecto; con SumideroNulo no se formatea nada
+        self.traza = traza if traza is not None else SumideroConsola()
+        self.pausas = pausas  # input() entre fases (solo en consola)
     
     def actualizar_flags(self, resultado, bits=8):
         """Actualiza flags según resultado"""
@@ -42,227 +114,433 @@ class CPUDetallado:
         self.V = self.C  # Simplificado
     
     def mostrar_estado(self, fase):
-        """Muestra estado del CPU"""
-        print(f"\n{'='*70}")
-        print(f"CICLO {self.ciclo_actual} - FASE: {fase}")
-        print(f"{'='*70}")
-        
-        print(f"\n📍 Registros Especiales:")
-        print(f"   PC  = 0x{self.PC:04X}  (Próxima instrucción)")
-        print(f"   IR  = {self.IR if self.IR else 'vacío'}  (Instrucción actual)")
-        print(f"   MAR = 0x{self.MAR:04X}  (Dirección de memoria)")
-        print(f"   MDR = 0x{self.MDR:02X}  (Dato de memoria)")
-        
-        print(f"\n📊 Registros de Propósito General:")
+        """Muestra estado del CPU (por la traza de texto)"""
+        escribir = self.traza.escribir
+        escribir(f"\n{'='*70}")
+        escribir(f"CICLO {self.ciclo_actual} - FASE: {fase}")
+        escribir(f"{'='*70}")
+        
+        escribir(f"\n📍 Registros Especiales:")
+        escribir(f"   PC  = 0x{self.PC:04X}  (Próxima instrucción)")
+        escribir(f"   IR  = {self.IR if self.IR else 'vacío'}  (Instrucción actual)")
+        escribir(f"   MAR = 0x{self.MAR:04X}  (Dirección de memoria)")
+        escribir(f"   MDR = 0x{self.MDR:02X}  (Dato de memoria)")
+        
+        escribir(f"\n📊 Registros de Propósito General:")
         for i in range(0, 8, 4):
-            print(f"   ", end="")
-            for j in range(4):
-                if i+j < 8:
-                    print(f"R{i+j}={self.R[i+j]:3d}  ", end="")
-            print()
+            escribir("   " + "".join(f"R{i+j}={self.R[i+j]:3d}  " for j in range(4) if i+j < 8))
         
-        print(f"\n🚩 Flags:")
-        print(f"   Z={int(self.Z)} (Zero)  ", end="")
-        print(f"C={int(self.C)} (Carry)  ", end="")
-        print(f"N={int(self.N)} (Negative)  ", end="")
-        print(f"V={int(self.V)} (Overflow)")
+        escribir(f"\n🚩 Flags:")
+        escribir(f"   Z={int(self.Z)} (Zero)  C={int(self.C)} (Carry)  "
+                 f"N={int(self.N)} (Negative)  V={int(self.V)} (Overflow)")
         
-        print(f"\n🚌 Bus:")
-        print(f"   Address Bus: 0x{self.address_bus:04X}")
-        print(f"   Data Bus:    0x{self.data_bus:02X}")
-        print(f"   Control Bus: {self.control_bus}")
+        escribir(f"\n🚌 Bus:")
+        escribir(f"   Address Bus: 0x{self.address_bus:04X}")
+        escribir(f"   Data Bus:    0x{self.data_bus:02X}")
+        escribir(f"   Control Bus: {self.control_bus}")
     
+    def _pausa(self, mensaje):
+        """Espera ENTER solo en modo enseñanza interactivo"""
+        if self.pausas and self.traza.texto:
+            input(mensaje)
+
     def fetch(self):
         """FASE 1: FETCH - Buscar instrucción"""
-        print("\n" + "▶"*35)
-        print("FASE 1: FETCH (BUSCAR INSTRUCCIÓN)")
-        print("▶"*35)
-        
-        # Paso 1: PC indica dirección
-        print(f"\n1️⃣  Program Counter apunta a: 0x{self.PC:04X}")
+        # PC → MAR → Address Bus → Memoria → MDR → IR
         self.MAR = self.PC
-        print(f"   → MAR cargado con 0x{self.MAR:04X}")
-        
-        # Paso 2: Enviar dirección por Address Bus
         self.address_bus = self.MAR
         self.control_bus = "READ"
-        print(f"\n2️⃣  Enviando señales por el bus:")
-        print(f"   Address Bus → 0x{self.address_bus:04X}")
-        print(f"   Control Bus → {self.control_bus}")
-        
-        # Paso 3: Leer de memoria
         self.MDR = self.memoria[self.MAR]
         self.data_bus = self.MDR
-        print(f"\n3️⃣  Memoria responde:")
-        print(f"   Data Bus ← 0x{self.data_bus:02X}")
-        print(f"   → MDR cargado con 0x{self.MDR:02X}")
-        
-        # Paso 4: Cargar en IR
         self.IR = self.MDR
-        print(f"\n4️⃣  Instrucción cargada en IR:")
-        print(f"   IR = 0x{self.IR:02X}")
-        
-        # Paso 5: Incrementar PC
         self.PC += 1
-        print(f"\n5️⃣  Program Counter incrementado:")
-        print(f"   PC = 0x{self.PC:04X}")
-        
+
         self.ciclo_actual += 1
-        self.mostrar_estado("FETCH COMPLETADO")
-        
-        input("\n⏸️  Presiona ENTER para continuar a DECODE...")
-    
+
+        if self.traza.texto:
+            self._narrar_fetch()
+            self.mostrar_estado("FETCH COMPLETADO")
+            self._pausa("\n⏸️  Presiona ENTER para continuar a DECODE...")
+
+    def _narrar_fetch(self):
+        """Explica paso a paso el FETCH que se acaba de hacer"""
+        escribir = self.traza.escribir
+        escribir("\n" + "▶"*35)
+        escribir("FASE 1: FETCH (BUSCAR INSTRUCCIÓN)")
+        escribir("▶"*35)
+
+        # Paso 1: PC indica dirección
+        escribir(f"\n1️⃣  Program Counter apunta a: 0x{self.MAR:04X}")
+        escribir(f"   → MAR cargado con 0x{self.MAR:04X}")
+
+        # Paso 2: Enviar dirección por Address Bus
+        escribir(f"\n2️⃣  Enviando señales por el bus:")
+        escribir(f"   Address Bus → 0x{self.address_bus:04X}")
+        escribir(f"   Control Bus → {self.control_bus}")
+
+        # Paso 3: Leer de memoria
+        escribir(f"\n3️⃣  Memoria responde:")
+        escribir(f"   Data Bus ← 0x{self.data_bus:02X}")
+        escribir(f"   → MDR cargado con 0x{self.MDR:02X}")
+
+        # Paso 4: Cargar en IR
+        escribir(f"\n4️⃣  Instrucción cargada en IR:")
+        escribir(f"   IR = 0x{self.IR:02X}")
+
+        # Paso 5: Incrementar PC
+        escribir(f"\n5️⃣  Program Counter incrementado:")
+        escribir(f"   PC = 0x{self.PC:04X}")
+
     def decode(self):
         """FASE 2: DECODE - Decodificar instrucción"""
-        print("\n" + "▶"*35)
-        print("FASE 2: DECODE (DECODIFICAR)")
-        print("▶"*35)
-        
         # Extraer opcode y operandos
         opcode = (self.IR & 0xF0) >> 4
         operando = self.IR & 0x0F
-        
-        print(f"\n1️⃣  Analizando instrucción en IR: 0x{self.IR:02X}")
-        print(f"   Binario: {bin(self.IR)[2:].zfill(8)}")
-        print(f"   ")
-        print(f"   ┌────────┬────────┐")
-        print(f"   │ {bin(opcode)[2:].zfill(4)} │ {bin(operando)[2:].zfill(4)} │")
-        print(f"   └────────┴────────┘")
-        print(f"    Opcode   Operando")
-        
-        print(f"\n2️⃣  Opcode extraído: 0x{opcode:X}")
-        
+
+        self.ciclo_actual += 1
+
+        if self.traza.texto:
+            self._narrar_decode(opcode, operando)
+            self.mostrar_estado("DECODE COMPLETADO")
+            self._pausa("\n⏸️  Presiona ENTER para continuar a EXECUTE...")
+
+        return opcode, operando
+
+    def _narrar_decode(self, opcode, operando):
+        """Explica paso a paso el DECODE"""
+        escribir = self.traza.escribir
+        escribir("\n" + "▶"*35)
+        escribir("FASE 2: DECODE (DECODIFICAR)")
+        escribir("▶"*35)
+
+        escribir(f"\n1️⃣  Analizando instrucción en IR: 0x{self.IR:02X}")
+        escribir(f"   Binario: {bin(self.IR)[2:].zfill(8)}")
+        escribir(f"   ")
+        escribir(f"   ┌────────┬────────┐")
+        escribir(f"   │ {bin(opcode)[2:].zfill(4)} │ {bin(operando)[2:].zfill(4)} │")
+        escribir(f"   └────────┴────────┘")
+        escribir(f"    Opcode   Operando")
+
+        escribir(f"\n2️⃣  Opcode extraído: 0x{opcode:X}")
+
         # Decodificar instrucción
-        instrucciones = {
-            0x0: "NOP",
-            0x1: "LOAD",
-            0x2: "STORE",
-            0x3: "ADD",
-            0x4: "SUB",
-            0x5: "MOV",
-            0xF: "HALT"
-        }
-        
-        nombre_inst = instrucciones.get(opcode, "UNKNOWN")
-        print(f"   → Instrucción: {nombre_inst}")
-        
-        print(f"\n3️⃣  Operando: 0x{operando:X}")
+        nombre_inst = INSTRUCCIONES.get(opcode, "UNKNOWN")
+        escribir(f"   → Instrucción: {nombre_inst}")
+
+        escribir(f"\n3️⃣  Operando: 0x{operando:X}")
         if opcode in [0x3, 0x4]:
-            print(f"   → Registro fuente: R{operando}")
+            escribir(f"   → Registro fuente: R{operando}")
         elif opcode == 0x5:
             rd = operando >> 2
             rs = operando & 0x3
-            print(f"   → Destino: R{rd}, Fuente: R{rs}")
-        
-        print(f"\n4️⃣  Control Unit genera señales:")
+            escribir(f"   → Destino: R{rd}, Fuente: R{rs}")
+
+        escribir(f"\n4️⃣  Control Unit genera señales:")
         if opcode == 0x3:  # ADD
-            print(f"   • ALU_OP = ADD")
-            print(f"   • REG_READ_1 = R0")
-            print(f"   • REG_READ_2 = R{operando}")
-            print(f"   • REG_WRITE = R0")
-            print(f"   • UPDATE_FLAGS = TRUE")
-        
-        self.ciclo_actual += 1
-        self.mostrar_estado("DECODE COMPLETADO")
-        
-        input("\n⏸️  Presiona ENTER para continuar a EXECUTE...")
-        
-        return opcode, operando
-    
+            escribir(f"   • ALU_OP = ADD")
+            escribir(f"   • REG_READ_1 = R0")
+            escribir(f"   • REG_READ_2 = R{operando}")
+            escribir(f"   • REG_WRITE = R0")
+            escribir(f"   • UPDATE_FLAGS = TRUE")
+
     def execute(self, opcode, operando):
         """FASE 3: EXECUTE - Ejecutar operación"""
-        print("\n" + "▶"*35)
-        print("FASE 3: EXECUTE (EJECUTAR)")
-        print("▶"*35)
-        
+        texto = self.traza.texto
+        if texto:
+            escribir = self.traza.escribir
+            escribir("\n" + "▶"*35)
+            escribir("FASE 3: EXECUTE (EJECUTAR)")
+            escribir("▶"*35)
+
         if opcode == 0x3:  # ADD R0, Rn
-            print(f"\n1️⃣  Leyendo operandos:")
-            print(f"   R0 = {self.R[0]}")
-            print(f"   R{operando} = {self.R[operando]}")
-            
-            print(f"\n2️⃣  Enviando a ALU:")
-            print(f"   Input A: {self.R[0]}")
-            print(f"   Input B: {self.R[operando]}")
-            print(f"   Operation: ADD")
-            
-            print(f"\n3️⃣  ALU ejecutando suma:")
             a = self.R[0]
             b = self.R[operando]
-            
-            # Mostrar suma binaria
-            print(f"   ")
-            print(f"     {bin(a)[2:].zfill(8)}  ({a})")
-            print(f"   + {bin(b)[2:].zfill(8)}  ({b})")
-            print(f"   ─────────────")
-            
             resultado = a + b
-            print(f"     {bin(resultado & 0xFF)[2:].zfill(8)}  ({resultado & 0xFF})")
-            
+
             # Actualizar flags
             self.actualizar_flags(resultado)
-            
-            print(f"\n4️⃣  Actualizando flags:")
-            print(f"   Z (Zero) = {int(self.Z)}  ", end="")
-            print(f"{'✓ Resultado es cero' if self.Z else '✗ Resultado no es cero'}")
-            print(f"   C (Carry) = {int(self.C)}  ", end="")
-            print(f"{'✓ Hubo overflow' if self.C else '✗ Sin overflow'}")
-            print(f"   N (Negative) = {int(self.N)}")
-            print(f"   V (Overflow) = {int(self.V)}")
-            
+
             # Escribir resultado
             self.R[0] = resultado & 0xFF
-            print(f"\n5️⃣  Escribiendo resultado:")
-            print(f"   R0 = {self.R[0]}")
-        
+
+            if texto:
+                self._narrar_add(operando, a, b, resultado)
+
         elif opcode == 0xF:  # HALT
-            print("\n   ⏹️  HALT - Deteniendo CPU")
+            if texto:
+                escribir("\n   ⏹️  HALT - Deteniendo CPU")
             return False
-        
+
         self.ciclo_actual += 1
         self.instrucciones_totales += 1
-        self.mostrar_estado("EXECUTE COMPLETADO")
-        
+        if texto:
+            self.mostrar_estado("EXECUTE COMPLETADO")
+
         return True
-    
+
+    def _narrar_add(self, operando, a, b, resultado):
+        """Explica paso a paso la suma en la ALU"""
+        escribir = self.traza.escribir
+        escribir(f"\n1️⃣  Leyendo operandos:")
+        escribir(f"   R0 = {a}")
+        escribir(f"   R{operando} = {b}")
+
+        escribir(f"\n2️⃣  Enviando a ALU:")
+        escribir(f"   Input A: {a}")
+        escribir(f"   Input B: {b}")
+        escribir(f"   Operation: ADD")
+
+        escribir(f"\n3️⃣  ALU ejecutando suma:")
+
+        # Mostrar suma binaria
+        escribir(f"   ")
+        escribir(f"     {bin(a)[2:].zfill(8)}  ({a})")
+        escribir(f"   + {bin(b)[2:].zfill(8)}  ({b})")
+        escribir(f"   ─────────────")
+        escribir(f"     {bin(resultado & 0xFF)[2:].zfill(8)}  ({resultado & 0xFF})")
+
+        escribir(f"\n4️⃣  Actualizando flags:")
+        escribir(f"   Z (Zero) = {int(self.Z)}  "
+                 f"{'✓ Resultado es cero' if self.Z else '✗ Resultado no es cero'}")
+        escribir(f"   C (Carry) = {int(self.C)}  "
+                 f"{'✓ Hubo overflow' if self.C else '✗ Sin overflow'}")
+        escribir(f"   N (Negative) = {int(self.N)}")
+        escribir(f"   V (Overflow) = {int(self.V)}")
+
+        escribir(f"\n5️⃣  Escribiendo resultado:")
+        escribir(f"   R0 = {self.R[0]}")
+
     def ejecutar_programa(self, programa):
         """Ejecuta programa completo"""
-        print("\n" + "="*70)
-        print("🚀 INICIANDO SIMULACIÓN DETALLADA DE CPU")
-        print("="*70)
-        
-        # Cargar programa
-        for i, instruccion in enumerate(programa):
-            self.memoria[i] = instruccion
-        
-        print(f"\n📥 Programa cargado en memoria:")
-        print(f"   Tamaño: {len(programa)} bytes")
-        print(f"   Dirección inicial: 0x{0:04X}")
-        
-        print(f"\n📋 Contenido del programa:")
-        for i, inst in enumerate(programa): 
-            print(f"   0x{i:04X}: 0x{inst:02X}  ({bin(inst)[2:].zfill(8)})")    
-        input("\n⏸️  Presiona ENTER para comenzar ejecución...")   
-        
-            # Ejecutar
+        traza = self.traza
+        texto = traza.texto
+        if texto:
+            traza.escribir("\n" + "="*70)
+            traza.escribir("🚀 INICIANDO SIMULACIÓN DETALLADA DE CPU")
+            traza.escribir("="*70)
+
+        # Cargar programa (copia directa vía memoryview)
+        memoryview(self.memoria)[:len(programa)] = bytes(programa)
+
+        if texto:
+            traza.escribir(f"\n📥 Programa cargado en memoria:")
+            traza.escribir(f"   Tamaño: {len(programa)} bytes")
+            traza.escribir(f"   Dirección inicial: 0x{0:04X}")
+
+            traza.escribir(f"\n📋 Contenido del programa:")
+            for i, inst in enumerate(programa):
+                traza.escribir(f"   0x{i:04X}: 0x{inst:02X}  ({bin(inst)[2:].zfill(8)})")
+            self._pausa("\n⏸️  Presiona ENTER para comenzar ejecución...")
+
+        # Ejecutar
         while self.PC < len(programa):
+            pc = self.PC
             self.fetch()
             opcode, operando = self.decode()
-            continuar = self.execute(opcode, operando)       
-            
+            continuar = self.execute(opcode, operando)
+            if traza.estructurado:
+                traza.registrar(self.ciclo_actual, pc, self.IR, self.R,
+                                flags_a_byte(self.Z, self.C, self.N, self.V))
+
             if not continuar:
-                break    
-            
-            # Resumen
-        print("\n" + "="*70)
-        print("✅ PROGRAMA FINALIZADO")
-        print("="*70)
-        print(f"\n📊 Estadísticas:")
-        print(f"   Ciclos totales: {self.ciclo_actual}")
-        print(f"   Instrucciones: {self.instrucciones_totales}")
-        print(f"   CPI: {self.ciclo_actual / max(self.instrucciones_totales, 1):.2f}")    
-        print(f"\n🏁 Estado final de registros:")
-        for i in range(8):
-            print(f"   R{i} = {self.R[i]}")
+                break
+
+        # Resumen
+        if texto:
+            traza.escribir("\n" + "="*70)
+            traza.escribir("✅ PROGRAMA FINALIZADO")
+            traza.escribir("="*70)
+            traza.escribir(f"\n📊 Estadísticas:")
+            traza.escribir(f"   Ciclos totales: {self.ciclo_actual}")
+            traza.escribir(f"   Instrucciones: {self.instrucciones_totales}")
+            traza.escribir(f"   CPI: {self.ciclo_actual / max(self.instrucciones_totales, 1):.2f}")
+            traza.escribir(f"\n🏁 Estado final de registros:")
+            for i in range(8):
+                traza.escribir(f"   R{i} = {self.R[i]}")
+
+    # ========================================
+    # MODO PIPELINE (5 etapas)
+    # ========================================
+
+    def _efecto(self, inst):
+        """Aplica el efecto funcional de una instrucción (en orden de programa)"""
+        op = inst.opcode
+        if op == 0x1:  # LOAD
+            self.R[inst.operando] = self.memoria[inst.direccion]
+        elif op == 0x2:  # STORE
+            self.memoria[inst.direccion] = self.R[inst.operando]
+        elif op == 0x3 or op == 0x4:  # ADD / SUB
+            a = self.R[0]
+            b = self.R[inst.operando]
+            resultado = a + b if op == 0x3 else a - b
+            self.actualizar_flags(resultado)
+            self.R[0] = resultado & 0xFF
+        elif op == 0x5:  # MOV
+            self.R[inst.operando >> 2] = self.R[inst.operando & 0x3]
+
+    @staticmethod
+    def _riesgo_datos(consumidor, en_ex, en_mem, forwarding):
+        """
+        ¿Debe la instrucción en ID esperar (stall) un ciclo?
+
+        - Con forwarding solo queda el caso load-use: el LOAD en EX no tiene
+          el dato hasta terminar MEM.
+        - Sin forwarding los registros se leen en ID: hay que esperar a que
+          el productor llegue a WB (escribe en la 1ª mitad, ID lee en la 2ª).
+        """
+        if forwarding:
+            return (en_ex is not None and en_ex.opcode == 0x1
+                    and en_ex.escribe in consumidor.lee)
+        necesita = consumidor.lee + consumidor.lee_en_mem
+        return any(p is not None and p.escribe is not None and p.escribe in necesita
+                   for p in (en_ex, en_mem))
+
+    @staticmethod
+    def _mnemonico(inst):
+        """Texto corto de una instrucción para el diagrama"""
+        if inst is None:
+            return "·"
+        nombre = INSTRUCCIONES.get(inst.opcode, "???")
+        if inst.opcode in (0x1, 0x2, 0x3, 0x4):
+            return f"{nombre} R{inst.operando}"
+        if inst.opcode == 0x5:
+            return f"MOV R{inst.operando >> 2},R{inst.operando & 0x3}"
+        return nombre
+
+    def ejecutar_pipeline(self, programa, forwarding=True):
+        """
+        Ejecuta el programa con un modelo de tiempo segmentado IF/ID/EX/MEM/WB
+
+        El efecto funcional de cada instrucción se aplica al pasar de ID a EX
+        (en orden de programa); el tiempo sale de simular ciclo a ciclo qué
+        instrucción ocupa cada etapa, con detección de riesgos de datos,
+        stalls (burbujas) y forwarding opcional. HALT se detecta en ID y
+        descarta la instrucción que ya se había buscado detrás de él.
+
+        Nota: como en un pipeline real, un STORE sobre código ya buscado
+        no afecta a esas instrucciones en vuelo.
+
+        Args:
+            programa: Lista de instrucciones (bytes)
+            forwarding: True = caminos EX→EX y MEM→EX activos
+
+        Returns:
+            dict: ciclos, instrucciones, CPI, stalls, forwards, ocupación por etapa...
+        """
+        memoryview(self.memoria)[:len(programa)] = bytes(programa)
+        n = len(programa)
+        IF, ID, EX, MEM, WB = range(5)
+
+        etapa = [None] * 5
+        pc = self.PC
+        buscar = True
+        halt = False  # ¿Se ejecutó un HALT? (el secuencial le cobra 2 ciclos)
+        texto = self.traza.texto
+        diagrama = []
+
+        ciclos = instrucciones = stalls = descartadas = forwards = 0
+        ocupacion = [0] * 5
+
+        while True:
+            # 1) Detección de riesgos para la instrucción en ID
+            en_id = etapa[ID]
+            stall = en_id is not None and self._riesgo_datos(
+                en_id, etapa[EX], etapa[MEM], forwarding)
+
+            # 2) Retira la instrucción que terminó WB
+            if etapa[WB] is not None and etapa[WB].opcode != 0xF:
+                instrucciones += 1
+
+            # 3) Avanza el pipeline (de atrás hacia adelante)
+            siguiente = [None] * 5
+            siguiente[WB] = etapa[MEM]
+            siguiente[MEM] = etapa[EX]
+
+            if stall:
+                stalls += 1
+                siguiente[ID] = en_id
+                siguiente[IF] = etapa[IF]
+            else:
+                if en_id is not None:
+                    # Emisión ID → EX: aquí se aplica el efecto funcional
+                    if forwarding and any(
+                            p is not None and p.escribe is not None
+                            and p.escribe in en_id.lee + en_id.lee_en_mem
+                            for p in (etapa[EX], etapa[MEM])):
+                        forwards += 1
+                    self._efecto(en_id)
+                    self.IR = en_id.ir
+                    if en_id.opcode == 0xF:
+                        # HALT: deja de buscar y descarta lo que venía detrás
+                        buscar = False
+                        halt = True
+                        pc = en_id.pc + 1
+                        if etapa[IF] is not None:
+                            descartadas += 1
+                        etapa[IF] = None
+                siguiente[EX] = en_id
+                siguiente[ID] = etapa[IF]
+                if buscar and pc < n:
+                    siguiente[IF] = InstruccionPipeline.decodificar(self.memoria, pc)
+                    pc += siguiente[IF].tamaño
+
+            etapa = siguiente
+            if all(inst is None for inst in etapa):
+                break
+
+            # 4) Contabilidad del ciclo
+            ciclos += 1
+            for i, inst in enumerate(etapa):
+                if inst is not None:
+                    ocupacion[i] += 1
+            if texto:
+                diagrama.append((ciclos, stall, [self._mnemonico(inst) for inst in etapa]))
+
+        self.PC = pc
+        self.ciclo_actual += ciclos
+        self.instrucciones_totales += instrucciones
+
+        stats = {
+            'ciclos': ciclos,
+            'instrucciones': instrucciones,
+            'cpi': ciclos / max(instrucciones, 1),
+            'stalls': stalls,
+            'burbujas': ciclos * 5 - sum(ocupacion),
+            'descartadas': descartadas,
+            'forwards': forwards,
+            'forwarding': forwarding,
+            'ocupacion': dict(zip(ETAPAS, ocupacion)),
+            # Modelo secuencial: 3 ciclos por instrucción (+2 del HALT, si lo hubo)
+            'ciclos_secuencial': 3 * instrucciones + (2 if halt else 0),
+        }
+        if texto:
+            self._mostrar_pipeline(diagrama, stats)
+        return stats
+
+    def _mostrar_pipeline(self, diagrama, stats):
+        """Diagrama ciclo a ciclo + resumen del modo pipeline"""
+        escribir = self.traza.escribir
+        escribir("\n" + "="*70)
+        escribir(f"🏭 PIPELINE 5 ETAPAS (forwarding={'sí' if stats['forwarding'] else 'no'})")
+        escribir("="*70)
+        escribir(f"\n{'Ciclo':>5}  " + "".join(f"{e:<12}" for e in ETAPAS))
+        for ciclo, stall, contenido in diagrama:
+            marca = "  ⏸️ stall" if stall else ""
+            escribir(f"{ciclo:>5}  " + "".join(f"{c:<12}" for c in contenido) + marca)
+
+        escribir(f"\n📊 Estadísticas:")
+        escribir(f"   Ciclos totales: {stats['ciclos']}")
+        escribir(f"   Instrucciones: {stats['instrucciones']}")
+        escribir(f"   CPI: {stats['cpi']:.2f}")
+        escribir(f"   Stalls (riesgos de datos): {stats['stalls']}")
+        escribir(f"   Forwards usados: {stats['forwards']}")
+        escribir(f"   Instrucciones descartadas (tras HALT): {stats['descartadas']}")
+        escribir(f"\n🏭 Ocupación por etapa:")
+        for nombre, ocupado in stats['ocupacion'].items():
+            escribir(f"   {nombre:<4} {ocupado:>4}/{stats['ciclos']} "
+                     f"({ocupado / max(stats['ciclos'], 1) * 100:.0f}%)")
+        escribir(f"\n⚡ Secuencial (CPI≥3): {stats['ciclos_secuencial']} ciclos → "
+                 f"speedup {stats['ciclos_secuencial'] / max(stats['ciclos'], 1):.2f}×")
 
 
 if __name__ == "__main__":
@@ -281,3 +559,12 @@ if __name__ == "__main__":
     ]
 
     cpu.ejecutar_programa(programa)
+
+    # Modo pipeline: programa con dependencias (load-use y ADD encadenados)
+    # LOAD R1,[100] ; ADD R0,R1 ; LOAD R2,[101] ; ADD R0,R2 ; STORE [102],R0 ; HALT
+    programa_pipeline = [0x11, 100, 0x31, 0x12, 101, 0x32, 0x20, 102, 0xF0]
+    for forwarding in (True, False):
+        cpu_pipe = CPUDetallado(pausas=False)
+        cpu_pipe.memoria[100] = 7
+        cpu_pipe.memoria[101] = 9
+        cpu_pipe.ejecutar_pipeline(programa_pipeline, forwarding=forwarding)
@@ -0,0 +1,131 @@
+"""
+Almacén paginado para el nivel RAM de MemoryHierarchy
+Páginas bytearray creadas al primer toque, con expulsión opcional a un SSD simulado
+"""
+
+from collections import OrderedDict
+
+
+class AlmacenPaginado:
+    """
+    Memoria principal dispersa: solo existen las páginas tocadas
+
+    - Una página se crea (en ceros) la primera vez que se toca
+    - Si hay `capacidad`, al llenarse se expulsa la página menos usada
+      recientemente al SSD simulado; volver a tocarla la trae de vuelta
+    - Las páginas en ceros no ocupan espacio en el SSD
+
+    Se usa como un dict de líneas: `linea in almacen` (¿está residente?),
+    `almacen[linea]` (bytes de la línea) y `almacen[linea] = datos`.
+    """
+
+    def __init__(self, capacidad=None, tamaño_pagina=4096, line_size=64):
+        """
+        Args:
+            capacidad: bytes de RAM (None = ilimitada, nunca se expulsa)
+            tamaño_pagina: bytes por página
+            line_size: bytes por línea de cache
+        """
+        if tamaño_pagina % line_size:
+            raise ValueError(f"La página ({tamaño_pagina} B) debe ser múltiplo de la línea ({line_size} B)")
+        self.tamaño_pagina = tamaño_pagina
+        self.line_size = line_size
+        self.max_paginas = None if capacidad is None else max(1, capacidad // tamaño_pagina)
+
+        self.paginas = OrderedDict()  # número de página → bytearray (orden LRU)
+        self.ssd = {}                 # páginas expulsadas con datos: número → bytes
+        self.stats = {
+            'paginas_creadas': 0,
+            'swap_outs': 0,  # Páginas expulsadas al SSD
+            'swap_ins': 0,   # Páginas traídas de vuelta
+        }
+
+    def __contains__(self, line_addr):
+        """¿La página de esa línea está residente en RAM?"""
+        return line_addr // self.tamaño_pagina in self.paginas
+
+    def __len__(self):
+        """Páginas residentes"""
+        return len(self.paginas)
+
+    def __getitem__(self, line_addr):
+        """Bytes de la línea (trae la página si no está residente)"""
+        pagina = self.cargar(line_addr)
+        inicio = line_addr % self.tamaño_pagina
+        return bytes(pagina[inicio:inicio + self.line_size])
+
+    def __setitem__(self, line_addr, datos):
+        """Escribe una línea completa (o menos bytes desde su inicio)"""
+        self.escribir(line_addr, datos)
+
+    def escribir(self, address, datos):
+        """Escribe bytes a partir de una dirección (sin cruzar de página)"""
+        pagina = self.cargar(address)
+        inicio = address % self.tamaño_pagina
+        if inicio + len(datos) > self.tamaño_pagina:
+            raise ValueError(f"Escritura de {len(datos)} B en 0x{address:X} cruza el límite de página")
+        pagina[inicio:inicio + len(datos)] = datos
+
+    def cargar(self, address):
+        """
+        Deja residente la página de `address` (creándola o trayéndola del SSD)
+
+        Returns:
+            bytearray: la página
+        """
+        numero = address // self.tamaño_pagina
+        pagina = self.paginas.get(numero)
+        if pagina is not None:
+            self.paginas.move_to_end(numero)
+            return pagina
+
+        guardada = self.ssd.pop(numero, None)
+        if guardada is not None:
+            self.stats['swap_ins'] += 1
+            pagina = bytearray(guardada)
+        else:
+            self.stats['paginas_creadas'] += 1
+            pagina = bytearray(self.tamaño_pagina)
+
+        if self.max_paginas is not None and len(self.paginas) >= self.max_paginas:
+            self._expulsar()
+        self.paginas[numero] = pagina
+        return pagina
+
+    def _expulsar(self):
+        """Manda la página LRU al SSD (si es todo ceros basta con olvidarla)"""
+        numero, pagina = self.paginas.popitem(last=False)
+        self.stats['swap_outs'] += 1
+        if pagina.count(0) != len(pagina):
+            self.ssd[numero] = bytes(pagina)
+
+    def memoria_usada(self):
+        """Bytes de RAM realmente ocupados por páginas residentes"""
+        return len(self.paginas) * self.tamaño_pagina
+
+    def bytes_en_ssd(self):
+        return len(self.ssd) * self.tamaño_pagina
+
+
+if __name__ == "__main__":
+    # ========================================
+    # EXPERIMENTO: Memoria usada = working set tocado
+    # ========================================
+    print("=" * 70)
+    print("💾 ALMACÉN PAGINADO: 32 GB simulados, solo se guarda lo tocado")
+    print("=" * 70)
+
+    ram = AlmacenPaginado(capacidad=1024 * 1024)  # 1 MB de RAM = 256 páginas
+    for i in range(1000):  # 1000 páginas distintas, repartidas en 32 GB
+        direccion = i * 32 * 1024 * 1024
+        ram.escribir(direccion, (i + 1).to_bytes(4, 'little'))
+
+    print(f"\n   Páginas residentes: {len(ram):,} ({ram.memoria_usada() / 1024:.0f} KB)")
+    print(f"   Páginas en SSD:     {len(ram.ssd):,} ({ram.bytes_en_ssd() / 1024:.0f} KB)")
+    print(f"   Swap-outs: {ram.stats['swap_outs']:,} | Swap-ins: {ram.stats['swap_ins']:,}")
+
+    # La página 0 fue expulsada: al leerla vuelve del SSD con su dato
+    valor = int.from_bytes(ram[0][:4], 'little')
+    print(f"\n   Página 0 tras volver del SSD: {valor} (swap-ins: {ram.stats['swap_ins']})")
+    valor = int.from_bytes(ram[999 * 32 * 1024 * 1024][:4], 'little')
+    print(f"   Página 999 (residente):       {valor}")
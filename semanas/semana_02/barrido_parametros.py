@@ -0,0 +1,139 @@
+"""
+Barrido de parámetros de MemoryHierarchy en paralelo (varios procesos)
+Cada configuración de la rejilla se simula en un proceso con la MISMA traza
+"""
+
+import itertools
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from simulador_jerarquia_memoria import MemoryHierarchy
+from trazas_memoria import EscritorTrazaMemoria, reproducir
+
+
+def rejilla(**ejes):
+    """
+    Producto cartesiano de opciones de MemoryHierarchy
+
+    Ejemplo: rejilla(line_size=[32, 64], politica=['LRU', 'SRRIP'])
+    → 4 configuraciones (dicts de argumentos para MemoryHierarchy)
+    """
+    claves = list(ejes)
+    return [dict(zip(claves, valores)) for valores in itertools.product(*ejes.values())]
+
+
+def _simular(config, ruta, bloque):
+    """Trabajo de un proceso: abre la traza con mmap (sin copiarla) y la reproduce"""
+    inicio = time.perf_counter()
+    mem = MemoryHierarchy(**config)
+    reproducir(ruta, mem, bloque)
+    accesos = mem.stats['L1_hits'] + mem.stats['L1_misses']
+    fila = dict(config)
+    fila.update(mem.stats)
+    fila['latencia_media'] = mem.stats['total_latency'] / accesos if accesos else 0.0
+    fila['segundos'] = time.perf_counter() - inicio
+    return fila
+
+
+def barrer(configuraciones, traza, procesos=None, bloque=1 << 18):
+    """
+    Simula cada configuración contra la misma traza, repartiendo en procesos
+
+    La traza NO se manda serializada a cada proceso: si es un archivo
+    (formato de trazas_memoria) cada proceso lo abre con mmap y el sistema
+    operativo comparte las páginas; si es un array se vuelca una vez a un
+    archivo temporal (en /dev/shm si existe, o sea, en RAM).
+
+    Args:
+        configuraciones: lista de dicts con argumentos de MemoryHierarchy
+        traza: ruta a un archivo de traza, o array de direcciones (solo lecturas)
+        procesos: número de procesos (None = todos los núcleos; 1 = sin pool)
+        bloque: registros por bloque al reproducir
+
+    Returns:
+        list: una fila (dict) por configuración, en el mismo orden
+    """
+    temporal = None
+    if isinstance(traza, (str, os.PathLike)):
+        ruta = os.fspath(traza)
+    else:
+        carpeta = '/dev/shm' if os.path.isdir('/dev/shm') else None
+        descriptor, ruta = tempfile.mkstemp(suffix='.memt', dir=carpeta)
+        os.close(descriptor)
+        temporal = ruta
+        with EscritorTrazaMemoria(ruta) as escritor:
+            escritor.escribir_lote(np.asarray(traza))
+
+    try:
+        if procesos == 1:
+            return [_simular(config, ruta, bloque) for config in configuraciones]
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            futuros = [pool.submit(_simular, config, ruta, bloque) for config in configuraciones]
+            return [futuro.result() for futuro in futuros]
+    finally:
+        if temporal:
+            os.remove(temporal)
+
+
+def mostrar_tabla(resultados, metricas=('latencia_media', 'L1_hits', 'L1_misses', 'L3_misses')):
+    """Imprime los resultados: columnas de configuración + métricas pedidas"""
+    if not resultados:
+        return
+    claves = [c for c in resultados[0] if c not in MemoryHierarchy().stats
+              and c not in ('latencia_media', 'segundos')]
+    columnas = claves + list(metricas)
+    anchos = [max(len(str(c)), *(len(_formato(fila[c])) for fila in resultados)) for c in columnas]
+
+    print("  ".join(f"{c:>{a}}" for c, a in zip(columnas, anchos)))
+    print("-" * (sum(anchos) + 2 * (len(anchos) - 1)))
+    for fila in resultados:
+        print("  ".join(f"{_formato(fila[c]):>{a}}" for c, a in zip(columnas, anchos)))
+
+
+def _formato(valor):
+    if isinstance(valor, float):
+        return f"{valor:.2f}"
+    if isinstance(valor, int) and not isinstance(valor, bool):
+        return f"{valor:,}"
+    return str(valor)
+
+
+if __name__ == "__main__":
+    # ========================================
+    # EXPERIMENTO: 12 configuraciones, misma traza
+    # ========================================
+    print("=" * 70)
+    print("🧪 BARRIDO: line size x asociatividad x política")
+    print("=" * 70)
+
+    rng = np.random.default_rng(0)
+    partes = []
+    for _ in range(300):
+        if rng.random() < 0.5:
+            base = rng.integers(0, 1 << 14) * 64
+            partes.append(base + np.arange(rng.integers(64, 2048)) * 4)
+        else:
+            partes.append(rng.integers(0, 2 << 20, rng.integers(100, 1000)))
+    trazo = np.concatenate(partes)
+
+    configuraciones = rejilla(line_size=[32, 64, 128], asociatividad=[4, 8],
+                              politica=['LRU', 'SRRIP'], tamaños=[{'L1': 32 * 1024}])
+    print(f"\n{len(configuraciones)} configuraciones x {len(trazo):,} accesos")
+
+    tiempos = {}
+    for procesos in sorted({1, os.cpu_count() or 1}):
+        inicio = time.perf_counter()
+        resultados = barrer(configuraciones, trazo, procesos=procesos)
+        tiempos[procesos] = time.perf_counter() - inicio
+        print(f"   {procesos} proceso(s): {tiempos[procesos]:.2f} s")
+    if len(tiempos) > 1:
+        print(f"   Speedup: {tiempos[1] / tiempos[max(tiempos)]:.2f}x con {max(tiempos)} procesos")
+
+    print()
+    for fila in resultados:
+        fila.pop('tamaños')  # Igual para todas: no hace falta en la tabla
+    mostrar_tabla(resultados)
@@ -0,0 +1,398 @@
+"""
+Cache asociativa por conjuntos con políticas de reemplazo intercambiables
+Modelo: sets x ways x line_size (LRU, PLRU, FIFO, Random, SRRIP)
+"""
+
+import random
+import time
+from collections import OrderedDict
+
+
+# ========================================
+# POLÍTICAS DE REEMPLAZO
+# ========================================
+# Cada conjunto guarda sus líneas en un OrderedDict (orden de inserción/uso)
+# más un "estado" propio de la política. LRU, FIFO y RANDOM son O(1), PLRU
+# es O(log ways) y solo SRRIP recorre el conjunto (O(ways)) al elegir víctima,
+# así que las dos primeras siguen rindiendo en caches totalmente asociativas.
+
+class PoliticaReemplazo:
+    """Interfaz base: por defecto expulsa la línea más antigua del conjunto"""
+    nombre = "BASE"
+    # True si la víctima es siempre la primera del OrderedDict (camino rápido)
+    expulsa_primera = True
+
+    def nuevo_estado(self, ways):
+        """Estado por conjunto (se crea la primera vez que se usa el conjunto)"""
+        return None
+
+    def acceso(self, lineas, estado, linea):
+        """Hit sobre una línea presente"""
+
+    def insercion(self, lineas, estado, linea):
+        """Línea recién insertada"""
+
+    def victima(self, lineas, estado):
+        """Elige qué línea expulsar (el conjunto está lleno)"""
+        return next(iter(lineas))
+
+    def expulsion(self, estado, linea):
+        """La línea salió del conjunto (expulsada o invalidada)"""
+
+
+class PoliticaLRU(PoliticaReemplazo):
+    """Least Recently Used: el orden del OrderedDict ES el orden de uso"""
+    nombre = "LRU"
+
+    def acceso(self, lineas, estado, linea):
+        lineas.move_to_end(linea)
+
+
+class PoliticaFIFO(PoliticaReemplazo):
+    """First In First Out: los hits no cambian nada"""
+    nombre = "FIFO"
+
+
+class PoliticaRandom(PoliticaReemplazo):
+    """
+    Expulsa una línea al azar
+
+    El estado es una lista indexable de las líneas (más la posición de cada
+    una): elegir es un randrange y sacar es intercambiar con la última.
+    """
+    nombre = "RANDOM"
+    expulsa_primera = False
+
+    def __init__(self, semilla=None):
+        self.rng = random.Random(semilla)
+
+    def nuevo_estado(self, ways):
+        # [líneas en orden arbitrario, posición de cada línea en la lista]
+        return [[], {}]
+
+    def insercion(self, lineas, estado, linea):
+        orden, posicion = estado
+        posicion[linea] = len(orden)
+        orden.append(linea)
+
+    def victima(self, lineas, estado):
+        orden = estado[0]
+        return orden[self.rng.randrange(len(orden))]
+
+    def expulsion(self, estado, linea):
+        orden, posicion = estado
+        indice = posicion.pop(linea)
+        ultima = orden.pop()
+        if ultima != linea:
+            orden[indice] = ultima
+            posicion[ultima] = indice
+
+
+class PoliticaPLRU(PoliticaReemplazo):
+    """
+    Tree-PLRU: árbol binario de (ways - 1) bits por conjunto
+
+    Cada bit apunta hacia la mitad que debe expulsarse; en cada acceso
+    los bits del camino se giran para apuntar lejos de la vía usada.
+    Requiere ways potencia de 2.
+    """
+    nombre = "PLRU"
+    expulsa_primera = False
+
+    def nuevo_estado(self, ways):
+        if ways & (ways - 1):
+            raise ValueError(f"PLRU necesita ways potencia de 2 (recibido {ways})")
+        # [bits del árbol, vía de cada línea, ocupante de cada vía,
+        #  pila de vías libres (la de menor índice arriba)]
+        return [bytearray(max(ways - 1, 1)), {}, [None] * ways, list(range(ways - 1, -1, -1))]
+
+    def _tocar(self, estado, via):
+        bits, ocupantes = estado[0], estado[2]
+        nodo, inicio, tamaño = 0, 0, len(ocupantes)
+        while tamaño > 1:
+            mitad = tamaño // 2
+            if via < inicio + mitad:
+                bits[nodo] = 1  # Usé la izquierda → próxima víctima a la derecha
+                nodo, tamaño = 2 * nodo + 1, mitad
+            else:
+                bits[nodo] = 0
+                nodo, inicio, tamaño = 2 * nodo + 2, inicio + mitad, mitad
+        return via
+
+    def acceso(self, lineas, estado, linea):
+        self._tocar(estado, estado[1][linea])
+
+    def insercion(self, lineas, estado, linea):
+        _, via_de, ocupantes, libres = estado
+        via = libres.pop()
+        ocupantes[via] = linea
+        via_de[linea] = via
+        self._tocar(estado, via)
+
+    def victima(self, lineas, estado):
+        bits, ocupantes = estado[0], estado[2]
+        nodo, inicio, tamaño = 0, 0, len(ocupantes)
+        while tamaño > 1:
+            mitad = tamaño // 2
+            if bits[nodo]:
+                nodo, inicio, tamaño = 2 * nodo + 2, inicio + mitad, mitad
+            else:
+                nodo, tamaño = 2 * nodo + 1, mitad
+        return ocupantes[inicio]
+
+    def expulsion(self, estado, linea):
+        _, via_de, ocupantes, libres = estado
+        via = via_de.pop(linea)
+        ocupantes[via] = None
+        libres.append(via)
+
+
+class PoliticaSRRIP(PoliticaReemplazo):
+    """
+    Static Re-Reference Interval Prediction (2 bits)
+
+    Inserta con RRPV = 2 ("reuso lejano"), un hit pone RRPV = 0.
+    Expulsa la primera línea con RRPV = 3; si no hay, envejece todas.
+    Resiste mejor que LRU a barridos (scans) que no se reusan: no
+    desplazan a las líneas con hits, que tienen RRPV = 0.
+    """
+    nombre = "SRRIP"
+    expulsa_primera = False
+    RRPV_MAX = 3
+
+    def nuevo_estado(self, ways):
+        return {}
+
+    def acceso(self, lineas, estado, linea):
+        estado[linea] = 0
+
+    def insercion(self, lineas, estado, linea):
+        estado[linea] = self.RRPV_MAX - 1
+
+    def victima(self, lineas, estado):
+        while True:
+            for linea in lineas:
+                if estado[linea] >= self.RRPV_MAX:
+                    return linea
+            for linea in lineas:
+                estado[linea] += 1
+
+    def expulsion(self, estado, linea):
+        del estado[linea]
+
+
+POLITICAS = {
+    'LRU': PoliticaLRU,
+    'FIFO': PoliticaFIFO,
+    'RANDOM': PoliticaRandom,
+    'PLRU': PoliticaPLRU,
+    'SRRIP': PoliticaSRRIP,
+}
+
+
+def crear_politica(politica, semilla=None):
+    """Acepta un nombre ('LRU', 'PLRU', ...) o una instancia ya creada"""
+    if isinstance(politica, PoliticaReemplazo):
+        return politica
+    clase = POLITICAS.get(politica.upper())
+    if clase is None:
+        raise ValueError(f"Política desconocida: {politica} (opciones: {', '.join(POLITICAS)})")
+    return clase(semilla) if clase is PoliticaRandom else clase()
+
+
+# ========================================
+# CACHE ASOCIATIVA POR CONJUNTOS
+# ========================================
+
+class CacheAsociativo:
+    """
+    Cache de `tamaño` bytes dividida en sets x ways líneas
+
+    - ways=None → totalmente asociativa (1 solo conjunto)
+    - ways=1    → mapeo directo
+    Los conjuntos se crean al primer uso: la memoria crece con las líneas
+    realmente ocupadas, no con el tamaño simulado.
+    """
+
+    def __init__(self, tamaño, line_size=64, ways=None, politica='LRU', semilla=None):
+        self.tamaño = tamaño
+        self.line_size = line_size
+        self.num_lineas = max(1, tamaño // line_size)
+        self.ways = ways or self.num_lineas
+        if self.num_lineas % self.ways:
+            raise ValueError(f"{self.num_lineas} líneas no se reparten en {self.ways} vías")
+        self.num_sets = self.num_lineas // self.ways
+        self.politica = crear_politica(politica, semilla)
+
+        self._sets = {}  # índice de conjunto → (OrderedDict línea→dato, estado)
+        self._ocupadas = 0
+        self.sucias = set()  # Líneas con bit dirty (modificadas, no escritas abajo)
+
+    def _conjunto(self, line_addr):
+        """Devuelve (lineas, estado) del conjunto de esa línea (lo crea si hace falta)"""
+        indice = (line_addr // self.line_size) % self.num_sets
+        conjunto = self._sets.get(indice)
+        if conjunto is None:
+            conjunto = (OrderedDict(), self.politica.nuevo_estado(self.ways))
+            self._sets[indice] = conjunto
+        return conjunto
+
+    def __contains__(self, line_addr):
+        conjunto = self._sets.get((line_addr // self.line_size) % self.num_sets)
+        return conjunto is not None and line_addr in conjunto[0]
+
+    def __len__(self):
+        return self._ocupadas
+
+    def buscar(self, line_addr):
+        """
+        Busca una línea; en hit actualiza la política de reemplazo
+
+        Returns:
+            dato guardado, o None si es miss
+        """
+        conjunto = self._sets.get((line_addr // self.line_size) % self.num_sets)
+        if conjunto is None:
+            return None
+        lineas = conjunto[0]
+        dato = lineas.get(line_addr)
+        if dato is not None:
+            self.politica.acceso(lineas, conjunto[1], line_addr)
+        return dato
+
+    def ver(self, line_addr):
+        """Devuelve el dato de una línea sin tocar la política (None si no está)"""
+        conjunto = self._sets.get((line_addr // self.line_size) % self.num_sets)
+        return None if conjunto is None else conjunto[0].get(line_addr)
+
+    def insertar(self, line_addr, dato):
+        """
+        Inserta una línea (que no está presente), expulsando si el conjunto está lleno
+
+        Returns:
+            tuple (line_addr, dato, sucia) de la víctima, o None
+        """
+        lineas, estado = self._conjunto(line_addr)
+        expulsada = None
+        if len(lineas) >= self.ways:
+            if self.politica.expulsa_primera:
+                victima, dato_victima = lineas.popitem(last=False)
+            else:
+                victima = self.politica.victima(lineas, estado)
+                dato_victima = lineas.pop(victima)
+                self.politica.expulsion(estado, victima)
+            sucia = victima in self.sucias
+            if sucia:
+                self.sucias.remove(victima)
+            expulsada = (victima, dato_victima, sucia)
+            self._ocupadas -= 1
+        lineas[line_addr] = dato
+        self.politica.insercion(lineas, estado, line_addr)
+        self._ocupadas += 1
+        return expulsada
+
+    def actualizar(self, line_addr, dato):
+        """Cambia el dato de una línea presente (sin tocar la política: el acceso ya se contó)"""
+        conjunto = self._sets[(line_addr // self.line_size) % self.num_sets]
+        conjunto[0][line_addr] = dato
+
+    def marcar_sucia(self, line_addr):
+        """Pone el bit dirty de una línea presente"""
+        self.sucias.add(line_addr)
+
+    def invalidar(self, line_addr):
+        """Saca una línea si está presente (coherencia, inclusión...); se pierde el bit dirty"""
+        conjunto = self._sets.get((line_addr // self.line_size) % self.num_sets)
+        if conjunto is None or line_addr not in conjunto[0]:
+            return None
+        lineas, estado = conjunto
+        self.sucias.discard(line_addr)
+        self.politica.expulsion(estado, line_addr)
+        self._ocupadas -= 1
+        return lineas.pop(line_addr)
+
+    def describir(self):
+        """Texto corto con la geometría de la cache"""
+        if self.num_sets == 1:
+            forma = "totalmente asociativa"
+        elif self.ways == 1:
+            forma = "mapeo directo"
+        else:
+            forma = f"{self.ways}-way"
+        return (f"{self.tamaño // 1024} KB, {forma}, {self.num_sets} sets, "
+                f"línea {self.line_size} B, {self.politica.nombre}")
+
+
+if __name__ == "__main__":
+    # ========================================
+    # EXPERIMENTO: Políticas frente a un recorrido que NO cabe
+    # ========================================
+    print("=" * 70)
+    print("🔁 POLÍTICAS DE REEMPLAZO: recorrido cíclico 25% más grande que la cache")
+    print("=" * 70)
+
+    tamaño = 32 * 1024
+    lineas_recorrido = int(tamaño // 64 * 1.25)
+    trazo = [i * 64 for i in range(lineas_recorrido)] * 20
+
+    print(f"\n{'Política':<10} {'Hit rate':>10}")
+    print("-" * 25)
+    for nombre in POLITICAS:
+        cache = CacheAsociativo(tamaño, ways=8, politica=nombre, semilla=1)
+        hits = 0
+        for addr in trazo:
+            if cache.buscar(addr) is not None:
+                hits += 1
+            else:
+                cache.insertar(addr, addr)
+        print(f"{nombre:<10} {hits / len(trazo) * 100:>9.1f}%")
+
+    # ========================================
+    # EXPERIMENTO: L3 de 16 MB, 16-way
+    # ========================================
+    print("\n" + "=" * 70)
+    print("🏎️  L3 16 MB / 16-way: 1M accesos aleatorios")
+    print("=" * 70)
+    l3 = CacheAsociativo(16 * 1024 * 1024, ways=16, politica='LRU')
+    rng = random.Random(0)
+    inicio = time.perf_counter()
+    for _ in range(1_000_000):
+        addr = rng.randrange(0, 64 * 1024 * 1024, 64)
+        if l3.buscar(addr) is None:
+            l3.insertar(addr, addr)
+    segundos = time.perf_counter() - inicio
+    print(f"   {l3.describir()}")
+    print(f"   Líneas ocupadas: {len(l3):,} / {l3.num_lineas:,}")
+    print(f"   Tiempo: {segundos:.2f} s ({1_000_000 / segundos / 1e6:.2f} M accesos/s)")
+
+    # ========================================
+    # EXPERIMENTO: Totalmente asociativa (1 conjunto de 32K vías)
+    # ========================================
+    print("\n" + "=" * 70)
+    print("🧮 2 MB totalmente asociativa: 200K accesos aleatorios + invalidaciones")
+    print("=" * 70)
+    for nombre in ('PLRU', 'RANDOM'):
+        cache = CacheAsociativo(2 * 1024 * 1024, politica=nombre, semilla=1)
+        rng = random.Random(0)
+        inicio = time.perf_counter()
+        for _ in range(200_000):
+            addr = rng.randrange(0, 64 * 60_000, 64)
+            if cache.buscar(addr) is None:
+                cache.insertar(addr, addr)
+            if rng.random() < 0.01:
+                cache.invalidar(rng.randrange(0, 64 * 60_000, 64))
+        segundos = time.perf_counter() - inicio
+        print(f"   {nombre:<7} {200_000 / segundos / 1e6:.2f} M accesos/s")
+
+        # El estado de la política sigue describiendo exactamente al conjunto
+        lineas, estado = cache._sets[0]
+        if nombre == 'PLRU':
+            _, via_de, ocupantes, libres = estado
+            assert via_de.keys() == lineas.keys()
+            assert all(ocupantes[via] == linea for linea, via in via_de.items())
+            assert sorted(libres) == [via for via, linea in enumerate(ocupantes) if linea is None]
+        else:
+            orden, posicion = estado
+            assert posicion.keys() == lineas.keys()
+            assert all(orden[indice] == linea for linea, indice in posicion.items())
+    print("\n✅ PLRU y RANDOM sin recorrer las vías del conjunto")
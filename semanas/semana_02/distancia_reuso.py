@@ -0,0 +1,164 @@
+"""
+Distancia de reuso (stack distance): curva de fallos LRU en UNA pasada
+Predice el hit rate de una cache totalmente asociativa LRU para TODOS los tamaños
+"""
+
+import time
+
+import numpy as np
+
+
+def distancias_de_reuso(direcciones, line_size=64):
+    """
+    Distancia de reuso de cada acceso: cuántas líneas DISTINTAS se tocaron
+    desde el acceso anterior a la misma línea (-1 = primera vez)
+
+    Una cache LRU totalmente asociativa de C líneas acierta exactamente
+    los accesos con 0 <= distancia < C.
+
+    Algoritmo O(N log N): un árbol de Fenwick marca, para cada línea, la
+    posición de su último acceso; la distancia es cuántas marcas hay entre
+    el acceso anterior y el actual. Las rachas de accesos seguidos a la
+    misma línea (distancia 0) se resuelven con NumPy antes del bucle.
+
+    Args:
+        direcciones: array de direcciones (sirve un np.memmap de TrazaMemoria)
+
+    Returns:
+        np.ndarray int64 con una distancia por acceso
+    """
+    lineas = np.asarray(direcciones, dtype=np.int64) // line_size
+    n = len(lineas)
+    distancias = np.zeros(n, dtype=np.int64)
+    if n == 0:
+        return distancias
+
+    # Solo las cabezas de racha pasan por el árbol
+    cabeza = np.empty(n, dtype=bool)
+    cabeza[0] = True
+    np.not_equal(lineas[1:], lineas[:-1], out=cabeza[1:])
+    posiciones = np.flatnonzero(cabeza)
+    m = len(posiciones)
+
+    # Acceso anterior (entre cabezas) a la misma línea, vectorizado
+    _, ids = np.unique(lineas[posiciones], return_inverse=True)
+    orden = np.argsort(ids, kind='stable')
+    anterior = np.full(m, -1, dtype=np.int64)
+    misma = ids[orden[1:]] == ids[orden[:-1]]
+    anterior[orden[1:][misma]] = orden[:-1][misma]
+
+    arbol = [0] * (m + 1)
+    marcadas = 0
+    resultado = [0] * m
+    for i, p in enumerate(anterior.tolist()):
+        if p < 0:
+            resultado[i] = -1
+        else:
+            # Marcas en posiciones <= p
+            suma = 0
+            j = p + 1
+            while j:
+                suma += arbol[j]
+                j &= j - 1
+            resultado[i] = marcadas - suma
+            # La línea deja de tener su último acceso en p
+            j = p + 1
+            while j <= m:
+                arbol[j] -= 1
+                j += j & -j
+            marcadas -= 1
+        j = i + 1
+        while j <= m:
+            arbol[j] += 1
+            j += j & -j
+        marcadas += 1
+
+    distancias[posiciones] = resultado
+    return distancias
+
+
+class CurvaFallosLRU:
+    """
+    Curva de fallos (miss-ratio curve) LRU de una traza
+
+    Se calcula una vez; luego cualquier tamaño de cache se consulta en O(1).
+    """
+
+    def __init__(self, direcciones, line_size=64):
+        self.line_size = line_size
+        distancias = distancias_de_reuso(direcciones, line_size)
+        self.accesos = len(distancias)
+        self.frios = int((distancias < 0).sum())  # Misses obligatorios (primera vez)
+        # histograma[d] = accesos con distancia d
+        self.histograma = np.bincount(distancias[distancias >= 0])
+        # hits_acumulados[C] = accesos con distancia < C (hits con C líneas)
+        self._hits_acumulados = np.concatenate(([0], np.cumsum(self.histograma)))
+
+    def hits(self, capacidad_lineas):
+        """Hits de una cache LRU totalmente asociativa de `capacidad_lineas` líneas"""
+        c = min(int(capacidad_lineas), len(self._hits_acumulados) - 1)
+        return int(self._hits_acumulados[c])
+
+    def tasa_fallos(self, capacidad_bytes):
+        """Miss ratio para una cache de `capacidad_bytes`"""
+        if self.accesos == 0:
+            return 0.0
+        return 1 - self.hits(capacidad_bytes // self.line_size) / self.accesos
+
+    def curva(self):
+        """
+        Returns:
+            tuple: (capacidades en líneas 0..D, miss ratio de cada una);
+                   a partir de D+1 líneas solo quedan los misses fríos
+        """
+        capacidades = np.arange(len(self._hits_acumulados))
+        return capacidades, 1 - self._hits_acumulados / max(self.accesos, 1)
+
+
+if __name__ == "__main__":
+    from cache_asociativo import CacheAsociativo
+
+    # ========================================
+    # EXPERIMENTO: Curva de fallos de una traza mixta
+    # ========================================
+    print("=" * 70)
+    print("📉 CURVA DE FALLOS LRU EN UNA PASADA (distancia de reuso)")
+    print("=" * 70)
+
+    rng = np.random.default_rng(0)
+    partes = []
+    for _ in range(400):
+        tipo = rng.integers(0, 3)
+        if tipo == 0:    # Recorrido secuencial de un array (int32)
+            base = rng.integers(0, 1 << 16) * 64
+            partes.append(base + np.arange(rng.integers(64, 4096)) * 4)
+        elif tipo == 1:  # Bucle sobre un working set pequeño
+            partes.append(np.tile(np.arange(0, 8 * 1024, 64), rng.integers(1, 8)) + (1 << 28))
+        else:            # Accesos aleatorios a un heap de 8 MB
+            partes.append(rng.integers(0, 8 << 20, rng.integers(100, 2000)) + (1 << 30))
+    trazo = np.concatenate(partes)
+
+    inicio = time.perf_counter()
+    curva = CurvaFallosLRU(trazo)
+    segundos = time.perf_counter() - inicio
+    print(f"\n{len(trazo):,} accesos analizados en {segundos:.2f} s "
+          f"({curva.frios:,} misses fríos)")
+
+    tamaños = [4 << 10, 16 << 10, 64 << 10, 256 << 10, 1 << 20, 4 << 20, 16 << 20]
+    print(f"\n{'Tamaño':>10} {'Miss ratio':>12} {'Simulado':>10}")
+    print("-" * 36)
+    for tamaño in tamaños:
+        prediccion = curva.tasa_fallos(tamaño)
+        simulado = ""
+        if tamaño <= 256 << 10:  # Comprueba contra la cache real (los chicos son rápidos)
+            cache = CacheAsociativo(tamaño, politica='LRU')
+            hits = 0
+            for linea in ((trazo // 64) * 64).tolist():
+                if cache.buscar(linea) is not None:
+                    hits += 1
+                else:
+                    cache.insertar(linea, linea)
+            simulado = f"{(1 - hits / len(trazo)) * 100:>9.2f}%"
+            assert hits == curva.hits(tamaño // 64)
+        print(f"{tamaño // 1024:>7} KB {prediccion * 100:>11.2f}% {simulado:>10}")
+    print("\n✅ La curva coincide exactamente con la simulación LRU totalmente asociativa")
@@ -0,0 +1,364 @@
+"""
+Motor DMA con cadenas de descriptores (scatter/gather) sobre el Bus
+La CPU programa la copia y sigue calculando; el DMA mueve los datos en segundo plano
+"""
+
+from eventos_bus import SimuladorEventosBus
+from simulador_bus import Bus, Transaccion
+
+# Un descriptor en memoria: fuente, destino, tamaño y puntero al siguiente
+BYTES_DESCRIPTOR = 32
+
+# Costos de la CPU en ciclos
+COSTOS_CPU = {
+    'programar_dma': 200,  # Escribir los registros del controlador (MMIO)
+    'por_descriptor': 40,  # Armar un descriptor en memoria
+    'interrupcion': 1000,  # Atender la interrupción de fin de DMA
+    'por_palabra': 2,      # load + store de una copia hecha por la CPU
+}
+
+
+class Descriptor:
+    """Un segmento de la copia; `siguiente` encadena la lista scatter/gather"""
+    __slots__ = ('fuente', 'destino', 'tamaño', 'direccion', 'siguiente')
+
+    def __init__(self, fuente, destino, tamaño, direccion=0, siguiente=None):
+        self.fuente = fuente
+        self.destino = destino
+        self.tamaño = tamaño
+        self.direccion = direccion  # Dónde vive el descriptor (el DMA lo lee por el bus)
+        self.siguiente = siguiente
+
+
+def cadena_descriptores(segmentos, base=0xD000_0000):
+    """
+    Arma una cadena de descriptores a partir de (fuente, destino, tamaño)
+
+    Returns:
+        Descriptor: la cabeza de la cadena (None si no hay segmentos)
+    """
+    cabeza = None
+    for i, (fuente, destino, tamaño) in reversed(list(enumerate(segmentos))):
+        cabeza = Descriptor(fuente, destino, tamaño, base + i * BYTES_DESCRIPTOR, cabeza)
+    return cabeza
+
+
+def largo_cadena(cabeza):
+    n = 0
+    while cabeza is not None:
+        n += 1
+        cabeza = cabeza.siguiente
+    return n
+
+
+class MotorDMA:
+    """
+    Controlador DMA que recorre una cadena de descriptores
+
+    Por cada descriptor: lo lee de memoria (BYTES_DESCRIPTOR por el bus), y
+    copia el segmento en trozos de `rafaga` bytes (READ de la fuente y luego
+    WRITE al destino), con hasta `max_en_vuelo` trozos a la vez. El siguiente
+    descriptor se busca mientras terminan los trozos del anterior.
+    """
+
+    def __init__(self, sim, nombre='DMA', rafaga=256, max_en_vuelo=4, prioridad=4):
+        self.sim = sim
+        self.nombre = nombre
+        self.rafaga = rafaga
+        self.max_en_vuelo = max_en_vuelo
+        self.prioridad = prioridad
+
+        self.activo = False
+        self.inicio = None
+        self.fin = None
+        self.al_terminar = None  # Función llamada al terminar (la "interrupción")
+
+        self._actual = None      # Descriptor cuyos trozos se están emitiendo
+        self._desplazamiento = 0
+        self._en_vuelo = 0
+        self._buscando = False   # Hay una lectura de descriptor en curso
+        self._pendientes = {}    # id(transacción) → (qué es, dato, bytes)
+        self._datos = memoryview(bytes(max(rafaga, BYTES_DESCRIPTOR)))
+
+        self.stats = {'descriptores': 0, 'bytes_copiados': 0, 'transacciones': 0}
+        sim.suscribir(nombre, self._completada)
+
+    def iniciar(self, cadena, al_terminar=None):
+        """Arranca la copia en el instante actual del simulador"""
+        if self.activo:
+            raise RuntimeError(f"{self.nombre} ya tiene una cadena en curso")
+        self.activo = True
+        self.inicio = self.sim.reloj
+        self.fin = None
+        if al_terminar is not None:
+            self.al_terminar = al_terminar
+        if cadena is None:
+            self._terminar()
+        else:
+            self._buscar(cadena)
+
+    def _emitir(self, tipo, direccion, n, info):
+        trans = Transaccion(self.nombre, 'RAM', direccion, tipo, self._datos[:n], n,
+                            self.prioridad, self.sim.reloj)
+        self._pendientes[id(trans)] = info
+        self.stats['transacciones'] += 1
+        self.sim.programar(trans)
+
+    def _buscar(self, descriptor):
+        self._buscando = True
+        self._emitir('READ', descriptor.direccion, BYTES_DESCRIPTOR, ('descriptor', descriptor, 0))
+
+    def _completada(self, trans):
+        que, dato, n = self._pendientes.pop(id(trans))
+        if que == 'descriptor':
+            self._buscando = False
+            self._actual = dato
+            self._desplazamiento = 0
+            self.stats['descriptores'] += 1
+        elif que == 'leer':
+            self._emitir('WRITE', dato, n, ('escribir', None, n))
+            return
+        else:
+            self._en_vuelo -= 1
+            self.stats['bytes_copiados'] += n
+        self._avanzar()
+
+    def _avanzar(self):
+        descriptor = self._actual
+        if descriptor is not None:
+            while self._en_vuelo < self.max_en_vuelo and self._desplazamiento < descriptor.tamaño:
+                desplazamiento = self._desplazamiento
+                n = min(self.rafaga, descriptor.tamaño - desplazamiento)
+                self._emitir('READ', descriptor.fuente + desplazamiento, n,
+                             ('leer', descriptor.destino + desplazamiento, n))
+                self._en_vuelo += 1
+                self._desplazamiento += n
+            if self._desplazamiento >= descriptor.tamaño:
+                self._actual = None
+                if descriptor.siguiente is not None:
+                    self._buscar(descriptor.siguiente)
+        if self._actual is None and not self._buscando and self._en_vuelo == 0:
+            self._terminar()
+
+    def _terminar(self):
+        self.activo = False
+        self.fin = self.sim.reloj
+        if self.al_terminar is not None:
+            aviso, self.al_terminar = self.al_terminar, None
+            aviso()
+
+
+class CPUSimulada:
+    """
+    CPU en orden que ejecuta un programa de pasos sobre el simulador de eventos
+
+    Pasos:
+        ('computo', ciclos[, fallo_cada])  calcula; cada `fallo_cada` ciclos
+                                           un miss de cache bloquea (64 B)
+        ('copiar', fuente, destino, tamaño[, palabra])
+                                           copia hecha por la CPU: por cada
+                                           palabra un READ y un WRITE bloqueantes
+        ('dma', motor, cadena)             programa el DMA y sigue de largo
+        ('esperar_dma', motor)             se bloquea hasta la interrupción
+    """
+
+    def __init__(self, sim, frecuencia_ghz=3.0, nombre='CPU', prioridad=8, costos=None):
+        self.sim = sim
+        self.nombre = nombre
+        self.prioridad = prioridad
+        self.ciclo_ns = 1 / frecuencia_ghz
+        self.costos = dict(COSTOS_CPU, **(costos or {}))
+
+        self.inicio = None
+        self.fin = None
+        self.intervalos_computo = []  # (inicio, fin) en ns de trabajo útil
+        self.stats = {
+            'ciclos_computo': 0,
+            'ciclos_espera_memoria': 0,  # Misses de cache durante el cómputo
+            'ciclos_copia': 0,           # Copias hechas por la CPU (incluye esperas)
+            'ciclos_dma': 0,             # Programar el DMA + atender la interrupción
+            'ciclos_espera_dma': 0,      # Bloqueada esperando al DMA
+        }
+
+        self._pasos = iter(())
+        self._continuar = None  # Qué hacer cuando vuelve la transacción en curso
+        self._marca = 0.0       # Inicio de la espera o copia en curso
+        self._restante = 0      # Cómputo: ciclos que faltan
+        self._fallo_cada = None
+        self._copia = None      # Copia: (fuente, destino, tamaño, palabra)
+        self._hecho = 0
+        self._direccion_fallo = 0x4000_0000
+        self._palabra = memoryview(bytes(64))
+        sim.suscribir(nombre, self._volvio)
+
+    def ejecutar(self, programa):
+        """Empieza el programa en el instante actual del simulador"""
+        self._pasos = iter(programa)
+        self.inicio = self.sim.reloj
+        self.sim.en(self.sim.reloj, self._paso)
+
+    def _ciclos(self, ns):
+        return round(ns / self.ciclo_ns)
+
+    def _pedir(self, tipo, direccion, n, continuar):
+        self._continuar = continuar
+        self.sim.programar(Transaccion(self.nombre, 'RAM', direccion, tipo, self._palabra[:n], n,
+                                       self.prioridad, self.sim.reloj))
+
+    def _volvio(self, trans):
+        continuar, self._continuar = self._continuar, None
+        continuar()
+
+    def _paso(self):
+        paso = next(self._pasos, None)
+        if paso is None:
+            self.fin = self.sim.reloj
+            return
+        accion, *args = paso
+        getattr(self, '_' + accion)(*args)
+
+    # ---- Cómputo con misses de cache ----
+
+    def _computo(self, ciclos, fallo_cada=None):
+        self._restante = ciclos
+        self._fallo_cada = fallo_cada
+        self._calcular()
+
+    def _calcular(self):
+        if self._restante <= 0:
+            self._paso()
+            return
+        tramo = min(self._fallo_cada or self._restante, self._restante)
+        ahora = self.sim.reloj
+        fin = ahora + tramo * self.ciclo_ns
+        self.intervalos_computo.append((ahora, fin))
+        self.stats['ciclos_computo'] += tramo
+        self._restante -= tramo
+        self.sim.en(fin, self._fallo if self._restante > 0 else self._paso)
+
+    def _fallo(self):
+        self._marca = self.sim.reloj
+        self._direccion_fallo += 64
+        self._pedir('READ', self._direccion_fallo, 64, self._fin_fallo)
+
+    def _fin_fallo(self):
+        self.stats['ciclos_espera_memoria'] += self._ciclos(self.sim.reloj - self._marca)
+        self._calcular()
+
+    # ---- Copia hecha por la CPU ----
+
+    def _copiar(self, fuente, destino, tamaño, palabra=8):
+        self._copia = (fuente, destino, tamaño, palabra)
+        self._hecho = 0
+        self._marca = self.sim.reloj
+        self._copiar_palabra()
+
+    def _copiar_palabra(self):
+        fuente, _, tamaño, palabra = self._copia
+        if self._hecho >= tamaño:
+            self.stats['ciclos_copia'] += self._ciclos(self.sim.reloj - self._marca)
+            self._paso()
+            return
+        n = min(palabra, tamaño - self._hecho)
+        instrucciones = self.costos['por_palabra'] * self.ciclo_ns
+        self.sim.en(self.sim.reloj + instrucciones,
+                    lambda: self._pedir('READ', fuente + self._hecho, n, self._escribir_palabra))
+
+    def _escribir_palabra(self):
+        _, destino, tamaño, palabra = self._copia
+        n = min(palabra, tamaño - self._hecho)
+
+        def siguiente():
+            self._hecho += n
+            self._copiar_palabra()
+        self._pedir('WRITE', destino + self._hecho, n, siguiente)
+
+    # ---- DMA ----
+
+    def _dma(self, motor, cadena):
+        ciclos = self.costos['programar_dma'] + self.costos['por_descriptor'] * largo_cadena(cadena)
+        self.stats['ciclos_dma'] += ciclos
+
+        def arrancar():
+            motor.iniciar(cadena)
+            self._paso()
+        self.sim.en(self.sim.reloj + ciclos * self.ciclo_ns, arrancar)
+
+    def _esperar_dma(self, motor):
+        self._marca = self.sim.reloj
+        if motor.activo:
+            motor.al_terminar = self._interrupcion
+        else:
+            self._interrupcion()
+
+    def _interrupcion(self):
+        self.stats['ciclos_espera_dma'] += self._ciclos(self.sim.reloj - self._marca)
+        ciclos = self.costos['interrupcion']
+        self.stats['ciclos_dma'] += ciclos
+        self.sim.en(self.sim.reloj + ciclos * self.ciclo_ns, self._paso)
+
+    # ---- Métricas ----
+
+    def ciclos_totales(self):
+        return self._ciclos(self.fin - self.inicio) if self.fin is not None else 0
+
+    def solapamiento(self, motor):
+        """Fracción del tiempo activo del DMA en que la CPU hizo trabajo útil"""
+        if motor.inicio is None or motor.fin is None or motor.fin <= motor.inicio:
+            return 0.0
+        solapado = sum(max(0.0, min(fin, motor.fin) - max(inicio, motor.inicio))
+                       for inicio, fin in self.intervalos_computo)
+        return solapado / (motor.fin - motor.inicio)
+
+
+if __name__ == "__main__":
+    # ========================================
+    # EXPERIMENTO: copiar 256 KB dispersos mientras se calcula
+    # ========================================
+    print("=" * 70)
+    print("🚀 DMA vs COPIA CON LA CPU: 64 páginas de 4 KB + 300k ciclos de cómputo")
+    print("=" * 70)
+
+    KB = 1024
+    segmentos = [(0x1000_0000 + i * 3 * 4 * KB, 0x2000_0000 + i * 4 * KB, 4 * KB) for i in range(64)]
+    computo = ('computo', 300_000, 2_000)  # Un miss de cache cada 2000 ciclos
+
+    def nuevo_sistema():
+        bus = Bus(ancho_bits=64, frecuencia_mhz=5000, latencia_memoria_ciclos=50)
+        return SimuladorEventosBus(bus)
+
+    resultados = {}
+    for palabra in (8, 64):
+        sim = nuevo_sistema()
+        cpu = CPUSimulada(sim)
+        cpu.ejecutar([('copiar', f, d, n, palabra) for f, d, n in segmentos] + [computo])
+        sim.ejecutar()
+        resultados[f"CPU copia de a {palabra} B"] = (cpu, None)
+
+    sim = nuevo_sistema()
+    cpu = CPUSimulada(sim)
+    motor = MotorDMA(sim, rafaga=256, max_en_vuelo=4)
+    cpu.ejecutar([('dma', motor, cadena_descriptores(segmentos)), computo, ('esperar_dma', motor)])
+    sim.ejecutar()
+    resultados["DMA (scatter/gather)"] = (cpu, motor)
+
+    base = resultados["CPU copia de a 8 B"][0]
+    print(f"\n{'Modo':<22} {'Tiempo':>10} {'Ciclos CPU':>11} {'En la copia':>12} "
+          f"{'Espera memoria':>15} {'Solape':>7}")
+    print("-" * 83)
+    for nombre, (cpu, motor) in resultados.items():
+        en_copia = cpu.stats['ciclos_copia'] + cpu.stats['ciclos_dma']
+        solape = f"{cpu.solapamiento(motor) * 100:.0f}%" if motor else "-"
+        print(f"{nombre:<22} {(cpu.fin - cpu.inicio) / 1000:>7.1f} μs {cpu.ciclos_totales():>11,} "
+              f"{en_copia:>12,} {cpu.stats['ciclos_espera_memoria']:>15,} {solape:>7}")
+
+    cpu, motor = resultados["DMA (scatter/gather)"]
+    liberados = base.stats['ciclos_copia'] - (cpu.stats['ciclos_copia'] + cpu.stats['ciclos_dma'])
+    print(f"\n   Ciclos de CPU liberados por el DMA: {liberados:,} "
+          f"({liberados / base.stats['ciclos_copia'] * 100:.1f}% de la copia)")
+    print(f"   DMA: {motor.stats['descriptores']} descriptores, {motor.stats['transacciones']:,} "
+          f"transacciones, {(motor.fin - motor.inicio) / 1000:.1f} μs en segundo plano")
+    print(f"   La CPU esperó al DMA {cpu.stats['ciclos_espera_dma']:,} ciclos al final")
+    print("\n💡 La copia sale de la CPU: solo cuesta programar los descriptores y la")
+    print("   interrupción; a cambio, el cómputo compite con el DMA por el bus: sus")
+    print("   misses esperan más (columna 'Espera memoria', en ciclos de CPU)")
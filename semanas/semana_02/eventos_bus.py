@@ -0,0 +1,454 @@
+"""
+Simulador de eventos discretos para el Bus
+Los dispositivos inyectan transacciones en instantes dados; el reloj salta de evento en evento
+"""
+
+import heapq
+import itertools
+from collections import Counter
+import time
+import tracemalloc
+
+import numpy as np
+
+from simulador_bus import (CICLOS_DIRECCION, CICLOS_READY, ArbitrajeEnvejecimiento,
+                           ArbitrajeWFQ, Bus, Transaccion, transacciones_de)
+
+# Tipos de evento: a igual tiempo se procesa antes lo que libera el bus
+FIN, LIBRE, RESPUESTA, LLEGADA, ACCION = 0, 1, 2, 3, 4
+
+
+class SimuladorEventosBus:
+    """
+    Motor de eventos discretos sobre un Bus
+
+    La cola de eventos es un heap ordenado por tiempo simulado (ns), así que
+    cada evento cuesta O(log n) sin importar cuántos ciclos dure una
+    transacción ni cuánto tiempo pase sin actividad.
+
+    - LLEGADA: la transacción entra a la cola de espera del bus
+    - FIN: terminan los datos de una transacción (o ráfaga); el bus queda libre
+    - LIBRE: (pipeline) termina la fase de dirección, puede entrar la siguiente
+    - RESPUESTA: (split) la memoria tiene los datos y pide el bus para enviarlos
+    - ACCION: una función programada con `en()` (p. ej. una CPU que termina de calcular)
+
+    Cuando el bus está libre y todos los eventos del instante actual ya se
+    procesaron, `bus.arbitrar()` elige la siguiente transacción. El
+    `timestamp` de cada Transaccion se interpreta como su instante de
+    llegada en ns simulados.
+
+    Sin MetricasBus en el bus se guarda una muestra por transacción
+    (origenes, esperas, latencias). Con MetricasBus, por defecto no: los
+    percentiles salen de sus histogramas y la memoria queda acotada.
+    """
+
+    def __init__(self, bus=None, guardar_muestras=None):
+        """
+        Args:
+            bus: Bus a simular (por defecto uno nuevo)
+            guardar_muestras: True/False fuerza guardar (o no) una muestra por
+                              transacción; None = solo si el bus no tiene métricas
+        """
+        self.bus = bus or Bus()
+        if guardar_muestras is None:
+            guardar_muestras = self.bus.metricas is None
+        self.guardar_muestras = guardar_muestras
+        self.periodo_ns = 1e9 / self.bus.ciclos_por_segundo
+        self.reloj = 0.0  # ns simulados
+
+        self._eventos = []  # heap de (tiempo, tipo, secuencia, transacción(es), fuente)
+        self._secuencia = itertools.count()  # Desempate estable a igual tiempo
+        self._inicios = {}     # id(transacción) → instante en que obtuvo el bus
+        self._respuestas = {}  # id(respuesta split) → transacción original
+        self._en_vuelo = 0     # Pipeline: transacciones con la fase de datos pendiente
+        self._fin_datos = 0.0  # Pipeline: cuándo se libera la fase de datos
+        self._avisos = {}      # origen → función llamada al completar cada transacción
+
+        # Una entrada por transacción completada (si guardar_muestras)
+        self.origenes = []
+        self.esperas = []     # ns en cola antes de obtener el bus
+        self.latencias = []   # ns desde la llegada hasta el fin
+        self.eventos_procesados = 0
+
+    # ========================================
+    # Inyección de transacciones
+    # ========================================
+
+    def programar(self, trans, tiempo_ns=None):
+        """Programa la llegada de una transacción (por defecto en trans.timestamp)"""
+        if tiempo_ns is not None:
+            trans.timestamp = tiempo_ns
+        heapq.heappush(self._eventos, (trans.timestamp, LLEGADA, next(self._secuencia), trans, None))
+
+    def agregar_fuente(self, llegadas):
+        """
+        Agrega un dispositivo que inyecta transacciones
+
+        Args:
+            llegadas: iterable de Transaccion con timestamp (ns) no decreciente;
+                      se consume de a una, así un generador de millones de
+                      transacciones ocupa una sola entrada en el heap
+        """
+        self._siguiente(iter(llegadas))
+
+    def suscribir(self, origen, funcion):
+        """`funcion(trans)` se llama cuando termina cada transacción de `origen`"""
+        self._avisos[origen] = funcion
+
+    def en(self, tiempo_ns, funcion):
+        """Programa `funcion()` para el instante `tiempo_ns` (reloj = ese instante)"""
+        heapq.heappush(self._eventos, (tiempo_ns, ACCION, next(self._secuencia), funcion, None))
+
+    def _siguiente(self, fuente):
+        trans = next(fuente, None)
+        if trans is not None:
+            heapq.heappush(self._eventos, (trans.timestamp, LLEGADA, next(self._secuencia), trans, fuente))
+
+    # ========================================
+    # Bucle de eventos
+    # ========================================
+
+    def ejecutar(self, hasta_ns=None):
+        """
+        Procesa eventos hasta vaciar el heap (o hasta `hasta_ns`)
+
+        Returns:
+            float: reloj simulado al terminar (ns)
+        """
+        eventos = self._eventos
+        bus = self.bus
+        while eventos:
+            if hasta_ns is not None and eventos[0][0] > hasta_ns:
+                self.reloj = hasta_ns
+                break
+            tiempo, tipo, _, trans, extra = heapq.heappop(eventos)
+            self.reloj = tiempo
+            self.eventos_procesados += 1
+
+            if tipo == LLEGADA:
+                bus.encolar(trans)
+                if bus.metricas is not None:
+                    bus.metricas.cola(tiempo, len(bus.cola_espera))
+                if extra is not None:
+                    self._siguiente(extra)
+            elif tipo == FIN:
+                self._completar(trans)
+                if bus.modo == 'pipeline':
+                    self._en_vuelo -= 1
+                else:
+                    bus.ocupado = False
+                    bus.transaccion_actual = None
+            elif tipo == LIBRE:
+                bus.ocupado = False
+            elif tipo == RESPUESTA:
+                self._responder(trans)
+            else:
+                trans()
+
+            # Se arbitra cuando ya llegó todo lo de este instante
+            if (not bus.ocupado and bus.cola_espera and self._en_vuelo < bus.profundidad
+                    and (not eventos or eventos[0][0] > tiempo)):
+                self._conceder()
+
+        if bus.metricas is not None:
+            bus.metricas.cerrar(self.reloj)
+        total = round(self.reloj / self.periodo_ns)
+        bus.stats['ciclos_totales'] = total
+        bus.stats['ciclos_idle'] = max(0, total - bus.stats['ciclos_ocupado'])
+        return self.reloj
+
+    def _evento(self, tiempo, tipo, dato):
+        heapq.heappush(self._eventos, (tiempo, tipo, next(self._secuencia), dato, None))
+
+    def _conceder(self):
+        """El árbitro da el bus y se programan las fases según el modo del bus"""
+        bus = self.bus
+        ahora = self.reloj
+        periodo = self.periodo_ns
+        trans = bus.arbitrar(ahora)
+        bus.ocupado = True
+        bus.transaccion_actual = trans
+        metricas = bus.metricas
+        if metricas is not None:
+            metricas.cola(ahora, len(bus.cola_espera))
+
+        original = self._respuestas.pop(id(trans), None)
+        if original is not None:
+            # Split: la memoria envía los datos (etiqueta + datos + READY)
+            ciclos = 1 + bus.calcular_ciclos_necesarios(trans.tamaño) + CICLOS_READY
+            self._evento(ahora + ciclos * periodo, FIN, [original])
+            bus.stats['ciclos_ocupado'] += ciclos
+            if metricas is not None:
+                metricas.ocupado(ahora, ahora + ciclos * periodo)
+            return
+
+        miembros = bus.rafaga_de(trans)
+        for miembro in miembros:
+            self._inicios[id(miembro)] = ahora
+            if metricas is not None:
+                metricas.concedida(miembro.origen, ahora - miembro.timestamp)
+        ciclos_datos = bus.calcular_ciclos_necesarios(sum(m.tamaño for m in miembros))
+        memoria = bus.latencia_memoria_ciclos * periodo
+
+        if bus.modo == 'split':
+            # Petición (con los datos si es escritura); la respuesta llega sola
+            ciclos = CICLOS_DIRECCION + (ciclos_datos if trans.tipo == 'WRITE' else 0)
+            fin_peticion = ahora + ciclos * periodo
+            self._evento(fin_peticion, FIN, [])
+            self._evento(fin_peticion + memoria, RESPUESTA, trans)
+        elif bus.modo == 'pipeline':
+            # La fase de datos espera a la memoria y a que acabe la anterior
+            fin_direccion = ahora + CICLOS_DIRECCION * periodo
+            inicio_datos = max(fin_direccion + memoria, self._fin_datos)
+            fin = inicio_datos + (ciclos_datos + CICLOS_READY) * periodo
+            ciclos = round((fin - max(ahora, self._fin_datos)) / periodo)  # Sin contar el solape
+            self._fin_datos = fin
+            self._en_vuelo += 1
+            self._evento(fin_direccion, LIBRE, None)
+            self._evento(fin, FIN, miembros)
+        else:
+            ciclos = (CICLOS_DIRECCION + bus.latencia_memoria_ciclos
+                      + ciclos_datos + CICLOS_READY)
+            self._evento(ahora + ciclos * periodo, FIN, miembros)
+        bus.stats['ciclos_ocupado'] += ciclos
+        if metricas is not None:
+            if bus.modo == 'pipeline':
+                metricas.ocupado(self._fin_datos - ciclos * periodo, self._fin_datos)
+            else:
+                metricas.ocupado(ahora, ahora + ciclos * periodo)
+
+    def _responder(self, trans):
+        """Split: la memoria terminó; una lectura pide el bus para devolver los datos"""
+        if trans.tipo == 'WRITE':
+            self._completar([trans])
+            return
+        respuesta = Transaccion(trans.destino, trans.origen, trans.direccion, 'READ',
+                                trans.datos, trans.tamaño, trans.prioridad, self.reloj)
+        self._respuestas[id(respuesta)] = trans
+        self.bus.encolar(respuesta)
+        if self.bus.metricas is not None:
+            self.bus.metricas.cola(self.reloj, len(self.bus.cola_espera))
+
+    def _completar(self, miembros):
+        stats = self.bus.stats
+        metricas = self.bus.metricas
+        for trans in miembros:
+            stats['transacciones_completadas'] += 1
+            stats['bytes_transferidos'] += trans.tamaño
+            if metricas is not None:
+                metricas.completada(trans.origen, trans.tamaño, self.reloj - trans.timestamp, self.reloj)
+            inicio = self._inicios.pop(id(trans))
+            if self.guardar_muestras:
+                self.origenes.append(trans.origen)
+                self.esperas.append(inicio - trans.timestamp)
+                self.latencias.append(self.reloj - trans.timestamp)
+            aviso = self._avisos.get(trans.origen)
+            if aviso is not None:
+                aviso(trans)
+
+    # ========================================
+    # Métricas
+    # ========================================
+
+    def percentiles(self, cuales=(50, 90, 99, 99.9), metrica='latencias', origen=None):
+        """
+        Percentiles (ns) de 'latencias' o 'esperas', global o de un dispositivo
+
+        Sin muestras guardadas se leen de los histogramas de bus.metricas.
+
+        Returns:
+            dict: percentil → ns
+        """
+        if not self.guardar_muestras:
+            if self.bus.metricas is None:
+                return {p: 0.0 for p in cuales}
+            return self.bus.metricas.percentiles(cuales, metrica, origen)
+        valores = np.asarray(getattr(self, metrica))
+        if origen is not None:
+            valores = valores[np.asarray(self.origenes) == origen]
+        if len(valores) == 0:
+            return {p: 0.0 for p in cuales}
+        return dict(zip(cuales, np.percentile(valores, cuales).tolist()))
+
+    def throughput(self):
+        """Bytes/s efectivos en tiempo simulado"""
+        if self.reloj <= 0:
+            return 0.0
+        return self.bus.stats['bytes_transferidos'] / self.reloj * 1e9
+
+    def utilizacion(self):
+        """Fracción del tiempo simulado con el bus ocupado"""
+        total = self.bus.stats['ciclos_totales']
+        return self.bus.stats['ciclos_ocupado'] / total if total else 0.0
+
+    def eficiencia(self):
+        """Bytes útiles por ciclo ocupado, relativo al ancho del bus"""
+        ocupado = self.bus.stats['ciclos_ocupado']
+        if not ocupado:
+            return 0.0
+        return self.bus.stats['bytes_transferidos'] / (ocupado * self.bus.bytes_por_ciclo)
+
+    def mostrar_estadisticas(self):
+        print(f"\n{'='*70}")
+        print(f"📊 SIMULACIÓN POR EVENTOS ({self.reloj / 1000:,.2f} μs simulados)")
+        print(f"{'='*70}")
+        print(f"\n   Transacciones: {self.bus.stats['transacciones_completadas']:,} "
+              f"| Eventos: {self.eventos_procesados:,}")
+        print(f"   Throughput: {self.throughput() / 1e9:.2f} GB/s "
+              f"(teórico {self.bus.bandwidth_bps / 1e9:.2f} GB/s)")
+        print(f"   Utilización del bus: {self.utilizacion() * 100:.1f}% "
+              f"| Eficiencia: {self.eficiencia() * 100:.1f}% (modo {self.bus.modo})")
+
+        print(f"\n   {'Origen':<10} {'N':>9} {'Espera p50':>11} {'Espera p99':>11} "
+              f"{'Lat p50':>9} {'Lat p99':>9}")
+        print("   " + "-" * 64)
+        if self.guardar_muestras:
+            cuantas = Counter(self.origenes)
+        elif self.bus.metricas is not None:
+            cuantas = {o: h.total for o, h in self.bus.metricas.latencias.items()}
+        else:
+            cuantas = {}
+        for origen, n in cuantas.items():
+            esperas = self.percentiles((50, 99), 'esperas', origen)
+            latencias = self.percentiles((50, 99), 'latencias', origen)
+            print(f"   {origen:<10} {n:>9,} {esperas[50]:>8.1f} ns {esperas[99]:>8.1f} ns "
+                  f"{latencias[50]:>6.1f} ns {latencias[99]:>6.1f} ns")
+
+
+def llegadas_poisson(origen, intervalo_medio_ns, n, tamaño=64, prioridad=5, tipo='READ',
+                     destino='RAM', direccion=0, inicio_ns=0.0, semilla=None):
+    """
+    Genera `n` transacciones con llegadas de Poisson (intervalos exponenciales)
+
+    Las direcciones son consecutivas desde `direccion`, de a `tamaño` bytes.
+    Todas comparten el mismo buffer de datos (no se copia por transacción).
+    """
+    rng = np.random.default_rng(semilla)
+    datos = memoryview(bytes(tamaño))
+    tiempo = inicio_ns
+    emitidas = 0
+    while emitidas < n:
+        intervalos = rng.exponential(intervalo_medio_ns, min(n - emitidas, 65536)).tolist()
+        for intervalo in intervalos:
+            tiempo += intervalo
+            yield Transaccion(origen, destino, direccion + emitidas * tamaño, tipo,
+                              datos, tamaño, prioridad, tiempo)
+            emitidas += 1
+
+
+if __name__ == "__main__":
+    # ========================================
+    # EXPERIMENTO: Latencia vs carga ofrecida
+    # ========================================
+    print("=" * 70)
+    print("⏱️  BUS POR EVENTOS: la espera explota cerca del 100% de uso")
+    print("=" * 70)
+
+    # (origen, bytes, prioridad, fracción de la carga)
+    dispositivos = [('CPU', 64, 8, 0.3), ('GPU', 1024, 5, 0.3),
+                    ('NVMe', 4096, 3, 0.2), ('Ethernet', 1500, 2, 0.15), ('USB', 64, 1, 0.05)]
+    duracion_ns = 2_000_000  # 2 ms simulados por punto
+
+    print(f"\n{'Carga':>6} {'Uso':>6} {'GB/s':>6} {'Espera p50':>11} {'Espera p99':>11} {'p99.9':>10}")
+    print("-" * 56)
+    for carga in (0.3, 0.5, 0.7, 0.9, 0.95):
+        sim = SimuladorEventosBus(Bus(ancho_bits=64, frecuencia_mhz=5000))
+        for k, (origen, tamaño, prioridad, fraccion) in enumerate(dispositivos):
+            # Intervalo medio para que este dispositivo ocupe `carga * fraccion` del bus
+            servicio_ns = sim.bus.ciclos_transaccion(
+                Transaccion(origen, 'RAM', 0, 'READ', b'', tamaño, 0, 0.0)) * sim.periodo_ns
+            intervalo = servicio_ns / (carga * fraccion)
+            n = int(duracion_ns / intervalo)
+            sim.agregar_fuente(llegadas_poisson(origen, intervalo, n, tamaño, prioridad,
+                                                direccion=k << 32, semilla=k))
+        sim.ejecutar()
+        esperas = sim.percentiles((50, 99, 99.9), 'esperas')
+        print(f"{carga * 100:>5.0f}% {sim.utilizacion() * 100:>5.1f}% {sim.throughput() / 1e9:>6.2f} "
+              f"{esperas[50]:>8.1f} ns {esperas[99]:>8.1f} ns {esperas[99.9]:>7.0f} ns")
+
+    sim.mostrar_estadisticas()
+    print("\n💡 La prioridad fija protege a la CPU; USB y Ethernet pagan la contención")
+
+    # ========================================
+    # EXPERIMENTO: Políticas de arbitraje con el bus saturado
+    # ========================================
+    print("\n" + "=" * 70)
+    print("⚖️  ARBITRAJE CON 120% DE CARGA: ¿quién se queda sin bus?")
+    print("=" * 70)
+
+    politicas = ['PRIORIDAD', 'ROUND-ROBIN',
+                 ArbitrajeWFQ({'CPU': 4, 'GPU': 2, 'NVMe': 1, 'USB': 1}),
+                 ArbitrajeEnvejecimiento(ns_por_punto=20)]
+    for politica in politicas:
+        sim = SimuladorEventosBus(Bus(ancho_bits=64, frecuencia_mhz=5000, arbitraje=politica))
+        for k, (origen, tamaño, prioridad) in enumerate([('CPU', 64, 8), ('GPU', 1024, 5),
+                                                         ('NVMe', 4096, 3), ('USB', 64, 1)]):
+            servicio_ns = (3 + tamaño // 8) * sim.periodo_ns
+            intervalo = servicio_ns / (1.2 / 4)  # Cada uno pide el 30% del bus
+            sim.agregar_fuente(llegadas_poisson(origen, intervalo, int(200_000 / intervalo),
+                                                tamaño, prioridad, direccion=k << 32, semilla=k))
+        sim.ejecutar(hasta_ns=200_000)
+        sim.bus.mostrar_inanicion()
+
+    # ========================================
+    # EXPERIMENTO: Modos de transferencia con transferencias chicas
+    # ========================================
+    print("\n" + "=" * 70)
+    print("📦 MODOS DEL BUS: 4 dispositivos leyendo de a 16 B, memoria a 50 ciclos")
+    print("=" * 70)
+
+    print(f"\n{'Modo':<9} {'GB/s':>6} {'Uso':>6} {'Eficiencia':>11} {'Lat p50':>10} {'Lat p99':>10}")
+    print("-" * 57)
+    for modo in ('simple', 'rafaga', 'pipeline', 'split'):
+        bus = Bus(ancho_bits=64, frecuencia_mhz=5000, modo=modo, latencia_memoria_ciclos=50,
+                  max_rafaga=256, profundidad=4)
+        sim = SimuladorEventosBus(bus)
+        for k in range(4):  # Cada uno pide 2 GB/s: 16 B cada 8 ns
+            sim.agregar_fuente(llegadas_poisson(f'DMA{k}', 8.0, 12_500, 16, 5,
+                                                direccion=k << 32, semilla=k))
+        sim.ejecutar(hasta_ns=100_000)
+        latencias = sim.percentiles((50, 99))
+        print(f"{modo:<9} {sim.throughput() / 1e9:>6.2f} {sim.utilizacion() * 100:>5.1f}% "
+              f"{sim.eficiencia() * 100:>10.1f}% {latencias[50]:>7.1f} ns {latencias[99]:>7.1f} ns")
+    print("\n💡 En modo simple el bus pasa casi todo el tiempo esperando a la memoria;")
+    print("   juntar transferencias (ráfaga) o soltar el bus (split) multiplica el throughput")
+
+    # ========================================
+    # EXPERIMENTO: Un millón de transacciones
+    # ========================================
+    print("\n" + "=" * 70)
+    print("🚀 1,000,000 DE TRANSACCIONES")
+    print("=" * 70)
+
+    sim = SimuladorEventosBus(Bus(ancho_bits=64, frecuencia_mhz=5000))
+    sim.agregar_fuente(llegadas_poisson('CPU', 4.0, 600_000, 64, 8, semilla=1))
+    sim.agregar_fuente(llegadas_poisson('GPU', 60.0, 400_000, 1024, 5, direccion=1 << 32, semilla=2))
+    inicio = time.perf_counter()
+    sim.ejecutar()
+    segundos = time.perf_counter() - inicio
+    print(f"\n   {sim.eventos_procesados:,} eventos en {segundos:.2f} s "
+          f"({sim.eventos_procesados / segundos / 1e6:.2f} M eventos/s)")
+    print(f"   {sim.reloj / 1e6:.2f} ms simulados, uso {sim.utilizacion() * 100:.1f}%, "
+          f"{sim.throughput() / 1e9:.2f} GB/s")
+
+    # ========================================
+    # EXPERIMENTO: 1 GB de payload sin copias
+    # ========================================
+    print("\n" + "=" * 70)
+    print("🪶 1 GB DE DATOS: las transacciones son vistas del buffer, no copias")
+    print("=" * 70)
+
+    tensor = np.zeros(1 << 28, dtype=np.float32)  # 1 GB (páginas sin tocar)
+    sim = SimuladorEventosBus(Bus(ancho_bits=64, frecuencia_mhz=5000))
+    tracemalloc.start()
+    # La GPU escribe el tensor en trozos de 64 KB, uno cada 1.7 μs (~38 GB/s)
+    sim.agregar_fuente(transacciones_de(tensor, 'GPU', 'RAM', trozo=64 * 1024, intervalo_ns=1700.0))
+    inicio = time.perf_counter()
+    sim.ejecutar()
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"\n   {sim.bus.stats['bytes_transferidos'] / 1024**3:.2f} GB simulados "
+          f"en {segundos:.2f} s ({sim.bus.stats['transacciones_completadas']:,} transacciones)")
+    print(f"   Memoria extra de Python (pico): {pico / 1024:.0f} KB "
+          f"(el payload nunca se copió)")
@@ -0,0 +1,351 @@
+"""
+Memoria Virtual: TLBs + page walk delante de MemoryHierarchy
+Páginas de 4 KB / 2 MB / 1 GB con tabla de páginas de 4 niveles (estilo x86-64)
+"""
+
+import numpy as np
+
+from cache_asociativo import CacheAsociativo
+from simulador_jerarquia_memoria import MemoryHierarchy
+
+KB4 = 4 * 1024
+MB2 = 2 * 1024 * 1024
+GB1 = 1024 * 1024 * 1024
+TAMAÑOS_PAGINA = (KB4, MB2, GB1)
+
+# Bits de la dirección virtual que indexan cada nivel (9 bits = 512 entradas de 8 bytes)
+DESPLAZAMIENTOS = (39, 30, 21, 12)  # PML4, PDPT, PD, PT
+# Nivel en el que termina el walk según el tamaño de página
+NIVEL_HOJA = {GB1: 1, MB2: 2, KB4: 3}
+TAMAÑO_HOJA = {nivel: tamaño for tamaño, nivel in NIVEL_HOJA.items()}
+BYTES_PTE = 8
+
+# Configuración por defecto: {tamaño de página: (entradas, ways)}
+TLB_L1_DEFECTO = {KB4: (64, 4), MB2: (32, 4), GB1: (4, 4)}
+TLB_L2_DEFECTO = {KB4: (1536, 12), MB2: (1536, 12), GB1: (16, 4)}
+
+
+class TLB:
+    """
+    Un nivel de TLB: un arreglo asociativo por tamaño de página
+
+    Se consultan todos los arreglos a la vez (como el hardware); cada uno
+    guarda página virtual → marco físico.
+    """
+
+    def __init__(self, configuracion):
+        self.arreglos = {
+            tamaño: CacheAsociativo(entradas * tamaño, line_size=tamaño, ways=ways)
+            for tamaño, (entradas, ways) in configuracion.items()
+        }
+
+    def buscar(self, va):
+        """
+        Returns:
+            tuple (marco físico, tamaño de página) o None si es miss
+        """
+        for tamaño, arreglo in self.arreglos.items():
+            marco = arreglo.buscar(va - va % tamaño)
+            if marco is not None:
+                return marco, tamaño
+        return None
+
+    def insertar(self, va, marco, tamaño):
+        arreglo = self.arreglos.get(tamaño)
+        if arreglo is not None:  # Este nivel no guarda páginas de ese tamaño
+            arreglo.insertar(va - va % tamaño, marco)
+
+
+class MemoriaVirtual:
+    """
+    Traduce direcciones virtuales antes de entrar a la jerarquía de memoria
+
+    - TLB L1 → TLB L2 → page walk de hasta 4 niveles
+    - Cada lectura de una entrada de la tabla de páginas (PTE) es un acceso
+      real a MemoryHierarchy: puede acertar en L1/L2/L3 o ir a RAM
+    - Las páginas se asignan en el primer toque (fallo de página); el
+      tamaño de página sale de la región reservada con mapear()
+    """
+
+    def __init__(self, jerarquia=None, tamaño_pagina=KB4, tlb_l1=None, tlb_l2=None):
+        """
+        Args:
+            jerarquia: MemoryHierarchy donde van los accesos (se crea una si es None)
+            tamaño_pagina: tamaño por defecto fuera de las regiones de mapear()
+            tlb_l1, tlb_l2: {tamaño de página: (entradas, ways)}
+        """
+        if tamaño_pagina not in TAMAÑOS_PAGINA:
+            raise ValueError(f"Tamaño de página no soportado: {tamaño_pagina}")
+        self.mem = jerarquia or MemoryHierarchy()
+        self.tamaño_pagina = tamaño_pagina
+        self.tlb_l1 = TLB(tlb_l1 or TLB_L1_DEFECTO)
+        self.tlb_l2 = TLB(tlb_l2 or TLB_L2_DEFECTO)
+
+        # Latencias extra en nanosegundos
+        self.LATENCIAS = {
+            'TLB_L2': 2,
+            'FALLO_PAGINA': 1000,  # Trap al sistema operativo + asignar marco
+        }
+
+        self._regiones = []          # (inicio, fin, tamaño de página)
+        self._tablas = {}            # base física de la tabla → {índice: tabla hija o (marco, tamaño)}
+        self._siguiente_fisica = 0   # Asignador de memoria física (bump)
+        self.raiz = self._nueva_tabla()
+
+        self.stats = {
+            'accesos': 0,
+            'TLB_L1_hits': 0,
+            'TLB_L2_hits': 0,
+            'walks': 0,
+            'walk_accesos': 0,    # Lecturas de PTE
+            'walk_latency': 0,
+            'fallos_pagina': 0,
+            'paginas_partidas': 0,  # Huge pages asignadas como páginas chicas (ya había tabla)
+            'traduccion_latency': 0,
+        }
+
+    # ========================================
+    # MAPEO Y ASIGNACIÓN
+    # ========================================
+
+    def mapear(self, va, longitud, tamaño_pagina):
+        """
+        Reserva [va, va + longitud) para usar páginas de ese tamaño (p. ej. huge pages)
+
+        La región se agranda a páginas completas (inicio y fin alineados) y no
+        puede pisar otra región. Conviene mapear antes del primer toque: una
+        página ya asignada se queda con el tamaño que tenía.
+        """
+        if tamaño_pagina not in TAMAÑOS_PAGINA:
+            raise ValueError(f"Tamaño de página no soportado: {tamaño_pagina}")
+        inicio = va - va % tamaño_pagina
+        fin = -(-(va + longitud) // tamaño_pagina) * tamaño_pagina
+        for otro_inicio, otro_fin, _ in self._regiones:
+            if inicio < otro_fin and otro_inicio < fin:
+                raise ValueError(f"La región [0x{inicio:X}, 0x{fin:X}) pisa a "
+                                 f"[0x{otro_inicio:X}, 0x{otro_fin:X})")
+        self._regiones.append((inicio, fin, tamaño_pagina))
+
+    def _tamaño_para(self, va):
+        """Tamaño de página de va: el de su región, o el por defecto si esa página no toca ninguna"""
+        for inicio, fin, tamaño in self._regiones:
+            if inicio <= va < fin:
+                return tamaño
+        for tamaño in sorted((t for t in TAMAÑOS_PAGINA if t <= self.tamaño_pagina), reverse=True):
+            pagina = va - va % tamaño
+            if not any(pagina < fin and inicio < pagina + tamaño for inicio, fin, _ in self._regiones):
+                return tamaño
+        return KB4
+
+    def _asignar_fisica(self, tamaño):
+        """Reserva memoria física alineada a `tamaño`"""
+        base = -(-self._siguiente_fisica // tamaño) * tamaño
+        self._siguiente_fisica = base + tamaño
+        return base
+
+    def _nueva_tabla(self):
+        base = self._asignar_fisica(KB4)
+        self._tablas[base] = {}
+        return base
+
+    def _fallo_pagina(self, va):
+        """
+        Crea las tablas que falten y la página que contiene va
+
+        Si donde iría la página grande ya hay una tabla de nivel inferior
+        (páginas chicas asignadas antes en ese rango), la página se parte:
+        se baja a esa tabla y se asigna una página del tamaño de ese nivel.
+        """
+        self.stats['fallos_pagina'] += 1
+        hoja = NIVEL_HOJA[self._tamaño_para(va)]
+        tabla = self.raiz
+        nivel = 0
+        while True:
+            entradas = self._tablas[tabla]
+            indice = (va >> DESPLAZAMIENTOS[nivel]) & 0x1FF
+            hija = entradas.get(indice)
+            if hija is None and nivel >= hoja:
+                break
+            if isinstance(hija, tuple):
+                raise ValueError(f"0x{va:X} ya está mapeada por una página de {hija[1]} B")
+            if hija is None:
+                hija = entradas[indice] = self._nueva_tabla()
+            tabla = hija
+            nivel += 1
+        tamaño = TAMAÑO_HOJA[nivel]
+        if nivel > hoja:
+            self.stats['paginas_partidas'] += 1
+        entradas[indice] = (self._asignar_fisica(tamaño), tamaño)
+
+    # ========================================
+    # TRADUCCIÓN
+    # ========================================
+
+    def _page_walk(self, va):
+        """
+        Recorre la tabla de páginas; cada PTE se lee a través de las caches
+
+        Returns:
+            tuple: (marco físico, tamaño de página, latencia del walk)
+        """
+        self.stats['walks'] += 1
+        latencia = 0
+        tabla = self.raiz
+        for desplazamiento in DESPLAZAMIENTOS:
+            indice = (va >> desplazamiento) & 0x1FF
+            _, lat, _ = self.mem.leer_memoria(tabla + indice * BYTES_PTE)
+            latencia += lat
+            self.stats['walk_accesos'] += 1
+
+            entrada = self._tablas[tabla].get(indice)
+            if entrada is None:
+                self._fallo_pagina(va)
+                latencia += self.LATENCIAS['FALLO_PAGINA']
+                entrada = self._tablas[tabla][indice]
+            if isinstance(entrada, tuple):
+                marco, tamaño = entrada
+                break
+            tabla = entrada
+        self.stats['walk_latency'] += latencia
+        return marco, tamaño, latencia
+
+    def traducir(self, va):
+        """
+        Dirección virtual → física
+
+        Returns:
+            tuple: (dirección física, latencia de traducción en ns)
+        """
+        self.stats['accesos'] += 1
+        encontrado = self.tlb_l1.buscar(va)
+        if encontrado is not None:
+            self.stats['TLB_L1_hits'] += 1
+            marco, tamaño = encontrado
+            return marco + va % tamaño, 0
+
+        latencia = self.LATENCIAS['TLB_L2']
+        encontrado = self.tlb_l2.buscar(va)
+        if encontrado is not None:
+            self.stats['TLB_L2_hits'] += 1
+            marco, tamaño = encontrado
+        else:
+            marco, tamaño, lat_walk = self._page_walk(va)
+            latencia += lat_walk
+            self.tlb_l2.insertar(va, marco, tamaño)
+        self.tlb_l1.insertar(va, marco, tamaño)
+        self.stats['traduccion_latency'] += latencia
+        return marco + va % tamaño, latencia
+
+    def leer(self, va, pc=None):
+        """
+        Lee una dirección virtual (traducción + jerarquía)
+
+        Returns:
+            tuple: (dato, latencia_total_ns, nivel_encontrado)
+        """
+        pa, lat_traduccion = self.traducir(va)
+        dato, latencia, nivel = self.mem.leer_memoria(pa, pc)
+        return dato, latencia + lat_traduccion, nivel
+
+    def escribir(self, va, dato=None, tamaño=4):
+        """
+        Escribe en una dirección virtual
+
+        Returns:
+            tuple: (latencia_total_ns, nivel donde se escribió)
+        """
+        pa, lat_traduccion = self.traducir(va)
+        latencia, nivel = self.mem.escribir_memoria(pa, dato, tamaño)
+        return latencia + lat_traduccion, nivel
+
+    def reiniciar_estadisticas(self):
+        """Pone a cero los contadores (TLBs, tablas y caches quedan como están)"""
+        for clave in self.stats:
+            self.stats[clave] = 0
+        self.mem.reiniciar_estadisticas()
+
+    def mostrar_estadisticas(self):
+        """Muestra estadísticas de traducción"""
+        accesos = self.stats['accesos']
+        print("\n" + "="*70)
+        print("📊 ESTADÍSTICAS DE TRADUCCIÓN (TLB + PAGE WALK)")
+        print("="*70)
+        if accesos == 0:
+            return
+        print(f"\n🎯 TLB L1: {self.stats['TLB_L1_hits'] / accesos * 100:.2f}% hits")
+        misses_l1 = accesos - self.stats['TLB_L1_hits']
+        if misses_l1:
+            print(f"🎯 TLB L2: {self.stats['TLB_L2_hits'] / misses_l1 * 100:.2f}% hits "
+                  f"(de los misses de L1)")
+        print(f"\n🚶 Page walks: {self.stats['walks']:,}")
+        if self.stats['walks']:
+            print(f"   Lecturas de PTE: {self.stats['walk_accesos']:,}")
+            print(f"   Latencia media del walk: "
+                  f"{self.stats['walk_latency'] / self.stats['walks']:.1f} ns")
+        print(f"   Fallos de página: {self.stats['fallos_pagina']:,}")
+        print(f"\n⏱️  Traducción media por acceso: "
+              f"{self.stats['traduccion_latency'] / accesos:.2f} ns")
+
+
+if __name__ == "__main__":
+    # ========================================
+    # EXPERIMENTO: ¿Cuánto ganan las huge pages?
+    # ========================================
+    print("=" * 70)
+    print("📄 HUGE PAGES: 50,000 lecturas aleatorias en un array de 512 MB")
+    print("=" * 70)
+
+    base = 0x7F00_0000_0000  # Heap típico en Linux
+    tamaño_array = 512 * 1024 * 1024
+    rng = np.random.default_rng(0)
+    direcciones = (base + rng.integers(0, tamaño_array // 8, 50_000) * 8).tolist()
+
+    print(f"\n{'Página':<8} {'TLB L1':>8} {'TLB L2':>8} {'Walks':>8} {'Walk medio':>11} "
+          f"{'Trad. media':>12} {'Acceso medio':>13}")
+    print("-" * 75)
+    for nombre, pagina in (("4 KB", KB4), ("2 MB", MB2), ("1 GB", GB1)):
+        vm = MemoriaVirtual(MemoryHierarchy(asociatividad=8))
+        vm.mapear(base, tamaño_array, pagina)
+        for va in direcciones:      # 1ª pasada: fallos de página y datos a RAM
+            vm.leer(va)
+        vm.reiniciar_estadisticas()
+        total = 0
+        for va in direcciones:      # 2ª pasada: régimen estable
+            total += vm.leer(va)[1]
+
+        s = vm.stats
+        misses_l1 = s['accesos'] - s['TLB_L1_hits']
+        walk_medio = s['walk_latency'] / s['walks'] if s['walks'] else 0.0
+        print(f"{nombre:<8} {s['TLB_L1_hits'] / s['accesos'] * 100:>7.1f}% "
+              f"{(s['TLB_L2_hits'] / misses_l1 * 100 if misses_l1 else 100.0):>7.1f}% "
+              f"{s['walks']:>8,} {walk_medio:>8.1f} ns "
+              f"{s['traduccion_latency'] / s['accesos']:>9.2f} ns {total / s['accesos']:>10.2f} ns")
+
+    print("\n💡 Con 4 KB, 512 MB necesitan 131,072 entradas de TLB: casi todo acceso")
+    print("   aleatorio hace un page walk. Con 2 MB bastan 256 (caben en la TLB L2).")
+
+    # ========================================
+    # VERIFICACIÓN: páginas de distinto tamaño en la misma tabla
+    # ========================================
+    # La región se agranda a la huge page completa: el orden de los toques no importa
+    for orden in ((3 << 19, 0), (0, 3 << 19)):
+        vm = MemoriaVirtual()
+        vm.mapear(base, 1 << 20, MB2)
+        for desplazamiento in orden:
+            vm.leer(base + desplazamiento)
+        assert vm.stats['fallos_pagina'] == 1
+        assert vm.traducir(base + (3 << 19))[0] - vm.traducir(base)[0] == 3 << 19
+    # Una huge page donde ya hay tabla de 4 KB se parte en vez de pisarla
+    vm.leer(base + MB2)
+    vm.mapear(base + MB2, MB2, MB2)
+    vm.leer(base + MB2 + 3 * KB4)
+    assert vm.stats['paginas_partidas'] == 1
+    assert vm.tlb_l1.buscar(base + MB2 + 3 * KB4)[1] == KB4
+    assert vm.traducir(base)[0] != vm.traducir(base + MB2)[0]
+    # Con huge pages por defecto, una región de 4 KB no queda tapada por una de 2 MB
+    vm = MemoriaVirtual(tamaño_pagina=MB2)
+    vm.mapear(base + 3 * KB4, KB4, KB4)
+    for va in (base, base + 3 * KB4, base + MB2):
+        vm.leer(va)
+    assert [vm.tlb_l1.buscar(va)[1] for va in (base, base + 3 * KB4, base + MB2)] == [KB4, KB4, MB2]
+    print("\n✅ Páginas de 4 KB y 2 MB conviven sin pisarse")
@@ -0,0 +1,359 @@
+"""
+Métricas en el tiempo para el Bus: línea de tiempo por ventanas e histogramas HDR
+Memoria acotada sin importar cuántas transacciones se simulen; exportables a CSV y NumPy
+"""
+
+import csv
+import math
+
+import numpy as np
+
+
+class HistogramaHDR:
+    """
+    Histograma log-lineal al estilo HdrHistogram
+
+    Los valores menores a 2^bits se cuentan exactos; por encima, cada
+    potencia de 2 se parte en 2^(bits-1) cubetas iguales, así el error
+    relativo de cualquier percentil es < 1 / 2^(bits-1) (0.8% con bits=8).
+    Con enteros de 64 bits hay a lo sumo ~7500 cubetas: memoria acotada.
+    """
+
+    def __init__(self, bits_precision=8, unidad_ns=1.0):
+        self.bits = bits_precision
+        self.unidad_ns = unidad_ns  # Resolución: valor entero = ns / unidad
+        self.cuentas = []
+        self.total = 0
+        self.suma = 0.0
+        self.minimo = math.inf
+        self.maximo = 0.0
+
+    def _indice(self, v):
+        bits = self.bits
+        if v < (1 << bits):
+            return v
+        e = v.bit_length() - bits
+        return (1 << bits) + ((e - 1) << (bits - 1)) + ((v >> e) - (1 << (bits - 1)))
+
+    def _limites(self, i):
+        """[desde, hasta) de la cubeta i, en unidades"""
+        bits = self.bits
+        if i < (1 << bits):
+            return i, i + 1
+        j = i - (1 << bits)
+        e = (j >> (bits - 1)) + 1
+        m = (j & ((1 << (bits - 1)) - 1)) + (1 << (bits - 1))
+        return m << e, (m + 1) << e
+
+    def registrar(self, valor_ns, veces=1):
+        i = self._indice(max(0, round(valor_ns / self.unidad_ns)))
+        cuentas = self.cuentas
+        if i >= len(cuentas):
+            cuentas.extend([0] * (i + 1 - len(cuentas)))
+        cuentas[i] += veces
+        self.total += veces
+        self.suma += valor_ns * veces
+        self.minimo = min(self.minimo, valor_ns)
+        self.maximo = max(self.maximo, valor_ns)
+
+    def media(self):
+        return self.suma / self.total if self.total else 0.0
+
+    def sumar(self, otro):
+        """Acumula las cuentas de otro histograma con la misma precisión y unidad"""
+        if (otro.bits, otro.unidad_ns) != (self.bits, self.unidad_ns):
+            raise ValueError("Solo se pueden sumar histogramas con la misma precisión y unidad")
+        if len(otro.cuentas) > len(self.cuentas):
+            self.cuentas.extend([0] * (len(otro.cuentas) - len(self.cuentas)))
+        for i, cuenta in enumerate(otro.cuentas):
+            self.cuentas[i] += cuenta
+        self.total += otro.total
+        self.suma += otro.suma
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+        return self
+
+    def percentiles(self, cuales=(50, 90, 99, 99.9, 99.99)):
+        """
+        Returns:
+            dict: percentil → ns (centro de la cubeta, acotado a [mínimo, máximo])
+        """
+        if not self.total:
+            return {p: 0.0 for p in cuales}
+        acumulado = np.cumsum(self.cuentas)
+        resultado = {}
+        for p in cuales:
+            objetivo = max(1, math.ceil(p / 100 * self.total))
+            i = int(np.searchsorted(acumulado, objetivo))
+            desde, hasta = self._limites(i)
+            valor = (desde + hasta - 1) / 2 * self.unidad_ns
+            resultado[p] = min(max(valor, self.minimo), self.maximo)
+        return resultado
+
+    def cubetas(self):
+        """
+        Returns:
+            tuple: (desde_ns, hasta_ns, cuentas) solo de las cubetas no vacías
+        """
+        indices = np.flatnonzero(self.cuentas)
+        limites = np.array([self._limites(int(i)) for i in indices], dtype=np.float64).reshape(-1, 2)
+        return (limites[:, 0] * self.unidad_ns, limites[:, 1] * self.unidad_ns,
+                np.asarray(self.cuentas, dtype=np.int64)[indices])
+
+
+class LineaTiempo:
+    """
+    Series por ventana de tiempo: uso del bus, bytes, transacciones y cola
+
+    Si se llega a `max_ventanas`, las ventanas se juntan de a pares y la
+    ventana se duplica: se conserva toda la historia con menos detalle y
+    la memoria nunca pasa de `max_ventanas` filas.
+    """
+
+    def __init__(self, ventana_ns=1000.0, max_ventanas=4096):
+        self.ventana_ns = ventana_ns
+        self.max_ventanas = max_ventanas
+        self.ocupado = []        # ns con el bus ocupado
+        self.bytes = []
+        self.transacciones = []
+        self.cola_area = []      # Integral de la profundidad de cola (transacciones·ns)
+        self.cola_max = []
+        self.fin_ns = 0.0
+
+        self._cola = 0           # Profundidad actual de la cola
+        self._t_cola = 0.0       # Desde cuándo tiene esa profundidad
+
+    def _ventana(self, tiempo):
+        """Índice de la ventana de `tiempo` (crea ventanas o compacta si hace falta)"""
+        i = int(tiempo // self.ventana_ns)
+        while i >= self.max_ventanas:
+            self._compactar()
+            i = int(tiempo // self.ventana_ns)
+        faltan = i + 1 - len(self.ocupado)
+        if faltan > 0:
+            for serie in (self.ocupado, self.bytes, self.transacciones, self.cola_area, self.cola_max):
+                serie.extend([0] * faltan)
+        return i
+
+    def _compactar(self):
+        for serie in (self.ocupado, self.bytes, self.transacciones, self.cola_area):
+            serie[:] = [sum(serie[k:k + 2]) for k in range(0, len(serie), 2)]
+        self.cola_max[:] = [max(self.cola_max[k:k + 2]) for k in range(0, len(self.cola_max), 2)]
+        self.ventana_ns *= 2
+
+    def _repartir(self, serie, inicio, fin, factor=1.0):
+        """Suma (duración × factor) de [inicio, fin) a cada ventana que toca"""
+        while inicio < fin:
+            i = self._ventana(inicio)
+            corte = min(fin, (i + 1) * self.ventana_ns)
+            serie[i] += (corte - inicio) * factor
+            inicio = corte
+
+    def ocupar(self, inicio, fin):
+        self._repartir(self.ocupado, inicio, fin)
+
+    def completar(self, tiempo, tamaño):
+        i = self._ventana(tiempo)
+        self.bytes[i] += tamaño
+        self.transacciones[i] += 1
+
+    def cola(self, tiempo, profundidad):
+        """La cola pasa a tener `profundidad` transacciones en `tiempo`"""
+        if self._cola:
+            self._repartir(self.cola_area, self._t_cola, tiempo, self._cola)
+            for k in range(self._ventana(self._t_cola), self._ventana(tiempo)):
+                self.cola_max[k] = max(self.cola_max[k], self._cola)
+        i = self._ventana(tiempo)
+        self.cola_max[i] = max(self.cola_max[i], profundidad)
+        self._cola = profundidad
+        self._t_cola = tiempo
+
+    def cerrar(self, tiempo):
+        """Integra la cola hasta `tiempo` y fija el final de la serie"""
+        self.cola(tiempo, self._cola)
+        self.fin_ns = max(self.fin_ns, tiempo)
+
+    def a_numpy(self):
+        """
+        Returns:
+            np.ndarray estructurado: inicio_ns, utilizacion, bytes_por_s,
+            transacciones, cola_media, cola_max (una fila por ventana)
+        """
+        n = len(self.ocupado)
+        filas = np.zeros(n, dtype=[('inicio_ns', 'f8'), ('utilizacion', 'f8'), ('bytes_por_s', 'f8'),
+                                   ('transacciones', 'i8'), ('cola_media', 'f8'), ('cola_max', 'i8')])
+        if n == 0:
+            return filas
+        inicio = np.arange(n) * self.ventana_ns
+        # La última ventana puede estar incompleta
+        duracion = np.minimum(self.ventana_ns, np.maximum(self.fin_ns - inicio, 1e-9))
+        filas['inicio_ns'] = inicio
+        filas['utilizacion'] = np.asarray(self.ocupado) / duracion
+        filas['bytes_por_s'] = np.asarray(self.bytes) / duracion * 1e9
+        filas['transacciones'] = self.transacciones
+        filas['cola_media'] = np.asarray(self.cola_area) / duracion
+        filas['cola_max'] = self.cola_max
+        return filas
+
+
+class MetricasBus:
+    """
+    Métricas de un Bus que alimentan los simuladores de eventos
+
+    Se asigna al bus (`Bus(metricas=MetricasBus(...))`) y el simulador
+    (SimuladorEventosBus o Topologia) avisa cada llegada, concesión y fin.
+    """
+
+    def __init__(self, ventana_ns=1000.0, max_ventanas=4096, bits_precision=8, unidad_ns=0.1):
+        self.linea = LineaTiempo(ventana_ns, max_ventanas)
+        self.bits_precision = bits_precision
+        self.unidad_ns = unidad_ns  # Resolución de los histogramas (un ciclo de bus es ~0.2 ns)
+        self.latencias = {}  # origen → HistogramaHDR (llegada → fin)
+        self.esperas = {}    # origen → HistogramaHDR (llegada → obtiene el bus)
+
+    def _histograma(self, tabla, origen):
+        histograma = tabla.get(origen)
+        if histograma is None:
+            histograma = tabla[origen] = HistogramaHDR(self.bits_precision, self.unidad_ns)
+        return histograma
+
+    # ---- Avisos del simulador ----
+
+    def cola(self, tiempo, profundidad):
+        self.linea.cola(tiempo, profundidad)
+
+    def concedida(self, origen, espera_ns):
+        self._histograma(self.esperas, origen).registrar(espera_ns)
+
+    def ocupado(self, inicio, fin):
+        self.linea.ocupar(inicio, fin)
+
+    def completada(self, origen, tamaño, latencia_ns, tiempo):
+        self._histograma(self.latencias, origen).registrar(latencia_ns)
+        self.linea.completar(tiempo, tamaño)
+
+    def cerrar(self, tiempo):
+        self.linea.cerrar(tiempo)
+
+    # ---- Consultas ----
+
+    def percentiles(self, cuales=(50, 90, 99, 99.9), metrica='latencias', origen=None):
+        """
+        Percentiles (ns) de 'latencias' o 'esperas', de un dispositivo o de todos juntos
+
+        Returns:
+            dict: percentil → ns (error relativo < 1 / 2^(bits-1))
+        """
+        tabla = getattr(self, metrica)
+        if origen is not None:
+            histograma = tabla.get(origen) or HistogramaHDR(self.bits_precision, self.unidad_ns)
+        else:
+            histograma = HistogramaHDR(self.bits_precision, self.unidad_ns)
+            for parcial in tabla.values():
+                histograma.sumar(parcial)
+        return histograma.percentiles(cuales)
+
+    # ---- Exportación ----
+
+    def histogramas_numpy(self):
+        """
+        Returns:
+            np.ndarray estructurado: origen, metrica, desde_ns, hasta_ns, cuenta
+        """
+        partes = []
+        for metrica, tabla in (('latencia', self.latencias), ('espera', self.esperas)):
+            for origen, histograma in tabla.items():
+                desde, hasta, cuentas = histograma.cubetas()
+                parte = np.zeros(len(cuentas), dtype=[('origen', 'U32'), ('metrica', 'U8'),
+                                                      ('desde_ns', 'f8'), ('hasta_ns', 'f8'),
+                                                      ('cuenta', 'i8')])
+                parte['origen'] = origen
+                parte['metrica'] = metrica
+                parte['desde_ns'] = desde
+                parte['hasta_ns'] = hasta
+                parte['cuenta'] = cuentas
+                partes.append(parte)
+        if not partes:
+            return np.zeros(0, dtype=[('origen', 'U32'), ('metrica', 'U8'), ('desde_ns', 'f8'),
+                                      ('hasta_ns', 'f8'), ('cuenta', 'i8')])
+        return np.concatenate(partes)
+
+    def exportar_csv(self, prefijo):
+        """
+        Escribe `<prefijo>_linea.csv` y `<prefijo>_histogramas.csv`
+
+        Returns:
+            tuple: rutas de los dos archivos
+        """
+        rutas = (f"{prefijo}_linea.csv", f"{prefijo}_histogramas.csv")
+        for ruta, tabla in zip(rutas, (self.linea.a_numpy(), self.histogramas_numpy())):
+            with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+                escritor = csv.writer(archivo)
+                escritor.writerow(tabla.dtype.names)
+                escritor.writerows(tabla.tolist())
+        return rutas
+
+    def exportar_npz(self, ruta):
+        """Guarda línea de tiempo e histogramas en un .npz"""
+        np.savez(ruta, linea=self.linea.a_numpy(), histogramas=self.histogramas_numpy())
+
+    def mostrar(self, ancho=60):
+        """Resumen: uso del bus en el tiempo (sparkline) y percentiles por dispositivo"""
+        filas = self.linea.a_numpy()
+        print(f"\n📈 Línea de tiempo ({len(filas)} ventanas de {self.linea.ventana_ns / 1000:,.1f} μs)")
+        if len(filas):
+            bloques = " ▁▂▃▄▅▆▇█"
+            paso = max(1, math.ceil(len(filas) / ancho))
+            uso = [filas['utilizacion'][k:k + paso].mean() for k in range(0, len(filas), paso)]
+            cola = [filas['cola_max'][k:k + paso].max() for k in range(0, len(filas), paso)]
+            tope = max(max(cola), 1)
+            print("   Uso  │" + "".join(bloques[min(8, round(u * 8))] for u in uso) + "│")
+            print("   Cola │" + "".join(bloques[min(8, round(c / tope * 8))] for c in cola)
+                  + f"│ máx {tope}")
+
+        print(f"\n   {'Origen':<10} {'N':>9} {'Media':>9} {'p50':>9} {'p99':>9} {'p99.9':>9} {'Máx':>9}")
+        for origen, histograma in self.latencias.items():
+            p = histograma.percentiles((50, 99, 99.9))
+            print(f"   {origen:<10} {histograma.total:>9,} {histograma.media():>9.1f} "
+                  f"{p[50]:>9.1f} {p[99]:>9.1f} {p[99.9]:>9.1f} {histograma.maximo:>9.1f}")
+        print("   (latencias en ns, llegada → fin)")
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    from eventos_bus import SimuladorEventosBus, llegadas_poisson
+    from simulador_bus import Bus
+
+    # ========================================
+    # EXPERIMENTO: Tráfico a ráfagas (el promedio lo esconde)
+    # ========================================
+    print("=" * 70)
+    print("📈 LÍNEA DE TIEMPO E HISTOGRAMAS: una GPU que manda a ráfagas")
+    print("=" * 70)
+
+    # 1 ms en ventanas de 1 μs no entra en 256 filas: se compacta a ventanas de 4 μs
+    metricas = MetricasBus(ventana_ns=1_000, max_ventanas=256)
+    sim = SimuladorEventosBus(Bus(ancho_bits=64, frecuencia_mhz=5000, metricas=metricas))
+    # CPU constante al 30%; la GPU satura el bus 20 μs de cada 100 μs
+    sim.agregar_fuente(llegadas_poisson('CPU', 11 * 0.2 / 0.3, 136_000, 64, 8, semilla=1))
+    for k in range(10):
+        sim.agregar_fuente(llegadas_poisson('GPU', 131 * 0.2 / 0.9, 600, 1024, 5,
+                                            direccion=1 << 32, inicio_ns=k * 100_000, semilla=10 + k))
+    sim.ejecutar()
+
+    media = sim.utilizacion()
+    filas = metricas.linea.a_numpy()
+    print(f"\n   Uso promedio: {media * 100:.1f}%  |  ventana más cargada: "
+          f"{filas['utilizacion'].max() * 100:.1f}%  |  cola máx: {filas['cola_max'].max()}")
+    metricas.mostrar()
+
+    print(f"\n   Ventanas guardadas: {len(filas)} (máximo {metricas.linea.max_ventanas}); "
+          f"cubetas del histograma de la CPU: {len(metricas.latencias['CPU'].cuentas)}")
+
+    carpeta = tempfile.mkdtemp()
+    rutas = metricas.exportar_csv(os.path.join(carpeta, "bus"))
+    metricas.exportar_npz(os.path.join(carpeta, "bus.npz"))
+    for ruta in rutas:
+        print(f"   💾 {ruta} ({os.path.getsize(ruta):,} bytes)")
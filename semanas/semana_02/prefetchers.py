@@ -0,0 +1,222 @@
+"""
+Prefetchers de hardware para MemoryHierarchy
+Next-line, stride (por PC o por región) y stream buffer
+"""
+
+from collections import OrderedDict
+
+
+class Prefetcher:
+    """
+    Interfaz base de un prefetcher conectado a un nivel de cache
+
+    La jerarquía llama a observar() con cada acceso de demanda que llega a
+    ese nivel y emite las líneas devueltas (si hay hueco: como máximo
+    `max_en_vuelo` prefetches sin completar a la vez).
+
+    Contadores (los actualiza la jerarquía):
+    - emitidos:    prefetches enviados
+    - utiles:      líneas prefetcheadas que la demanda usó antes de expulsarlas
+    - tardios:     útiles que aún no habían llegado (la demanda esperó)
+    - inutiles:    expulsadas sin usar
+    - descartados: no emitidos por el límite de prefetches en vuelo
+    - fallos:      misses de demanda que quedaron sin cubrir
+    """
+    nombre = "BASE"
+
+    def __init__(self, max_en_vuelo=16):
+        self.max_en_vuelo = max_en_vuelo
+        self.line_size = 64  # Lo fija la jerarquía al conectarlo
+        self.en_vuelo = []   # Heap con el instante (ns) de llegada de cada prefetch
+        self.emitidos = 0
+        self.utiles = 0
+        self.tardios = 0
+        self.inutiles = 0
+        self.descartados = 0
+        self.fallos = 0
+
+    def observar(self, line_addr, pc, fallo):
+        """
+        Args:
+            line_addr: línea accedida
+            pc: dirección de la instrucción (None si la traza no la tiene)
+            fallo: miss de demanda, o primer uso de una línea traída por este
+                   prefetcher (así un recorrido ya cubierto sigue disparando)
+
+        Returns:
+            iterable de líneas a prefetchear
+        """
+        return ()
+
+    def precision(self):
+        """Qué fracción de lo prefetcheado se usó"""
+        return self.utiles / self.emitidos if self.emitidos else 0.0
+
+    def cobertura(self):
+        """Qué fracción de los misses originales se eliminó"""
+        total = self.utiles + self.fallos
+        return self.utiles / total if total else 0.0
+
+    def puntualidad(self):
+        """Qué fracción de los prefetches útiles llegó a tiempo"""
+        return (self.utiles - self.tardios) / self.utiles if self.utiles else 0.0
+
+    def resumen(self):
+        return {
+            'emitidos': self.emitidos,
+            'utiles': self.utiles,
+            'tardios': self.tardios,
+            'inutiles': self.inutiles,
+            'descartados': self.descartados,
+            'precision': self.precision(),
+            'cobertura': self.cobertura(),
+            'puntualidad': self.puntualidad(),
+        }
+
+
+class PrefetchSiguienteLinea(Prefetcher):
+    """En cada miss (o primer uso de una línea prefetcheada) pide las `grado` líneas siguientes"""
+    nombre = "NEXT-LINE"
+
+    def __init__(self, grado=1, max_en_vuelo=16):
+        super().__init__(max_en_vuelo)
+        self.grado = grado
+
+    def observar(self, line_addr, pc, fallo):
+        if not fallo:
+            return ()
+        return [line_addr + k * self.line_size for k in range(1, self.grado + 1)]
+
+
+class PrefetchStride(Prefetcher):
+    """
+    Detector de stride: tabla indexada por PC (o por región si no hay PC)
+
+    Cada entrada guarda (última línea, stride, confianza). Con el mismo
+    stride visto dos veces seguidas, pide las `grado` líneas siguientes
+    del patrón. Los accesos repetidos a la misma línea se ignoran.
+    """
+    nombre = "STRIDE"
+
+    def __init__(self, grado=4, entradas=256, region=4096, max_en_vuelo=16):
+        super().__init__(max_en_vuelo)
+        self.grado = grado
+        self.entradas = entradas
+        self.region = region
+        self.tabla = OrderedDict()  # clave → [última línea, stride, confianza]
+
+    def observar(self, line_addr, pc, fallo):
+        clave = pc if pc is not None else line_addr // self.region
+        entrada = self.tabla.get(clave)
+        if entrada is None:
+            if len(self.tabla) >= self.entradas:
+                self.tabla.popitem(last=False)
+            self.tabla[clave] = [line_addr, 0, 0]
+            return ()
+        self.tabla.move_to_end(clave)
+
+        stride = line_addr - entrada[0]
+        if stride == 0:
+            return ()
+        if stride == entrada[1]:
+            entrada[2] = min(entrada[2] + 1, 3)
+        else:
+            entrada[1] = stride
+            entrada[2] = 0
+        entrada[0] = line_addr
+        if entrada[2] < 1:
+            return ()
+        return [line_addr + k * stride for k in range(1, self.grado + 1)]
+
+
+class PrefetchStream(Prefetcher):
+    """
+    Stream buffers: cada miss fuera de un flujo conocido abre un flujo
+    ascendente y pide `profundidad` líneas; cada acceso dentro de la
+    ventana de un flujo lo avanza y rellena hasta la misma profundidad.
+
+    Simplificación: las líneas van directo a la cache del nivel (no a
+    buffers aparte).
+    """
+    nombre = "STREAM"
+
+    def __init__(self, flujos=4, profundidad=4, max_en_vuelo=16):
+        super().__init__(max_en_vuelo)
+        self.flujos = flujos
+        self.profundidad = profundidad
+        self.activos = OrderedDict()  # id → [siguiente esperada, última pedida]
+        self._siguiente_id = 0
+
+    def observar(self, line_addr, pc, fallo):
+        ls = self.line_size
+        for ident, (esperada, frente) in self.activos.items():
+            if esperada <= line_addr <= frente:
+                objetivo = line_addr + self.profundidad * ls
+                self.activos[ident] = [line_addr + ls, max(frente, objetivo)]
+                self.activos.move_to_end(ident)
+                return range(frente + ls, objetivo + ls, ls)
+        if not fallo:
+            return ()
+
+        if len(self.activos) >= self.flujos:
+            self.activos.popitem(last=False)
+        objetivo = line_addr + self.profundidad * ls
+        self.activos[self._siguiente_id] = [line_addr + ls, objetivo]
+        self._siguiente_id += 1
+        return range(line_addr + ls, objetivo + ls, ls)
+
+
+PREFETCHERS = {
+    'NEXT-LINE': PrefetchSiguienteLinea,
+    'STRIDE': PrefetchStride,
+    'STREAM': PrefetchStream,
+}
+
+
+if __name__ == "__main__":
+    import numpy as np
+
+    from simulador_jerarquia_memoria import MemoryHierarchy
+
+    # ========================================
+    # EXPERIMENTO: Recorrer una columna de un tensor (stride fijo)
+    # ========================================
+    print("=" * 70)
+    print("🔮 PREFETCH: columna de un tensor float32 de 8 MB (stride 256 B)")
+    print("=" * 70)
+
+    tamaño = 8 * 1024 * 1024  # Caches frías, datos en RAM: cada línea viene de RAM
+    stride = 256
+    n = tamaño // stride
+    direcciones = [i * stride for i in range(n)]
+    PC = 0x400  # Una sola instrucción de load en el bucle
+    computo_ns = 20  # Trabajo entre loads
+
+    configuraciones = [
+        ("Sin prefetch", None),
+        ("Next-line x1", lambda: PrefetchSiguienteLinea(grado=1)),
+        ("Stride x2", lambda: PrefetchStride(grado=2)),
+        ("Stride x8", lambda: PrefetchStride(grado=8)),
+        ("Stream x8", lambda: PrefetchStream(profundidad=8)),
+    ]
+
+    print(f"\n{'Prefetcher':<14} {'Lat. media':>10} {'Precisión':>10} {'Cobertura':>10} "
+          f"{'A tiempo':>9} {'Descart.':>9}")
+    print("-" * 70)
+    for nombre, fabrica in configuraciones:
+        mem = MemoryHierarchy(asociatividad=8)
+        mem.precargar_ram(np.arange(0, tamaño, 64))  # El tensor ya está en RAM
+        pf = None
+        if fabrica:
+            pf = mem.agregar_prefetcher(fabrica(), 'L1')
+
+        for addr in direcciones:
+            mem.leer_memoria(addr, pc=PC)
+            mem.avanzar(computo_ns)
+        latencia_media = mem.stats['total_latency'] / n
+        if pf is None:
+            print(f"{nombre:<14} {latencia_media:>7.1f} ns")
+        else:
+            print(f"{nombre:<14} {latencia_media:>7.1f} ns {pf.precision() * 100:>9.1f}% "
+                  f"{pf.cobertura() * 100:>9.1f}% {pf.puntualidad() * 100:>8.1f}% "
+                  f"{pf.descartados:>9,}")
@@ -6,6 +6,9 @@ Demuestra el cuello de botella y las ventajas de cada arquitectura
 from dataclasses import dataclass
 from typing import List, Literal
 import random
+import time
+
+import numpy as np
 
 @dataclass
 class Instruccion:
@@ -20,6 +23,26 @@ class Instruccion:
         return f"{self.opcode} {ops}{mem}"
 
 
+def mascara_memoria(programa):
+    """
+    Convierte un programa a un array booleano: True = la instrucción accede a datos
+
+    Es lo único que necesitan los contadores de Von Neumann y Harvard, así que
+    se arma UNA vez y se reusa. Un array (o lista de bools) se acepta tal cual.
+
+    Args:
+        programa: lista de Instruccion, o array/lista de bools ya convertido
+
+    Returns:
+        np.ndarray de bool, una entrada por instrucción
+    """
+    if isinstance(programa, np.ndarray):
+        return programa.astype(bool, copy=False)
+    if programa and isinstance(programa[0], Instruccion):
+        return np.fromiter((i.accede_memoria for i in programa), dtype=bool, count=len(programa))
+    return np.asarray(programa, dtype=bool)
+
+
 class ArquitecturaVonNeumann:
     """Simula arquitectura Von Neumann clásica"""
     
@@ -69,6 +92,26 @@ class ArquitecturaVonNeumann:
         
         self.mostrar_estadisticas()
     
+    def ejecutar_rapido(self, programa):
+        """
+        Mismos contadores que ejecutar_programa, sin imprimir ni recorrer instrucciones
+
+        Cada instrucción cuesta 3 ciclos (fetch, decode, execute) y las que
+        acceden a datos usan el bus una vez más: todo sale de contar los True.
+
+        Args:
+            programa: lista de Instruccion o máscara de mascara_memoria()
+        """
+        mascara = mascara_memoria(programa)
+        n = len(mascara)
+        con_datos = int(np.count_nonzero(mascara))
+        
+        self.ciclos += 3 * n
+        self.ciclos_fetch += n
+        self.ciclos_mem_data += con_datos
+        self.conflictos_bus += con_datos
+        self.instrucciones_ejecutadas += n
+    
     def mostrar_estadisticas(self):
         """Muestra estadísticas de ejecución"""
         print(f"\n{'─'*70}")
@@ -131,6 +174,24 @@ class ArquitecturaHarvard:
         
         self.mostrar_estadisticas()
     
+    def ejecutar_rapido(self, programa):
+        """
+        Mismos contadores que ejecutar_programa, sin imprimir ni recorrer instrucciones
+
+        Las que acceden a datos lo hacen en paralelo con el fetch (2 ciclos);
+        el resto cuesta 3.
+
+        Args:
+            programa: lista de Instruccion o máscara de mascara_memoria()
+        """
+        mascara = mascara_memoria(programa)
+        n = len(mascara)
+        con_datos = int(np.count_nonzero(mascara))
+        
+        self.ciclos += 3 * n - con_datos
+        self.accesos_paralelos += con_datos
+        self.instrucciones_ejecutadas += n
+    
     def mostrar_estadisticas(self):
         """Muestra estadísticas"""
         print(f"\n{'─'*70}")
@@ -282,86 +343,135 @@ def generar_programa(n=1000, prob_mem=0.5):
     return programa
 
 
-# ========================================
-# BENCHMARK COMPARATIVO
-# ========================================
+def generar_mascara(n=1000, prob_mem=0.5, semilla=None, bloque=1 << 24):
+    """
+    Como generar_programa pero directo a la máscara de accesos (para millones de instrucciones)
 
-print("="*70)
-print("🏁 BENCHMARK: COMPARACIÓN DE ARQUITECTURAS")
-print("="*70)
-print(f"\nPrograma de prueba: 1000 instrucciones")
-print(f"50% acceden memoria de datos\n")
+    Misma distribución: 2 de los 8 opcodes son LOAD/STORE y el resto accede
+    a memoria con probabilidad prob_mem. Se genera por bloques para no
+    crear arrays de floats del tamaño del programa.
+    """
+    rng = np.random.default_rng(semilla)
+    mascara = np.empty(n, dtype=bool)
+    for inicio in range(0, n, bloque):
+        fin = min(n, inicio + bloque)
+        load_store = rng.integers(0, 8, fin - inicio, dtype=np.uint8) >= 6
+        mascara[inicio:fin] = load_store | (rng.random(fin - inicio, dtype=np.float32) < prob_mem)
+    return mascara
 
-# Genera mismo programa para todas las arquitecturas
-random.seed(42)  # Reproducibilidad
-programa = generar_programa(n=1000, prob_mem=0.5)
 
-input("Presiona ENTER para ejecutar Von Neumann...")
-von = ArquitecturaVonNeumann()
-von.ejecutar_programa(programa)
+if __name__ == "__main__":
+    # ========================================
+    # BENCHMARK COMPARATIVO
+    # ========================================
 
-input("\nPresiona ENTER para ejecutar Harvard...")
-harvard = ArquitecturaHarvard()
-harvard.ejecutar_programa(programa)
+    print("="*70)
+    print("🏁 BENCHMARK: COMPARACIÓN DE ARQUITECTURAS")
+    print("="*70)
+    print(f"\nPrograma de prueba: 1000 instrucciones")
+    print(f"50% acceden memoria de datos\n")
 
-input("\nPresiona ENTER para ejecutar Harvard Modificada...")
-harvard_mod = ArquitecturaHarvardModificada()
-harvard_mod.ejecutar_programa(programa)
+    # Genera mismo programa para todas las arquitecturas
+    random.seed(42)  # Reproducibilidad
+    programa = generar_programa(n=1000, prob_mem=0.5)
 
+    input("Presiona ENTER para ejecutar Von Neumann...")
+    von = ArquitecturaVonNeumann()
+    von.ejecutar_programa(programa)
+
+    input("\nPresiona ENTER para ejecutar Harvard...")
+    harvard = ArquitecturaHarvard()
+    harvard.ejecutar_programa(programa)
+
+    input("\nPresiona ENTER para ejecutar Harvard Modificada...")
+    harvard_mod = ArquitecturaHarvardModificada()
+    harvard_mod.ejecutar_programa(programa)
+
+
+    # ========================================
+    # COMPARACIÓN FINAL
+    # ========================================
+
+    print("\n\n" + "="*70)
+    print("📊 COMPARACIÓN FINAL")
+    print("="*70)
+
+    print(f"\n{'Arquitectura':<25} {'Ciclos':<12} {'CPI':<8} {'Speedup'}")
+    print("─"*70)
+
+    von_cpi = von.ciclos / von.instrucciones_ejecutadas
+    harv_cpi = harvard.ciclos / harvard.instrucciones_ejecutadas
+    mod_cpi = harvard_mod.ciclos / harvard_mod.instrucciones_ejecutadas
+
+    print(f"{'Von Neumann':<25} {von.ciclos:<12} {von_cpi:<8.2f} 1.00×")
+    print(f"{'Harvard':<25} {harvard.ciclos:<12} {harv_cpi:<8.2f} {von.ciclos/harvard.ciclos:.2f}×")
+    print(f"{'Harvard Modificada':<25} {harvard_mod.ciclos:<12} {mod_cpi:<8.2f} {von.ciclos/harvard_mod.ciclos:.2f}×")
+    print(f"\n💡 INTERPRETACIÓN:")
+    speedup_harv = von.ciclos / harvard.ciclos
+    speedup_mod = von.ciclos / harvard_mod.ciclos
+    print(f"   • Harvard es {speedup_harv:.1f}× más rápida que Von Neumann")
+    print(f"   • Harvard Modificada es {speedup_mod:.1f}× más rápida")
+    print(f"   • Cache hits permiten paralelismo sin complejidad de Harvard pura")
+
+
+    # ========================================
+    # MODO RÁPIDO: mismos contadores, vectorizado
+    # ========================================
+
+    print("\n\n" + "="*70)
+    print("⚡ MODO RÁPIDO (NumPy)")
+    print("="*70)
+
+    mascara = mascara_memoria(programa)
+    von_rapido = ArquitecturaVonNeumann()
+    von_rapido.ejecutar_rapido(mascara)
+    harvard_rapido = ArquitecturaHarvard()
+    harvard_rapido.ejecutar_rapido(mascara)
+    for nombre in ('ciclos', 'ciclos_fetch', 'ciclos_mem_data', 'conflictos_bus', 'instrucciones_ejecutadas'):
+        assert getattr(von_rapido, nombre) == getattr(von, nombre), nombre
+    for nombre in ('ciclos', 'accesos_paralelos', 'instrucciones_ejecutadas'):
+        assert getattr(harvard_rapido, nombre) == getattr(harvard, nombre), nombre
+    print("\n✅ Mismos contadores que el bucle instrucción por instrucción")
+
+    n = 100_000_000
+    mascara = generar_mascara(n, prob_mem=0.5, semilla=42)
+    t0 = time.perf_counter()
+    von_rapido = ArquitecturaVonNeumann()
+    von_rapido.ejecutar_rapido(mascara)
+    harvard_rapido = ArquitecturaHarvard()
+    harvard_rapido.ejecutar_rapido(mascara)
+    segundos = time.perf_counter() - t0
+    print(f"\n{n:,} instrucciones en {segundos * 1000:.1f} ms (las dos arquitecturas)")
+    print(f"   Von Neumann: CPI {von_rapido.ciclos / n:.3f} | Harvard: CPI {harvard_rapido.ciclos / n:.3f} "
+          f"| speedup {von_rapido.ciclos / harvard_rapido.ciclos:.2f}×")
 
-# ========================================
-# COMPARACIÓN FINAL
-# ========================================
 
-print("\n\n" + "="*70)
-print("📊 COMPARACIÓN FINAL")
-print("="*70)
-
-print(f"\n{'Arquitectura':<25} {'Ciclos':<12} {'CPI':<8} {'Speedup'}")
-print("─"*70)
-
-von_cpi = von.ciclos / von.instrucciones_ejecutadas
-harv_cpi = harvard.ciclos / harvard.instrucciones_ejecutadas
-mod_cpi = harvard_mod.ciclos / harvard_mod.instrucciones_ejecutadas
-
-print(f"{'Von Neumann':<25} {von.ciclos:<12} {von_cpi:<8.2f} 1.00×")
-print(f"{'Harvard':<25} {harvard.ciclos:<12} {harv_cpi:<8.2f} {von.ciclos/harvard.ciclos:.2f}×")
-print(f"{'Harvard Modificada':<25} {harvard_mod.ciclos:Continuar11:37 p.m.<12} {mod_cpi:<8.2f} {von.ciclos/harvard_mod.ciclos:.2f}×")
-print(f"\n💡 INTERPRETACIÓN:")
-speedup_harv = von.ciclos / harvard.ciclos
-speedup_mod = von.ciclos / harvard_mod.ciclos
-print(f"   • Harvard es {speedup_harv:.1f}× más rápida que Von Neumann")
-print(f"   • Harvard Modificada es {speedup_mod:.1f}× más rápida")
-print(f"   • Cache hits permiten paralelismo sin complejidad de Harvard pura")
-
----
-
-## 🎯 **APLICACIONES MODERNAS**
-
-### **¿Dónde se usa cada arquitectura HOY?**
-
-| Tipo | Dispositivo | Arquitectura | Razón |
-|------|-------------|--------------|-------|
-| **CPU Desktop/Laptop** | Intel, AMD, Apple M | Harvard Modificada | Balance rendimiento/flexibilidad |
-| **Smartphone** | ARM (Snapdragon, Bionic) | Harvard Modificada | Eficiencia energética + velocidad |
-| **Microcontrolador** | Arduino, PIC | Harvard Pura | Bajo costo, determinismo |
-| **DSP** | Audio, señales | Harvard Pura | Procesamiento tiempo real |
-| **GPU** | NVIDIA, AMD | SIMT (Similar Harvard) | Paralelismo masivo |
-| **TPU** | Google Tensor | Arquitectura custom | Optimizado para IA |
-
-### **Tu Intel Ultra 9 en Detalle:**
-Arquitectura: Harvard Modificada Multi-nivel
-Nivel 1 (por núcleo):
-├─ I-Cache: 32 KB (8-way)
-├─ D-Cache: 32 KB (8-way)
-└─ TLB separados (I-TLB, D-TLB)
-→ Harvard PURO aquí
-Nivel 2 (por núcleo):
-└─ Cache unificado: 512 KB - 1 MB
-→ Von Neumann (flexible)
-Nivel 3 (compartido):
-└─ Cache unificado: 16-24 MB
-→ Von Neumann
-Memoria Principal:
-└─ RAM: 32 GB DDR5
-→ Von Neumann (código y datos juntos)
\ No newline at end of file
+# ## 🎯 **APLICACIONES MODERNAS**
+#
+# ### **¿Dónde se usa cada arquitectura HOY?**
+#
+# | Tipo | Dispositivo | Arquitectura | Razón |
+# |------|-------------|--------------|-------|
+# | **CPU Desktop/Laptop** | Intel, AMD, Apple M | Harvard Modificada | Balance rendimiento/flexibilidad |
+# | **Smartphone** | ARM (Snapdragon, Bionic) | Harvard Modificada | Eficiencia energética + velocidad |
+# | **Microcontrolador** | Arduino, PIC | Harvard Pura | Bajo costo, determinismo |
+# | **DSP** | Audio, señales | Harvard Pura | Procesamiento tiempo real |
+# | **GPU** | NVIDIA, AMD | SIMT (Similar Harvard) | Paralelismo masivo |
+# | **TPU** | Google Tensor | Arquitectura custom | Optimizado para IA |
+#
+# ### **Tu Intel Ultra 9 en Detalle:**
+# Arquitectura: Harvard Modificada Multi-nivel
+# Nivel 1 (por núcleo):
+# ├─ I-Cache: 32 KB (8-way)
+# ├─ D-Cache: 32 KB (8-way)
+# └─ TLB separados (I-TLB, D-TLB)
+# → Harvard PURO aquí
+# Nivel 2 (por núcleo):
+# └─ Cache unificado: 512 KB - 1 MB
+# → Von Neumann (flexible)
+# Nivel 3 (compartido):
+# └─ Cache unificado: 16-24 MB
+# → Von Neumann
+# Memoria Principal:
+# └─ RAM: 32 GB DDR5
+# → Von Neumann (código y datos juntos)
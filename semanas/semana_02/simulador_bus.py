@@ -3,30 +3,249 @@ Simulador de Bus de Datos
 Demuestra arbitración, contención y cuellos de botella
 """
 
+import heapq
+import itertools
 import random
 import time
 from collections import deque
 from dataclasses import dataclass
-from typing import Literal
+from typing import Literal, Optional
 
-@dataclass
+@dataclass(slots=True)
 class Transaccion:
-    """Representa una transacción en el bus"""
+    """
+    Representa una transacción en el bus
+    
+    `datos` acepta cualquier objeto con buffer protocol (bytes, bytearray,
+    memoryview, array de NumPy, mmap) y se guarda solo una vista de bytes:
+    nunca se copia el payload. Sin `tamaño`, se deduce de los datos; una
+    lectura puede ir con datos vacíos y solo el tamaño pedido.
+    """
     origen: str
     destino: str
     direccion: int
     tipo: Literal['READ', 'WRITE']
-    datos: bytes
-    tamaño: int
-    prioridad: int
-    timestamp: float
+    datos: memoryview
+    tamaño: Optional[int] = None
+    prioridad: int = 5
+    timestamp: float = 0.0
+    
+    def __post_init__(self):
+        vista = self.datos if isinstance(self.datos, memoryview) else memoryview(self.datos)
+        if vista.ndim != 1 or vista.format != 'B':
+            vista = vista.cast('B')  # Vista plana de bytes (exige buffer contiguo)
+        if self.tamaño is None:
+            self.tamaño = vista.nbytes
+        elif vista.nbytes > self.tamaño:
+            vista = vista[:self.tamaño]
+        elif 0 < vista.nbytes < self.tamaño:
+            raise ValueError(f"Datos de {vista.nbytes} B para una transacción de {self.tamaño} B")
+        self.datos = vista
+
+
+def transacciones_de(buffer, origen, destino, direccion=0, trozo=4096, tipo='WRITE',
+                     prioridad=5, inicio_ns=0.0, intervalo_ns=0.0):
+    """
+    Parte un buffer en transacciones de `trozo` bytes, cada una una vista del buffer
+    
+    Es un generador: para mover un buffer de varios GB solo existen las
+    transacciones en vuelo, y ninguna copia el payload.
+    """
+    vista = memoryview(buffer)
+    if vista.ndim != 1 or vista.format != 'B':
+        vista = vista.cast('B')
+    for i, desplazamiento in enumerate(range(0, vista.nbytes, trozo)):
+        yield Transaccion(origen, destino, direccion + desplazamiento, tipo,
+                          vista[desplazamiento:desplazamiento + trozo], None, prioridad,
+                          inicio_ns + i * intervalo_ns)
+
+# ========================================
+# POLÍTICAS DE ARBITRAJE
+# ========================================
+# Cada política es dueña de la cola de espera y la organiza a su manera
+# (heap o colas por dispositivo): agregar y elegir cuestan O(log n) o O(1).
+
+class PoliticaArbitraje:
+    """Interfaz base: prioridad estricta (mayor primero), FIFO entre iguales"""
+    nombre = "PRIORIDAD"
+
+    def __init__(self):
+        self._heap = []
+        self._secuencia = itertools.count()  # Desempate estable: orden de llegada
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self):
+        """Transacciones pendientes (sin orden garantizado)"""
+        return (entrada[-1] for entrada in self._heap)
+
+    def clave(self, trans):
+        """Clave del heap: la menor se concede primero"""
+        return -trans.prioridad
+
+    def agregar(self, trans):
+        heapq.heappush(self._heap, (self.clave(trans), next(self._secuencia), trans))
+
+    def elegir(self):
+        """Saca la transacción que gana el bus"""
+        return heapq.heappop(self._heap)[-1]
+
+
+class ArbitrajePrioridad(PoliticaArbitraje):
+    """Prioridad estricta: puede dejar sin bus (inanición) a los de baja prioridad"""
+
+
+class ArbitrajeRoundRobin(PoliticaArbitraje):
+    """
+    Turno rotativo entre dispositivos con trabajo pendiente (ignora prioridad)
+
+    Una cola FIFO por dispositivo más una cola de turnos: todo O(1).
+    """
+    nombre = "ROUND-ROBIN"
+
+    def __init__(self):
+        self._colas = {}       # origen → deque de transacciones
+        self._turnos = deque()  # Orígenes con pendientes, en orden de turno
+        self._pendientes = 0
+
+    def __len__(self):
+        return self._pendientes
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self._colas.values())
+
+    def agregar(self, trans):
+        cola = self._colas.get(trans.origen)
+        if cola is None:
+            cola = self._colas[trans.origen] = deque()
+            self._turnos.append(trans.origen)
+        cola.append(trans)
+        self._pendientes += 1
+
+    def elegir(self):
+        origen = self._turnos.popleft()
+        cola = self._colas[origen]
+        trans = cola.popleft()
+        if cola:
+            self._turnos.append(origen)  # Al final de la ronda
+        else:
+            del self._colas[origen]
+        self._pendientes -= 1
+        return trans
+
+
+class ArbitrajeWFQ(PoliticaArbitraje):
+    """
+    Weighted Fair Queuing (variante self-clocked)
+
+    Cada transacción recibe una etiqueta de fin virtual:
+        F = max(V, F_anterior_del_dispositivo) + tamaño / peso
+    y se concede la de menor F. V es la etiqueta de la última concedida.
+    A largo plazo cada dispositivo recibe ancho de banda proporcional a su peso.
+
+    Args:
+        pesos: dict origen → peso (por defecto, la prioridad de la transacción)
+    """
+    nombre = "WFQ"
+
+    def __init__(self, pesos=None):
+        super().__init__()
+        self.pesos = pesos or {}
+        self._virtual = 0.0
+        self._ultimo_fin = {}
+
+    def clave(self, trans):
+        peso = self.pesos.get(trans.origen, max(trans.prioridad, 1))
+        inicio = max(self._virtual, self._ultimo_fin.get(trans.origen, 0.0))
+        fin = inicio + trans.tamaño / peso
+        self._ultimo_fin[trans.origen] = fin
+        return fin
+
+    def elegir(self):
+        fin, _, trans = heapq.heappop(self._heap)
+        self._virtual = fin
+        return trans
+
+
+class ArbitrajeEnvejecimiento(PoliticaArbitraje):
+    """
+    Prioridad con envejecimiento: cada `ns_por_punto` de espera suma 1 punto
+
+    Prioridad efectiva = prioridad + (ahora - llegada) / ns_por_punto. El
+    término `ahora` es igual para todas, así que el orden solo depende de
+    prioridad - llegada / ns_por_punto: una clave fija y el heap sigue siendo
+    O(log n). La llegada es el `timestamp` de la transacción (ns simulados).
+    """
+    nombre = "ENVEJECIMIENTO"
+
+    def __init__(self, ns_por_punto=100.0):
+        super().__init__()
+        self.ns_por_punto = ns_por_punto
+
+    def clave(self, trans):
+        return -(trans.prioridad - trans.timestamp / self.ns_por_punto)
+
+
+ARBITRAJES = {
+    'PRIORIDAD': ArbitrajePrioridad,
+    'ROUND-ROBIN': ArbitrajeRoundRobin,
+    'WFQ': ArbitrajeWFQ,
+    'ENVEJECIMIENTO': ArbitrajeEnvejecimiento,
+}
+
+
+def crear_arbitraje(arbitraje):
+    """Acepta un nombre ('PRIORIDAD', 'WFQ', ...) o una instancia ya creada"""
+    if isinstance(arbitraje, PoliticaArbitraje):
+        return arbitraje
+    clase = ARBITRAJES.get(arbitraje.upper())
+    if clase is None:
+        raise ValueError(f"Arbitraje desconocido: {arbitraje} (opciones: {', '.join(ARBITRAJES)})")
+    return clase()
+
+
+# ========================================
+# MODOS DE TRANSFERENCIA
+# ========================================
+# - simple:   dirección + control + (espera a la memoria) + datos + READY,
+#             con el bus tomado todo el tiempo
+# - rafaga:   transacciones contiguas del mismo dispositivo que esperan en la
+#             cola se fusionan en una ráfaga: un solo overhead para todas
+# - pipeline: la fase de dirección de la siguiente se solapa con la espera y
+#             los datos de la anterior (hasta `profundidad` en vuelo, en orden)
+# - split:    el bus se suelta mientras la memoria responde; la respuesta
+#             vuelve a pedir el bus como una transacción más
+MODOS_BUS = ('simple', 'rafaga', 'pipeline', 'split')
+CICLOS_DIRECCION = 2  # Address Bus + Control Bus
+CICLOS_READY = 1
+
 
 class Bus:
     """Simula un bus de datos con arbitración"""
     
-    def __init__(self, ancho_bits=64, frecuencia_mhz=5000):
+    def __init__(self, ancho_bits=64, frecuencia_mhz=5000, arbitraje='PRIORIDAD',
+                 modo='simple', latencia_memoria_ciclos=0, max_rafaga=256, profundidad=2,
+                 metricas=None):
+        """
+        Args:
+            arbitraje: nombre de ARBITRAJES o instancia de PoliticaArbitraje
+            modo: uno de MODOS_BUS
+            latencia_memoria_ciclos: ciclos que tarda la memoria en responder
+            max_rafaga: bytes máximos de una ráfaga (modo 'rafaga')
+            profundidad: transacciones en vuelo a la vez (modo 'pipeline')
+            metricas: MetricasBus (de metricas_bus) que alimentan los
+                      simuladores de eventos; None = solo los totales de stats
+        """
+        if modo not in MODOS_BUS:
+            raise ValueError(f"Modo desconocido: {modo} (opciones: {', '.join(MODOS_BUS)})")
         self.ancho_bits = ancho_bits
         self.frecuencia_mhz = frecuencia_mhz
+        self.modo = modo
+        self.latencia_memoria_ciclos = latencia_memoria_ciclos
+        self.max_rafaga = max_rafaga
+        self.profundidad = profundidad
+        self.metricas = metricas
         
         # Ancho de banda teórico
         self.bytes_por_ciclo = ancho_bits // 8
@@ -36,7 +255,10 @@ class Bus:
         # Estado del bus
         self.ocupado = False
         self.transaccion_actual = None
-        self.cola_espera = deque()
+        self.arbitraje = crear_arbitraje(arbitraje)
+        # Modo ráfaga: id(cabeza) → [miembros, siguiente dirección, bytes]
+        self._rafagas = {}
+        self._abiertas = {}  # origen → cabeza de su ráfaga aún en la cola
         
         # Líneas del bus (simuladas)
         self.address_bus = 0
@@ -57,6 +279,13 @@ class Bus:
             'ciclos_idle': 0,
             'conflictos': 0
         }
+        # Por dispositivo: detecta inanición (esperas largas, veces adelantado)
+        self.stats_dispositivos = {}
+    
+    @property
+    def cola_espera(self):
+        """Transacciones pendientes (la política de arbitraje es la cola)"""
+        return self.arbitraje
     
     def calcular_ciclos_necesarios(self, tamaño_bytes):
         """Calcula ciclos necesarios para transferir N bytes"""
@@ -64,29 +293,89 @@ class Bus:
         # Redondea hacia arriba
         return int(ciclos) + (1 if ciclos % 1 > 0 else 0)
     
-    def agregar_transaccion(self, trans: Transaccion):
-        """Agrega transacción a la cola"""
+    def ciclos_transaccion(self, trans: Transaccion):
+        """Ciclos de bus de una transacción en modo simple: dirección + control + memoria + datos + READY"""
+        return (CICLOS_DIRECCION + self.latencia_memoria_ciclos
+                + self.calcular_ciclos_necesarios(trans.tamaño) + CICLOS_READY)
+    
+    def encolar(self, trans: Transaccion):
+        """Agrega transacción a la cola (sin imprimir)"""
         if self.ocupado:
             self.stats['conflictos'] += 1
+        if self.modo == 'rafaga' and self._unir_a_rafaga(trans):
+            return
+        dispositivo = self.stats_dispositivos.get(trans.origen)
+        if dispositivo is None:
+            dispositivo = self.stats_dispositivos[trans.origen] = {
+                'pendientes': 0, 'concedidas': 0, 'adelantada': 0,
+                'espera_total_ns': 0.0, 'espera_max_ns': 0.0,
+            }
+        dispositivo['pendientes'] += 1
+        self.arbitraje.agregar(trans)
+        if self.modo == 'rafaga':
+            self._abiertas[trans.origen] = trans
+            self._rafagas[id(trans)] = [[trans], trans.direccion + trans.tamaño, trans.tamaño]
+    
+    def _unir_a_rafaga(self, trans):
+        """Suma la transacción a la ráfaga pendiente de su dispositivo si es contigua"""
+        cabeza = self._abiertas.get(trans.origen)
+        if cabeza is None or cabeza.tipo != trans.tipo or cabeza.destino != trans.destino:
+            return False
+        rafaga = self._rafagas[id(cabeza)]
+        miembros, siguiente, total = rafaga
+        if trans.direccion != siguiente or total + trans.tamaño > self.max_rafaga:
+            return False
+        miembros.append(trans)
+        rafaga[1] = siguiente + trans.tamaño
+        rafaga[2] = total + trans.tamaño
+        return True
+    
+    def rafaga_de(self, trans):
+        """
+        Transacciones que viajan con `trans` (la elegida por el árbitro)
         
-        self.cola_espera.append(trans)
+        En modo ráfaga cierra la ráfaga: lo que llegue después abre otra.
+        """
+        rafaga = self._rafagas.pop(id(trans), None)
+        if rafaga is None:
+            return [trans]
+        if self._abiertas.get(trans.origen) is trans:
+            del self._abiertas[trans.origen]
+        return rafaga[0]
+    
+    def agregar_transaccion(self, trans: Transaccion):
+        """Agrega transacción a la cola"""
+        self.encolar(trans)
         print(f"⏸️  {trans.origen}→{trans.destino}: {trans.tipo} "
               f"0x{trans.direccion:04X} ({trans.tamaño}B) "
               f"[Prioridad: {trans.prioridad}]")
     
-    def arbitrar(self):
-        """Selecciona próxima transacción (por prioridad)"""
-        if not self.cola_espera:
+    def arbitrar(self, ahora=None):
+        """
+        Selecciona próxima transacción según la política de arbitraje
+        
+        Args:
+            ahora: instante actual en ns simulados (si se conoce, se mide
+                   la espera de la transacción elegida)
+        """
+        if not self.arbitraje:
             return None
         
-        # Ordena por prioridad (mayor = más importante)
-        self.cola_espera = deque(sorted(
-            self.cola_espera,
-            key=lambda t: t.prioridad,
-            reverse=True
-        ))
+        trans = self.arbitraje.elegir()
+        ganador = self.stats_dispositivos[trans.origen]
+        ganador['pendientes'] -= 1
+        ganador['concedidas'] += 1
+        if ahora is not None:
+            espera = ahora - trans.timestamp
+            ganador['espera_total_ns'] += espera
+            ganador['espera_max_ns'] = max(ganador['espera_max_ns'], espera)
+        
+        # Los dispositivos que seguían esperando pierden esta ronda
+        for dispositivo in self.stats_dispositivos.values():
+            if dispositivo['pendientes'] and dispositivo is not ganador:
+                dispositivo['adelantada'] += 1
         
-        return self.cola_espera.popleft()
+        return trans
     
     def ejecutar_transaccion(self, trans: Transaccion):
         """Simula ejecución de transacción en el bus"""
@@ -96,6 +385,11 @@ class Bus:
         
         self.ocupado = True
         self.transaccion_actual = trans
+        miembros = self.rafaga_de(trans)
+        tamaño = sum(m.tamaño for m in miembros)
+        if len(miembros) > 1:
+            print(f"\n📦 Ráfaga: {len(miembros)} transacciones contiguas ({tamaño} bytes), "
+                  f"un solo overhead")
         
         # Fase 1: Dirección en Address Bus
         print(f"\n1️⃣  Address Bus ← 0x{trans.direccion:08X}")
@@ -111,16 +405,25 @@ class Bus:
         else:
             print(f"2️⃣  Control Bus ← WRITE")
             self.control_signals['WRITE'] = True
-            print(f"    Data Bus ← {trans.datos[:16]}...")
+            print(f"    Data Bus ← {trans.datos[:16].hex(' ')}...")
             self.data_bus = int.from_bytes(trans.datos[:8], 'little')
             ciclos += 1
         
+        # Espera a la memoria (en modo split el bus queda libre mientras tanto)
+        ciclos_memoria = 0
+        if self.latencia_memoria_ciclos:
+            if self.modo == 'split':
+                print(f"⏳ Memoria responde en {self.latencia_memoria_ciclos} ciclos (bus liberado)")
+            else:
+                print(f"⏳ Memoria responde en {self.latencia_memoria_ciclos} ciclos (bus tomado)")
+                ciclos_memoria = self.latencia_memoria_ciclos
+        
         # Fase 3: Transferencia de datos
-        ciclos_datos = self.calcular_ciclos_necesarios(trans.tamaño)
-        print(f"3️⃣  Transferencia de datos: {trans.tamaño} bytes")
+        ciclos_datos = self.calcular_ciclos_necesarios(tamaño)
+        print(f"3️⃣  Transferencia de datos: {tamaño} bytes")
         print(f"    Ancho del bus: {self.ancho_bits} bits ({self.bytes_por_ciclo} bytes/ciclo)")
         print(f"    Ciclos necesarios: {ciclos_datos}")
-        ciclos += ciclos_datos
+        ciclos += ciclos_memoria + ciclos_datos
         
         # Fase 4: READY signal
         print(f"4️⃣  READY ← TRUE (transferencia completa)")
@@ -128,14 +431,14 @@ class Bus:
         ciclos += 1
         
         # Actualizar estadísticas
-        self.stats['transacciones_completadas'] += 1
-        self.stats['bytes_transferidos'] += trans.tamaño
+        self.stats['transacciones_completadas'] += len(miembros)
+        self.stats['bytes_transferidos'] += tamaño
         self.stats['ciclos_totales'] += ciclos
         self.stats['ciclos_ocupado'] += ciclos
         
         # Calcular tiempo real
         tiempo_ns = (ciclos / self.ciclos_por_segundo) * 1_000_000_000
-        bandwidth_real = (trans.tamaño / tiempo_ns) * 1_000_000_000  # B/s
+        bandwidth_real = (tamaño / tiempo_ns) * 1_000_000_000  # B/s
         
         print(f"\n📊 Resumen:")
         print(f"   Ciclos totales: {ciclos}")
@@ -170,6 +473,7 @@ class Bus:
         print(f"   Ancho: {self.ancho_bits} bits")
         print(f"   Frecuencia: {self.frecuencia_mhz} MHz")
         print(f"   Ancho banda teórico: {self.bandwidth_bps / 1e9:.2f} GB/s")
+        print(f"   Modo: {self.modo}")
         
         print(f"\n📈 Uso:")
         print(f"   Transacciones completadas: {self.stats['transacciones_completadas']}")
@@ -199,114 +503,142 @@ class Bus:
             print(f"\n📉 Rendimiento:")
             print(f"   Ancho banda efectivo: {bw_efectivo / 1e9:.2f} GB/s")
             print(f"   Eficiencia: {eficiencia:.1f}%")
+        
+        self.mostrar_inanicion()
+    
+    def mostrar_inanicion(self):
+        """Tabla por dispositivo: concesiones, esperas y veces adelantado"""
+        if not self.stats_dispositivos:
+            return
+        print(f"\n⚖️  Arbitraje {self.arbitraje.nombre} (por dispositivo):")
+        print(f"   {'Origen':<10} {'Concedidas':>10} {'Adelantada':>11} "
+              f"{'Espera media':>13} {'Espera máx':>12}")
+        for origen, d in self.stats_dispositivos.items():
+            media = d['espera_total_ns'] / d['concedidas'] if d['concedidas'] else 0.0
+            print(f"   {origen:<10} {d['concedidas']:>10,} {d['adelantada']:>11,} "
+                  f"{media:>10.1f} ns {d['espera_max_ns']:>9.1f} ns")
 
 
-# ========================================
-# EXPERIMENTO 1: Transferencias simples
-# ========================================
-print("="*70)
-print("EXPERIMENTO 1: TRANSFERENCIAS BÁSICAS")
-print("="*70)
-
-bus1 = Bus(ancho_bits=64, frecuencia_mhz=5000)  # 64-bit, 5 GHz
-
-# CPU lee de RAM
-trans1 = Transaccion(
-    origen="CPU",
-    destino="RAM",
-    direccion=0x1000,
-    tipo='READ',
-    datos=b'\x00' * 64,
-    tamaño=64,  
-    # 1 línea de cache
-    prioridad=5,
-    timestamp=time.time()
+if __name__ == "__main__":
+    # ========================================
+    # EXPERIMENTO 1: Transferencias simples
+    # ========================================
+    print("="*70)
+    print("EXPERIMENTO 1: TRANSFERENCIAS BÁSICAS")
+    print("="*70)
+
+    bus1 = Bus(ancho_bits=64, frecuencia_mhz=5000)  # 64-bit, 5 GHz
+
+    # CPU lee de RAM
+    trans1 = Transaccion(
+        origen="CPU",
+        destino="RAM",
+        direccion=0x1000,
+        tipo='READ',
+        datos=b'\x00' * 64,
+        tamaño=64,  # 1 línea de cache
+        prioridad=5,
+        timestamp=time.time()
     )
-bus1.agregar_transaccion(trans1)
-bus1.simular_ciclo()
-GPU escribe a RAM
-trans2 = Transaccion(
-    origen="GPU",
-    destino="RAM",
-    direccion=0x2000,
-    tipo='WRITE',
-    datos=b'\xFF' * 1024,
-    tamaño=1024,  # 1 KB
-    prioridad=3,
-    timestamp=time.time()
+    bus1.agregar_transaccion(trans1)
+    bus1.simular_ciclo()
+
+    # GPU escribe a RAM
+    trans2 = Transaccion(
+        origen="GPU",
+        destino="RAM",
+        direccion=0x2000,
+        tipo='WRITE',
+        datos=b'\xFF' * 1024,
+        tamaño=1024,  # 1 KB
+        prioridad=3,
+        timestamp=time.time()
     )
-bus1.agregar_transaccion(trans2)
-bus1.simular_ciclo()
-bus1.mostrar_estadisticas()
-========================================
-EXPERIMENTO 2: Contención del bus
-========================================
-print("\n\n" + "="*70)
-print("EXPERIMENTO 2: CONTENCIÓN DEL BUS")
-print("="*70)
-print("Múltiples dispositivos quieren usar el bus simultáneamente")
-bus2 = Bus(ancho_bits=64, frecuencia_mhz=5000)
-Simula múltiples dispositivos solicitando bus al mismo tiempo
-dispositivos = ['CPU', 'GPU', 'NVMe', 'USB', 'Ethernet']
-for i, disp in enumerate(dispositivos):
-trans = Transaccion(
-origen=disp,
-destino="RAM",
-direccion=0x1000 * (i+1),
-tipo=random.choice(['READ', 'WRITE']),
-datos=b'\x00' * 512,
-tamaño=512,
-prioridad=random.randint(1, 10),
-timestamp=time.time()
-)
-bus2.agregar_transaccion(trans)
-print(f"\n⚡ Arbitrando {len(bus2.cola_espera)} transacciones...")
-print(f"   (Se ejecutarán por prioridad)\n")
-while bus2.cola_espera:
-bus2.simular_ciclo()
-input("\n⏸️  Presiona ENTER para siguiente transacción...")
-bus2.mostrar_estadisticas()
-========================================
-EXPERIMENTO 3: Comparación de anchos
-========================================
-print("\n\n" + "="*70)
-print("EXPERIMENTO 3: COMPARACIÓN DE ANCHOS DE BUS")
-print("="*70)
-datos_test = b'\x00' * (1024 * 1024)  # 1 MB
-configuraciones = [
-(32, "Bus 32-bit (antiguo)"),
-(64, "Bus 64-bit (actual)"),
-(128, "Bus 128-bit (hipotético)"),
-]
-print(f"\nTransferencia de {len(datos_test) / 1024:.0f} KB:\n")
-for ancho, nombre in configuraciones:
-bus = Bus(ancho_bits=ancho, frecuencia_mhz=5000)
-trans = Transaccion(
-    origen="Test",
-    destino="RAM",
-    direccion=0x0,
-    tipo='WRITE',
-    datos=datos_test,
-    tamaño=len(datos_test),
-    prioridad=5,
-    timestamp=time.time()
-)
-
-print(f"\n{nombre}:")
-print(f"   Ancho banda teórico: {bus.bandwidth_bps / 1e9:.2f} GB/s")
-
-ciclos = bus.calcular_ciclos_necesarios(len(datos_test))
-tiempo_ns = (ciclos / bus.ciclos_por_segundo) * 1_000_000_000
-
-print(f"   Ciclos necesarios: {ciclos:,}")
-print(f"   Tiempo: {tiempo_ns:.0f} ns = {tiempo_ns/1000:.2f} μs")
-========================================
-LECCIONES PRÁCTICAS
-========================================
-print("\n\n" + "="*70)
-print("💡 LECCIONES PARA PROGRAMACIÓN")
-print("="*70)
-print("""
+    bus1.agregar_transaccion(trans2)
+    bus1.simular_ciclo()
+
+    bus1.mostrar_estadisticas()
+
+    # ========================================
+    # EXPERIMENTO 2: Contención del bus
+    # ========================================
+    print("\n\n" + "="*70)
+    print("EXPERIMENTO 2: CONTENCIÓN DEL BUS")
+    print("="*70)
+    print("Múltiples dispositivos quieren usar el bus simultáneamente")
+
+    bus2 = Bus(ancho_bits=64, frecuencia_mhz=5000)
+
+    # Simula múltiples dispositivos solicitando bus al mismo tiempo
+    dispositivos = ['CPU', 'GPU', 'NVMe', 'USB', 'Ethernet']
+    buffer = memoryview(bytearray(512 * len(dispositivos)))  # Un solo buffer, una vista por transacción
+    for i, disp in enumerate(dispositivos):
+        trans = Transaccion(
+            origen=disp,
+            destino="RAM",
+            direccion=0x1000 * (i+1),
+            tipo=random.choice(['READ', 'WRITE']),
+            datos=buffer[i * 512:(i + 1) * 512],  # tamaño = 512 (se deduce)
+            prioridad=random.randint(1, 10),
+            timestamp=time.time()
+        )
+        bus2.agregar_transaccion(trans)
+
+    print(f"\n⚡ Arbitrando {len(bus2.cola_espera)} transacciones...")
+    print(f"   (Se ejecutarán por prioridad)\n")
+
+    while bus2.cola_espera:
+        bus2.simular_ciclo()
+        input("\n⏸️  Presiona ENTER para siguiente transacción...")
+
+    bus2.mostrar_estadisticas()
+
+    # ========================================
+    # EXPERIMENTO 3: Comparación de anchos
+    # ========================================
+    print("\n\n" + "="*70)
+    print("EXPERIMENTO 3: COMPARACIÓN DE ANCHOS DE BUS")
+    print("="*70)
+
+    datos_test = bytearray(1024 * 1024)  # 1 MB, compartido por las 3 transacciones
+
+    configuraciones = [
+        (32, "Bus 32-bit (antiguo)"),
+        (64, "Bus 64-bit (actual)"),
+        (128, "Bus 128-bit (hipotético)"),
+    ]
+
+    print(f"\nTransferencia de {len(datos_test) / 1024:.0f} KB:\n")
+
+    for ancho, nombre in configuraciones:
+        bus = Bus(ancho_bits=ancho, frecuencia_mhz=5000)
+
+        trans = Transaccion(
+            origen="Test",
+            destino="RAM",
+            direccion=0x0,
+            tipo='WRITE',
+            datos=datos_test,
+            prioridad=5,
+            timestamp=time.time()
+        )
+
+        print(f"\n{nombre}:")
+        print(f"   Ancho banda teórico: {bus.bandwidth_bps / 1e9:.2f} GB/s")
+
+        ciclos = bus.calcular_ciclos_necesarios(len(datos_test))
+        tiempo_ns = (ciclos / bus.ciclos_por_segundo) * 1_000_000_000
+
+        print(f"   Ciclos necesarios: {ciclos:,}")
+        print(f"   Tiempo: {tiempo_ns:.0f} ns = {tiempo_ns/1000:.2f} μs")
+
+    # ========================================
+    # LECCIONES PRÁCTICAS
+    # ========================================
+    print("\n\n" + "="*70)
+    print("💡 LECCIONES PARA PROGRAMACIÓN")
+    print("="*70)
+    print("""
 
 MINIMIZA TRANSFERENCIAS CPU ↔ GPU 🔄
 
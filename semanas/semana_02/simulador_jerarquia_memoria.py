@@ -3,14 +3,54 @@ Simulador de Jerarquía de Memoria
 Demuestra cache hits/misses y su impacto en rendimiento
 """
 
+import heapq
 import random
 import time
-from collections import OrderedDict
+
+import numpy as np
+
+from almacen_paginado import AlmacenPaginado
+from cache_asociativo import CacheAsociativo
+
+# Niveles de cache que se pueden configurar
+NIVELES_CACHE = ('L1', 'L2', 'L3')
+
+# Códigos de nivel que devuelve leer_lote (SSD = primera vez que se toca la línea)
+NIVELES = ('L1', 'L2', 'L3', 'RAM', 'SSD')
+COD_L1, COD_L2, COD_L3, COD_RAM, COD_SSD = range(5)
+
+# Políticas de escritura
+POLITICAS_ESCRITURA = ('write-back', 'write-through')
+
 
 class MemoryHierarchy:
     """Simula la jerarquía completa de memoria"""
     
-    def __init__(self):
+    def __init__(self, line_size=64, asociatividad=None, politica='LRU', semilla=None,
+                 escritura='write-back', write_allocate=True, latencias=None, tamaños=None,
+                 pagina_ram=4096):
+        """
+        Args:
+            line_size: tamaño de línea de cache en bytes
+            asociatividad: None (totalmente asociativa), un int (ways para
+                           todos los niveles) o dict {'L1': 8, 'L2': 8, 'L3': 16}
+            politica: 'LRU', 'PLRU', 'FIFO', 'RANDOM', 'SRRIP' o dict por nivel
+            semilla: semilla para la política RANDOM
+            escritura: 'write-back' (bit dirty, se escribe al expulsar) o
+                       'write-through' (cada escritura llega hasta RAM)
+            write_allocate: True = un miss de escritura trae la línea a L1;
+                            False = se escribe en el primer nivel que la tenga
+            latencias: dict que reemplaza algunas latencias (p. ej. {'RAM': 80})
+            tamaños: dict que reemplaza algunos tamaños (p. ej. {'L2': 1 << 20})
+            pagina_ram: tamaño de página de la RAM; una página no residente
+                        (primer toque o expulsada) se trae del SSD completa
+        """
+        if escritura not in POLITICAS_ESCRITURA:
+            raise ValueError(f"Política de escritura desconocida: {escritura} "
+                             f"(opciones: {', '.join(POLITICAS_ESCRITURA)})")
+        self.write_back = escritura == 'write-back'
+        self.write_allocate = write_allocate
+        
         # Latencias en nanosegundos
         self.LATENCIAS = {
             'L1': 1,
@@ -20,6 +60,7 @@ class MemoryHierarchy:
             'SSD': 10000,  # 10 μs
             'HDD': 5000000  # 5 ms
         }
+        self.LATENCIAS.update(latencias or {})
         
         # Tamaños en bytes
         self.TAMAÑOS = {
@@ -28,12 +69,27 @@ class MemoryHierarchy:
             'L3': 16 * 1024 * 1024, # 16 MB
             'RAM': 32 * 1024 * 1024 * 1024,  # 32 GB
         }
+        self.TAMAÑOS.update(tamaños or {})
+        
+        # Línea de cache (64 bytes)
+        self.CACHE_LINE_SIZE = line_size
+        
+        # Caches asociativas por conjuntos (por defecto: totalmente asociativas LRU)
+        for nivel in NIVELES_CACHE:
+            ways = asociatividad.get(nivel) if isinstance(asociatividad, dict) else asociatividad
+            pol = politica.get(nivel, 'LRU') if isinstance(politica, dict) else politica
+            setattr(self, nivel, CacheAsociativo(
+                self.TAMAÑOS[nivel], line_size, ways, pol, semilla))
+        self._caches = (self.L1, self.L2, self.L3)
+        self.RAM = AlmacenPaginado(self.TAMAÑOS['RAM'], pagina_ram, line_size)
         
-        # Caches (usando LRU)
-        self.L1 = OrderedDict()
-        self.L2 = OrderedDict()
-        self.L3 = OrderedDict()
-        self.RAM = {}
+        # Prefetchers: lista de (índice de nivel, prefetcher)
+        self.prefetchers = []
+        self._pendientes = {}  # línea prefetcheada sin usar → (prefetcher, nivel, llega_en_ns)
+        self._computo = 0      # ns de cómputo entre accesos (ver avanzar)
+        # Si es una lista, cada escritura a RAM anota (dirección, bytes): write-backs
+        # de víctimas y write-through (lo usa simulador_sistema para el bus)
+        self.escrituras_ram = None
         
         # Estadísticas
         self.stats = {
@@ -44,92 +100,411 @@ class MemoryHierarchy:
             'L3_hits': 0,
             'L3_misses': 0,
             'RAM_accesses': 0,
-            'total_latency': 0
+            'total_latency': 0,
+            'escrituras': 0,
+            'writebacks': 0,       # Líneas sucias expulsadas
+            'bytes_writeback': 0,
+            'RAM_writes': 0,
+            'bytes_a_RAM': 0,      # Ancho de banda de escritura hacia RAM
+            'prefetches': 0,
+            'bytes_prefetch': 0
         }
+    
+    def reiniciar_estadisticas(self):
+        """Pone los contadores a cero (las caches quedan como están)"""
+        for clave in self.stats:
+            self.stats[clave] = 0
+        self._computo = 0
+        self._pendientes.clear()
+    
+    def precargar_ram(self, direcciones):
+        """Deja páginas ya residentes en RAM (como un archivo en page cache), sin tocar las caches"""
+        tamaño_pagina = self.RAM.tamaño_pagina
+        paginas = np.unique(np.asarray(direcciones, dtype=np.int64) // tamaño_pagina)
+        for pagina in (paginas * tamaño_pagina).tolist():
+            self.RAM.cargar(pagina)
+    
+    @property
+    def reloj(self):
+        """Tiempo simulado en ns: latencia de los accesos + cómputo entre ellos"""
+        return self.stats['total_latency'] + self._computo
+    
+    def avanzar(self, ns):
+        """Simula `ns` de cómputo sin accesos (da tiempo a que lleguen los prefetches)"""
+        self._computo += ns
+    
+    def agregar_prefetcher(self, prefetcher, nivel='L1'):
+        """
+        Conecta un prefetcher (ver prefetchers.py) a un nivel de cache
         
-        # Línea de cache (64 bytes)
-        self.CACHE_LINE_SIZE = 64
+        Observa los accesos de demanda que llegan a ese nivel y trae las
+        líneas pedidas a ese nivel (y a los intermedios).
+        
+        Returns:
+            el mismo prefetcher (para leer sus contadores)
+        """
+        prefetcher.line_size = self.CACHE_LINE_SIZE
+        self.prefetchers.append((NIVELES_CACHE.index(nivel), prefetcher))
+        return prefetcher
     
     def _cache_line_address(self, address):
         """Calcula dirección de línea de cache"""
         return (address // self.CACHE_LINE_SIZE) * self.CACHE_LINE_SIZE
     
-    def _evict_if_full(self, cache, max_size):
-        """Política LRU: saca el más antiguo si está lleno"""
-        current_size = len(cache) * self.CACHE_LINE_SIZE
-        if current_size >= max_size:
-            cache.popitem(last=False)  # Saca el primero (más antiguo)
-    
-    def leer_memoria(self, address):
+    def leer_memoria(self, address, pc=None):
         """
         Lee dato de memoria, simulando jerarquía completa
         
+        Args:
+            address: dirección
+            pc: dirección de la instrucción (solo la usan los prefetchers por PC)
+        
         Returns:
             tuple: (dato, latencia_total_ns, nivel_encontrado)
         """
-        line_addr = self._cache_line_address(address)
-        latencia_acumulada = 0
+        dato, latencia, codigo = self._leer_linea(self._cache_line_address(address), pc)
+        # Para el usuario la primera carga (desde SSD) también "viene de RAM"
+        return dato, latencia, NIVELES[min(codigo, COD_RAM)]
+    
+    def _leer_linea(self, line_addr, pc=None):
+        """
+        Núcleo de la lectura de una línea (lo usan leer_memoria y leer_lote)
+        
+        Returns:
+            tuple: (dato, latencia_total_ns, código de nivel)
+        """
+        if self.prefetchers:
+            return self._leer_con_prefetch(line_addr, pc)
+        return self._leer_demanda(line_addr)
+    
+    def _leer_con_prefetch(self, line_addr, pc):
+        """Lectura de demanda + contabilidad de prefetches + disparo de nuevos"""
+        ahora = self.reloj
+        pendiente = self._pendientes.pop(line_addr, None)
+        dato, latencia, codigo = self._leer_demanda(line_addr)
+        
+        if pendiente is not None:
+            prefetcher, _, llega_en = pendiente
+            prefetcher.utiles += 1
+            if llega_en > ahora + latencia:
+                # El prefetch sigue en camino: la demanda espera lo que falta
+                prefetcher.tardios += 1
+                espera = llega_en - ahora - latencia
+                latencia += espera
+                self.stats['total_latency'] += espera
+        
+        fin = ahora + latencia
+        for nivel, prefetcher in self.prefetchers:
+            if codigo < nivel:
+                continue  # La demanda no llegó a ese nivel
+            fallo = codigo > nivel
+            if fallo:
+                prefetcher.fallos += 1
+            disparo = fallo or (pendiente is not None and pendiente[0] is prefetcher)
+            for linea in prefetcher.observar(line_addr, pc, disparo):
+                self._emitir_prefetch(prefetcher, nivel, linea, fin)
+        return dato, latencia, codigo
+    
+    def _emitir_prefetch(self, prefetcher, nivel, line_addr, ahora):
+        """Trae una línea al nivel del prefetcher (en segundo plano: no suma latencia de demanda)"""
+        cache = self._caches[nivel]
+        if line_addr < 0 or line_addr in self._pendientes or line_addr in cache:
+            return
+        en_vuelo = prefetcher.en_vuelo
+        while en_vuelo and en_vuelo[0] <= ahora:
+            heapq.heappop(en_vuelo)
+        if len(en_vuelo) >= prefetcher.max_en_vuelo:
+            prefetcher.descartados += 1
+            return
+        
+        # Busca la línea hacia abajo sin contar hits/misses de demanda
+        latencia = 0
+        dato = None
+        for fuente in range(nivel + 1, len(self._caches)):
+            latencia += self.LATENCIAS[NIVELES[fuente]]
+            dato = self._caches[fuente].ver(line_addr)
+            if dato is not None:
+                break
+        else:
+            fuente = len(self._caches)
+            latencia += self.LATENCIAS['RAM' if line_addr in self.RAM else 'SSD']
+            dato = self.RAM[line_addr]
+        for destino in range(fuente - 1, nivel - 1, -1):
+            if line_addr not in self._caches[destino]:
+                self._rellenar(destino, line_addr, dato)
+        
+        heapq.heappush(en_vuelo, ahora + latencia)
+        self._pendientes[line_addr] = (prefetcher, nivel, ahora + latencia)
+        prefetcher.emitidos += 1
+        self.stats['prefetches'] += 1
+        self.stats['bytes_prefetch'] += self.CACHE_LINE_SIZE
+    
+    def _leer_demanda(self, line_addr):
+        """Recorre L1 → L2 → L3 → RAM/SSD para un acceso de demanda"""
+        latencia_acumulada = self.LATENCIAS['L1']
         
         # Intenta L1
-        if line_addr in self.L1:
+        dato = self.L1.buscar(line_addr)
+        if dato is not None:
             self.stats['L1_hits'] += 1
-            latencia_acumulada += self.LATENCIAS['L1']
-            # Mueve al final (más recientemente usado)
-            self.L1.move_to_end(line_addr)
-            return self.L1[line_addr], latencia_acumulada, 'L1'
+            self.stats['total_latency'] += latencia_acumulada
+            return dato, latencia_acumulada, COD_L1
         
         self.stats['L1_misses'] += 1
-        latencia_acumulada += self.LATENCIAS['L1']
+        latencia_acumulada += self.LATENCIAS['L2']
 
-            # Intenta L2
-        if line_addr in self.L2:
+        # Intenta L2
+        dato = self.L2.buscar(line_addr)
+        if dato is not None:
             self.stats['L2_hits'] += 1
-            latencia_acumulada += self.LATENCIAS['L2']
             # Copia a L1
-            self._evict_if_full(self.L1, self.TAMAÑOS['L1'])
-            self.L1[line_addr] = self.L2[line_addr]
-            self.L2.move_to_end(line_addr)
-            return self.L2[line_addr], latencia_acumulada, 'L2'
+            latencia_acumulada += self._rellenar(0, line_addr, dato)
+            self.stats['total_latency'] += latencia_acumulada
+            return dato, latencia_acumulada, COD_L2
         
         self.stats['L2_misses'] += 1
-        latencia_acumulada += self.LATENCIAS['L2']
+        latencia_acumulada += self.LATENCIAS['L3']
         
         # Intenta L3
-        if line_addr in self.L3:
+        dato = self.L3.buscar(line_addr)
+        if dato is not None:
             self.stats['L3_hits'] += 1
-            latencia_acumulada += self.LATENCIAS['L3']
             # Copia a L2 y L1
-            self._evict_if_full(self.L2, self.TAMAÑOS['L2'])
-            self.L2[line_addr] = self.L3[line_addr]
-            self._evict_if_full(self.L1, self.TAMAÑOS['L1'])
-            self.L1[line_addr] = self.L3[line_addr]
-            self.L3.move_to_end(line_addr)
-            return self.L3[line_addr], latencia_acumulada, 'L3'
+            latencia_acumulada += self._rellenar(1, line_addr, dato)
+            latencia_acumulada += self._rellenar(0, line_addr, dato)
+            self.stats['total_latency'] += latencia_acumulada
+            return dato, latencia_acumulada, COD_L3
         
         self.stats['L3_misses'] += 1
-        latencia_acumulada += self.LATENCIAS['L3']
         
         # Intenta RAM
         if line_addr in self.RAM:
             self.stats['RAM_accesses'] += 1
             latencia_acumulada += self.LATENCIAS['RAM']
-            dato = self.RAM[line_addr]
+            codigo = COD_RAM
         else:
-            # Simula carga desde disco (primera vez)
+            # Simula carga de la página desde disco (primera vez o expulsada)
             latencia_acumulada += self.LATENCIAS['SSD']
-            dato = f"Dato_{line_addr}"
-            self.RAM[line_addr] = dato
+            codigo = COD_SSD
+        dato = self.RAM[line_addr]
         
         # Propaga hacia arriba (inclusive policy)
-        self._evict_if_full(self.L3, self.TAMAÑOS['L3'])
-        self.L3[line_addr] = dato
-        self._evict_if_full(self.L2, self.TAMAÑOS['L2'])
-        self.L2[line_addr] = dato
-        self._evict_if_full(self.L1, self.TAMAÑOS['L1'])
-        self.L1[line_addr] = dato
+        latencia_acumulada += self._rellenar(2, line_addr, dato)
+        latencia_acumulada += self._rellenar(1, line_addr, dato)
+        latencia_acumulada += self._rellenar(0, line_addr, dato)
         
         self.stats['total_latency'] += latencia_acumulada
-        return dato, latencia_acumulada, 'RAM'
+        return dato, latencia_acumulada, codigo
+    
+    def _rellenar(self, nivel, line_addr, dato):
+        """
+        Inserta una línea en L1/L2/L3 (0/1/2); si expulsa una línea sucia la escribe abajo
+        
+        Returns:
+            int: latencia extra del write-back (0 si no hubo)
+        """
+        victima = self._caches[nivel].insertar(line_addr, dato)
+        if victima is None:
+            return 0
+        if self._pendientes:
+            pendiente = self._pendientes.get(victima[0])
+            if pendiente is not None and pendiente[1] == nivel:
+                # Prefetch expulsado sin que nadie lo usara
+                del self._pendientes[victima[0]]
+                pendiente[0].inutiles += 1
+        if victima[2]:
+            return self._write_back(nivel, victima[0], victima[1])
+        return 0
+    
+    def _write_back(self, nivel, line_addr, dato):
+        """Escribe una línea sucia expulsada del nivel dado en el primer nivel inferior que la tenga"""
+        self.stats['writebacks'] += 1
+        self.stats['bytes_writeback'] += self.CACHE_LINE_SIZE
+        for inferior in range(nivel + 1, len(self._caches)):
+            cache = self._caches[inferior]
+            if line_addr in cache:
+                cache.actualizar(line_addr, dato)
+                cache.marcar_sucia(line_addr)
+                return self.LATENCIAS[NIVELES[inferior]]
+        self.RAM[line_addr] = dato
+        self.stats['RAM_writes'] += 1
+        self.stats['bytes_a_RAM'] += self.CACHE_LINE_SIZE
+        if self.escrituras_ram is not None:
+            self.escrituras_ram.append((line_addr, self.CACHE_LINE_SIZE))
+        return self.LATENCIAS['RAM']
+    
+    def escribir_memoria(self, address, dato=None, tamaño=None):
+        """
+        Escribe en memoria según la política de escritura configurada
+        
+        Args:
+            address: dirección
+            dato: bytes a escribir desde address, sin salir de la línea
+                  (None = solo se simula el tráfico)
+            tamaño: bytes escritos (por defecto len(dato), o 4 si no hay dato)
+        
+        Returns:
+            tuple: (latencia_total_ns, nivel donde se escribió)
+        """
+        line_addr = self._cache_line_address(address)
+        if dato is not None:
+            dato = bytes(dato)
+            if address - line_addr + len(dato) > self.CACHE_LINE_SIZE:
+                raise ValueError(f"Escritura de {len(dato)} B en 0x{address:X} cruza la línea de cache")
+        if tamaño is None:
+            tamaño = 4 if dato is None else len(dato)
+        latencia, codigo = self._escribir_linea(line_addr, dato, tamaño, address - line_addr)
+        return latencia, NIVELES[min(codigo, COD_RAM)]
+    
+    def _escribir_linea(self, line_addr, dato, tamaño, desplazamiento=0):
+        """
+        Núcleo de la escritura de una línea
+        
+        Args:
+            dato: bytes a escribir en `desplazamiento` dentro de la línea (o None)
+        
+        Returns:
+            tuple: (latencia_total_ns, código del nivel donde se escribió)
+        """
+        self.stats['escrituras'] += 1
+        
+        if self.write_allocate:
+            # Miss de escritura = lectura de la línea hasta L1 (esa latencia ya se contó)
+            actual, latencia, codigo = self._leer_linea(line_addr)
+            nivel = COD_L1
+            extra = 0
+        else:
+            # Sin asignar: se escribe en el primer nivel que tenga la línea
+            latencia = 0
+            for nivel, cache in enumerate(self._caches):
+                latencia += self.LATENCIAS[NIVELES[nivel]]
+                if cache.buscar(line_addr) is not None:
+                    self.stats[f'{NIVELES[nivel]}_hits'] += 1
+                    break
+                self.stats[f'{NIVELES[nivel]}_misses'] += 1
+            else:
+                nivel = COD_RAM
+                latencia += self.LATENCIAS['RAM']
+            codigo = nivel
+            extra = latencia
+            if dato is not None:
+                actual = self._caches[nivel].ver(line_addr) if nivel < COD_RAM else self.RAM[line_addr]
+        
+        if dato is not None:
+            # El nivel escrito tiene la copia más nueva: se mezclan los bytes nuevos
+            dato = actual[:desplazamiento] + dato + actual[desplazamiento + len(dato):]
+        
+        if nivel < COD_RAM:
+            cache = self._caches[nivel]
+            if dato is not None:
+                cache.actualizar(line_addr, dato)
+            if self.write_back:
+                cache.marcar_sucia(line_addr)
+        
+        if not self.write_back or nivel == COD_RAM:
+            # La escritura llega hasta RAM (actualizando las copias de los niveles inferiores)
+            if dato is not None:
+                for cache in self._caches[nivel + 1:]:
+                    if line_addr in cache:
+                        cache.actualizar(line_addr, dato)
+                self.RAM[line_addr] = dato
+            else:
+                self.RAM.cargar(line_addr)
+            if nivel < COD_RAM:
+                latencia += self.LATENCIAS['RAM']
+                extra += self.LATENCIAS['RAM']
+            self.stats['RAM_writes'] += 1
+            self.stats['bytes_a_RAM'] += tamaño
+            if self.escrituras_ram is not None:
+                self.escrituras_ram.append((line_addr + desplazamiento, tamaño))
+        
+        self.stats['total_latency'] += extra
+        return latencia, codigo
+    
+    def leer_lote(self, direcciones):
+        """
+        Reproduce un bloque de direcciones (solo lecturas) de una sola vez
+        
+        Returns:
+            tuple: (códigos de nivel uint8, latencias ns uint32); ver NIVELES
+        """
+        return self.acceder_lote(direcciones)
+    
+    def acceder_lote(self, direcciones, escrituras=None, tamaños=4):
+        """
+        Reproduce un bloque de accesos (lecturas y escrituras) de una sola vez
+        
+        Las rachas de LECTURAS seguidas a la MISMA línea se colapsan: solo
+        se simulan las dos primeras (la segunda fija el estado de la política,
+        p. ej. SRRIP); el resto son hits de L1 garantizados y se cuentan en bloque.
+        Con prefetchers no hay garantía (un prefetch puede expulsar la línea
+        entre dos accesos), así que la racha se simula acceso a acceso.
+        Cada escritura se simula por separado.
+        
+        Args:
+            direcciones: array de NumPy (o secuencia) de direcciones
+            escrituras: array booleano (None = todo lecturas)
+            tamaños: array o escalar con los bytes de cada acceso
+        
+        Returns:
+            tuple: (códigos de nivel uint8, latencias ns uint32); ver NIVELES
+        """
+        direcciones = np.asarray(direcciones, dtype=np.int64)
+        n = len(direcciones)
+        lat_l1 = self.LATENCIAS['L1']
+        codigos = np.zeros(n, dtype=np.uint8)  # COD_L1 por defecto
+        latencias = np.full(n, lat_l1, dtype=np.uint32)
+        if n == 0:
+            return codigos, latencias
+        
+        lineas = (direcciones // self.CACHE_LINE_SIZE) * self.CACHE_LINE_SIZE
+        cambio = np.empty(n, dtype=bool)
+        cambio[0] = True
+        np.not_equal(lineas[1:], lineas[:-1], out=cambio[1:])
+        if escrituras is not None:
+            escrituras = np.asarray(escrituras, dtype=bool)
+            tamaños = np.broadcast_to(np.asarray(tamaños, dtype=np.int64), (n,))
+            # Cada escritura es su propia racha (y corta la racha de lecturas)
+            cambio[1:] |= escrituras[1:] | escrituras[:-1]
+        inicios = np.flatnonzero(cambio)
+        largos = np.diff(np.append(inicios, n))
+        
+        if escrituras is None:
+            es_escritura = [False] * len(inicios)
+        else:
+            es_escritura = escrituras[inicios].tolist()
+        
+        leer_linea = self._leer_linea
+        for pos, linea, largo, escribe in zip(inicios.tolist(), lineas[inicios].tolist(),
+                                              largos.tolist(), es_escritura):
+            if escribe:
+                latencia, codigo = self._escribir_linea(linea, None, int(tamaños[pos]))
+            else:
+                _, latencia, codigo = leer_linea(linea)
+                if largo > 1 and self.prefetchers:
+                    for k in range(pos + 1, pos + largo):
+                        _, latencias[k], codigos[k] = leer_linea(linea)
+                elif largo > 1:
+                    # Sin prefetchers nada corre entre dos accesos: hit en L1 seguro
+                    _, latencias[pos + 1], codigos[pos + 1] = leer_linea(linea)
+                    if largo > 2:
+                        # Hits de L1 colapsados (se suman aquí para que el reloj
+                        # de los prefetchers avance igual que acceso a acceso)
+                        self.stats['L1_hits'] += largo - 2
+                        self.stats['total_latency'] += (largo - 2) * lat_l1
+            codigos[pos] = codigo
+            latencias[pos] = latencia
+        return codigos, latencias
+    
+    def leer_lotes(self, bloques):
+        """
+        Reproduce una traza entregada en bloques (p. ej. leída de disco)
+        
+        Yields:
+            tuple: (códigos, latencias) de cada bloque
+        """
+        for bloque in bloques:
+            yield self.leer_lote(bloque)
 
     def mostrar_estadisticas(self):
         """Muestra estadísticas de accesos"""
@@ -156,6 +531,27 @@ class MemoryHierarchy:
         
         print(f"\n💾 RAM:")
         print(f"   Accesos: {self.stats['RAM_accesses']:,}")
+        print(f"   Páginas residentes: {len(self.RAM):,} "
+              f"({self.RAM.memoria_usada() / 1024 / 1024:.1f} MB)")
+        if self.RAM.stats['swap_outs']:
+            print(f"   Swap-outs: {self.RAM.stats['swap_outs']:,} | "
+                  f"Swap-ins: {self.RAM.stats['swap_ins']:,}")
+        
+        if self.stats['escrituras'] or self.stats['writebacks']:
+            print(f"\n✍️  Escrituras ({'write-back' if self.write_back else 'write-through'}, "
+                  f"{'write-allocate' if self.write_allocate else 'no-write-allocate'}):")
+            print(f"   Escrituras:  {self.stats['escrituras']:,}")
+            print(f"   Write-backs: {self.stats['writebacks']:,} "
+                  f"({self.stats['bytes_writeback']:,} bytes)")
+            print(f"   Escrituras a RAM: {self.stats['RAM_writes']:,} "
+                  f"({self.stats['bytes_a_RAM']:,} bytes)")
+        
+        for nivel, prefetcher in self.prefetchers:
+            print(f"\n🔮 Prefetcher {prefetcher.nombre} en {NIVELES[nivel]}:")
+            print(f"   Emitidos: {prefetcher.emitidos:,} (descartados: {prefetcher.descartados:,})")
+            print(f"   Precisión: {prefetcher.precision() * 100:.1f}% | "
+                  f"Cobertura: {prefetcher.cobertura() * 100:.1f}% | "
+                  f"A tiempo: {prefetcher.puntualidad() * 100:.1f}%")
         
         print(f"\n⏱️  Latencia Total: {self.stats['total_latency']:,} ns")
         print(f"   = {self.stats['total_latency'] / 1_000:.2f} μs")
@@ -183,6 +579,60 @@ if __name__== "__main__":
 
     mem.mostrar_estadisticas()
 
+    # ========================================
+    # EXPERIMENTO: Traza grande en lote (NumPy)
+    # ========================================
+    print("\n" + "="*70)
+    print("🚀 LEER_LOTE: 2M enteros de 4 bytes recorridos secuencialmente")
+    print("="*70)
+    mem_lote = MemoryHierarchy()
+    trazo = np.arange(0, 2_000_000 * 4, 4, dtype=np.int64)
+    inicio = time.perf_counter()
+    codigos, latencias = mem_lote.leer_lote(trazo)
+    segundos = time.perf_counter() - inicio
+    for codigo, cuenta in enumerate(np.bincount(codigos, minlength=len(NIVELES))):
+        print(f"   {NIVELES[codigo]:<4} {cuenta:>10,} accesos")
+    print(f"   Latencia media: {latencias.mean():.2f} ns")
+    print(f"   Tiempo: {segundos:.2f} s ({len(trazo) / segundos / 1e6:.1f} M accesos/s)")
+
+    # ========================================
+    # EXPERIMENTO: Bucle con muchos stores
+    # ========================================
+    print("\n" + "="*70)
+    print("✍️  STORES: a[i] = a[i] + 1 sobre 4 MB (dos pasadas)")
+    print("="*70)
+    n = 1_000_000
+    direcciones = np.repeat(np.arange(0, n * 4, 4, dtype=np.int64), 2)
+    escrituras = np.tile([False, True], n)  # load a[i]; store a[i]
+    direcciones = np.tile(direcciones, 2)
+    escrituras = np.tile(escrituras, 2)
+    print(f"\n{'Política':<34} {'Lat. media':>11} {'Bytes a RAM':>14}")
+    print("-" * 70)
+    for escritura in POLITICAS_ESCRITURA:
+        for allocate in (True, False):
+            mem_st = MemoryHierarchy(asociatividad=8, escritura=escritura, write_allocate=allocate)
+            _, latencias = mem_st.acceder_lote(direcciones, escrituras)
+            nombre = f"{escritura} + {'write-allocate' if allocate else 'no-write-allocate'}"
+            print(f"{nombre:<34} {latencias.mean():>8.2f} ns {mem_st.stats['bytes_a_RAM']:>14,}")
+
+    # ========================================
+    # VERIFICACIÓN: lote == acceso a acceso, también con prefetchers
+    # ========================================
+    # Stride de 16 KB: con L1 de mapeo directo el 4º prefetch cae en el mismo
+    # conjunto que la línea recién leída y la expulsa antes de su 2º acceso
+    from prefetchers import PrefetchStride
+    trazo = np.repeat(np.arange(0, 512 * 1024, 16 * 1024, dtype=np.int64), 3)
+    for ways in (1, 2):
+        mem_lote = MemoryHierarchy(asociatividad=ways)
+        mem_lote.agregar_prefetcher(PrefetchStride(grado=4, region=1 << 30))
+        mem_uno = MemoryHierarchy(asociatividad=ways)
+        mem_uno.agregar_prefetcher(PrefetchStride(grado=4, region=1 << 30))
+        codigos, latencias = mem_lote.leer_lote(trazo)
+        referencia = [mem_uno.leer_memoria(int(addr))[1] for addr in trazo]
+        assert latencias.tolist() == referencia
+        assert mem_lote.stats == mem_uno.stats
+    print("\n✅ leer_lote coincide con leer_memoria (con prefetch stride)")
+
 
 
 '''
@@ -0,0 +1,356 @@
+"""
+Simulador Multinúcleo: L1/L2 privadas, L3 compartida y coherencia MESI
+Muestra cuándo agregar hilos deja de escalar por los misses de coherencia
+"""
+
+import heapq
+
+import numpy as np
+
+from cache_asociativo import CacheAsociativo
+
+# Estados MESI (una línea ausente del diccionario de estados = Invalid)
+MODIFIED = 'M'
+EXCLUSIVE = 'E'
+SHARED = 'S'
+
+# Bytes de un mensaje de control en el bus de snoop (petición / invalidación)
+BYTES_CONTROL = 8
+
+
+class Nucleo:
+    """Caches privadas + estado MESI de un núcleo"""
+    __slots__ = ('id', 'L1', 'L2', 'estado', 'invalidadas', 'reloj', 'stats')
+
+    def __init__(self, ident, tamaños, line_size, asociatividad, politica):
+        self.id = ident
+        self.L1 = CacheAsociativo(tamaños['L1'], line_size, asociatividad, politica)
+        self.L2 = CacheAsociativo(tamaños['L2'], line_size, asociatividad, politica)
+        self.estado = {}       # línea → 'M' / 'E' / 'S' (L2 es inclusiva de L1)
+        self.invalidadas = {}  # línea → bytes que escribió quien nos invalidó
+        self.reloj = 0         # ns simulados de este núcleo
+        self.stats = {
+            'accesos': 0,
+            'L1_hits': 0,
+            'L2_hits': 0,
+            'misses_privados': 0,
+            'misses_coherencia': 0,  # La línea estaba, pero otro núcleo la invalidó
+            'falso_compartir': 0,    # ...y los bytes usados NO eran los escritos
+        }
+
+
+class SistemaMultinucleo:
+    """
+    N núcleos con L1/L2 privadas y una L3 compartida, coherentes con MESI
+
+    Protocolo de snoop (bus compartido):
+    - Lectura con miss privado → BusRd: un dueño M/E la pasa (cache a cache)
+      y queda en S; si nadie la tiene se lee de L3/RAM en estado E.
+    - Escritura en S → BusUpgr: invalida las demás copias.
+    - Escritura con miss privado → BusRdX: invalida las demás copias
+      (un dueño M hace flush a L3 y pasa la línea).
+    - Una línea M expulsada de L2 se escribe en L3 (write-back).
+    """
+
+    def __init__(self, nucleos=4, line_size=64, asociatividad=8, politica='LRU'):
+        # Latencias en nanosegundos
+        self.LATENCIAS = {
+            'L1': 1,
+            'L2': 3,
+            'SNOOP': 10,  # Broadcast en el bus + respuestas
+            'C2C': 30,    # Transferencia cache a cache
+            'L3': 15,
+            'RAM': 100,
+        }
+
+        # Tamaños en bytes
+        self.TAMAÑOS = {
+            'L1': 64 * 1024,        # 64 KB por núcleo
+            'L2': 512 * 1024,       # 512 KB por núcleo
+            'L3': 16 * 1024 * 1024, # 16 MB compartidos
+        }
+
+        self.CACHE_LINE_SIZE = line_size
+        self.nucleos = [Nucleo(i, self.TAMAÑOS, line_size, asociatividad, politica)
+                        for i in range(nucleos)]
+        self.L3 = CacheAsociativo(self.TAMAÑOS['L3'], line_size, asociatividad, politica)
+
+        # Estadísticas globales (bus y L3)
+        self.stats = {
+            'BusRd': 0,
+            'BusRdX': 0,
+            'BusUpgr': 0,
+            'invalidaciones': 0,
+            'cache_a_cache': 0,
+            'writebacks': 0,
+            'L3_hits': 0,
+            'L3_misses': 0,
+            'RAM_writes': 0,
+            'bytes_coherencia': 0,  # Tráfico total en el bus de snoop
+        }
+
+    # ========================================
+    # ACCESO DE UN NÚCLEO
+    # ========================================
+
+    def acceder(self, n, address, escritura=False, tamaño=4):
+        """
+        Un acceso del núcleo n
+
+        Returns:
+            int: latencia en ns (también avanza el reloj del núcleo)
+        """
+        nucleo = self.nucleos[n]
+        line_addr = (address // self.CACHE_LINE_SIZE) * self.CACHE_LINE_SIZE
+        mascara = ((1 << tamaño) - 1) << (address - line_addr)
+        stats = nucleo.stats
+        stats['accesos'] += 1
+
+        estado = nucleo.estado.get(line_addr)
+        if estado is not None:
+            # Hit privado (L1 o L2)
+            latencia = self.LATENCIAS['L1']
+            if nucleo.L1.buscar(line_addr) is not None:
+                stats['L1_hits'] += 1
+            else:
+                nucleo.L2.buscar(line_addr)
+                stats['L2_hits'] += 1
+                latencia += self.LATENCIAS['L2']
+                nucleo.L1.insertar(line_addr, line_addr)
+            if escritura and estado != MODIFIED:
+                if estado == SHARED:
+                    self.stats['BusUpgr'] += 1
+                    self.stats['bytes_coherencia'] += BYTES_CONTROL
+                    latencia += self.LATENCIAS['SNOOP']
+                    self._invalidar_otros(n, line_addr, mascara)
+                # E → M es silencioso
+                nucleo.estado[line_addr] = MODIFIED
+        else:
+            # Miss privado: petición en el bus
+            stats['misses_privados'] += 1
+            escritos = nucleo.invalidadas.pop(line_addr, None)
+            if escritos is not None:
+                stats['misses_coherencia'] += 1
+                if not escritos & mascara:
+                    stats['falso_compartir'] += 1
+
+            latencia = self.LATENCIAS['L1'] + self.LATENCIAS['L2'] + self.LATENCIAS['SNOOP']
+            if escritura:
+                self.stats['BusRdX'] += 1
+                proveedor = self._invalidar_otros(n, line_addr, mascara)
+                nuevo = MODIFIED
+            else:
+                self.stats['BusRd'] += 1
+                proveedor, compartida = self._compartir(n, line_addr)
+                nuevo = SHARED if compartida else EXCLUSIVE
+            self.stats['bytes_coherencia'] += BYTES_CONTROL + self.CACHE_LINE_SIZE
+
+            if proveedor:
+                self.stats['cache_a_cache'] += 1
+                latencia += self.LATENCIAS['C2C']
+            else:
+                latencia += self._leer_l3(line_addr)
+            self._llenar_privadas(nucleo, line_addr)
+            nucleo.estado[line_addr] = nuevo
+
+        nucleo.reloj += latencia
+        return latencia
+
+    def _invalidar_otros(self, n, line_addr, mascara):
+        """
+        Invalida la línea en todos los núcleos menos n
+
+        Returns:
+            bool: True si un dueño en M la pasó directamente
+        """
+        proveedor = False
+        for otro in self.nucleos:
+            if otro.id == n:
+                continue
+            estado = otro.estado.pop(line_addr, None)
+            if estado is None:
+                continue
+            self.stats['invalidaciones'] += 1
+            otro.L1.invalidar(line_addr)
+            otro.L2.invalidar(line_addr)
+            otro.invalidadas[line_addr] = mascara
+            if estado == MODIFIED:
+                self._write_back_l3(line_addr)
+                proveedor = True
+        return proveedor
+
+    def _compartir(self, n, line_addr):
+        """
+        BusRd: las demás copias pasan a S (un dueño M hace flush a L3)
+
+        Returns:
+            tuple: (alguien la pasó cache a cache, hay más copias)
+        """
+        proveedor = compartida = False
+        for otro in self.nucleos:
+            if otro.id == n:
+                continue
+            estado = otro.estado.get(line_addr)
+            if estado is None:
+                continue
+            compartida = True
+            if estado == MODIFIED:
+                self._write_back_l3(line_addr)
+            if estado != SHARED:
+                proveedor = True
+                otro.estado[line_addr] = SHARED
+        return proveedor, compartida
+
+    def _llenar_privadas(self, nucleo, line_addr):
+        """Inserta en L2 y L1 del núcleo; lo que sale de L2 sale también de L1 (inclusión)"""
+        victima = nucleo.L2.insertar(line_addr, line_addr)
+        if victima is not None:
+            linea_victima = victima[0]
+            nucleo.L1.invalidar(linea_victima)
+            if nucleo.estado.pop(linea_victima, None) == MODIFIED:
+                self._write_back_l3(linea_victima)
+        nucleo.L1.insertar(line_addr, line_addr)
+
+    def _leer_l3(self, line_addr):
+        """Lee de la L3 compartida (o de RAM); devuelve la latencia"""
+        if self.L3.buscar(line_addr) is not None:
+            self.stats['L3_hits'] += 1
+            return self.LATENCIAS['L3']
+        self.stats['L3_misses'] += 1
+        self._insertar_l3(line_addr)
+        return self.LATENCIAS['L3'] + self.LATENCIAS['RAM']
+
+    def _write_back_l3(self, line_addr):
+        """Una línea M vuelve a L3 (queda sucia ahí)"""
+        self.stats['writebacks'] += 1
+        self.stats['bytes_coherencia'] += self.CACHE_LINE_SIZE
+        if line_addr not in self.L3:
+            self._insertar_l3(line_addr)
+        self.L3.marcar_sucia(line_addr)
+
+    def _insertar_l3(self, line_addr):
+        victima = self.L3.insertar(line_addr, line_addr)
+        if victima is not None and victima[2]:
+            self.stats['RAM_writes'] += 1
+
+    # ========================================
+    # EJECUCIÓN EN PARALELO
+    # ========================================
+
+    def ejecutar(self, trazas, computo_ns=0):
+        """
+        Reproduce una traza por núcleo "en paralelo"
+
+        Siempre avanza el núcleo con el reloj más atrasado, así los accesos
+        se intercalan como en una ejecución real.
+
+        Args:
+            trazas: lista (una por núcleo) de arrays de direcciones, o de
+                    tuplas (direcciones, escrituras) con escrituras booleanas
+            computo_ns: trabajo entre dos accesos del mismo núcleo
+
+        Returns:
+            int: tiempo total en ns (el núcleo que termina último)
+        """
+        listas = []
+        for traza in trazas:
+            if isinstance(traza, tuple):
+                direcciones, escrituras = traza
+            else:
+                direcciones, escrituras = traza, np.zeros(len(traza), dtype=bool)
+            listas.append((np.asarray(direcciones).tolist(), np.asarray(escrituras).tolist()))
+
+        cola = [(self.nucleos[n].reloj, n, 0) for n, (dirs, _) in enumerate(listas) if dirs]
+        heapq.heapify(cola)
+        while cola:
+            _, n, i = heapq.heappop(cola)
+            direcciones, escrituras = listas[n]
+            self.acceder(n, direcciones[i], escrituras[i])
+            nucleo = self.nucleos[n]
+            nucleo.reloj += computo_ns
+            if i + 1 < len(direcciones):
+                heapq.heappush(cola, (nucleo.reloj, n, i + 1))
+        return max(nucleo.reloj for nucleo in self.nucleos)
+
+    def total(self, clave):
+        """Suma un contador de todos los núcleos"""
+        return sum(nucleo.stats[clave] for nucleo in self.nucleos)
+
+    def mostrar_estadisticas(self):
+        """Muestra estadísticas por núcleo y del bus de coherencia"""
+        print("\n" + "="*70)
+        print(f"📊 ESTADÍSTICAS MULTINÚCLEO ({len(self.nucleos)} núcleos, MESI)")
+        print("="*70)
+
+        print(f"\n{'Núcleo':<8} {'Accesos':>10} {'L1 hit%':>8} {'Miss priv.':>11} "
+              f"{'Coherencia':>11} {'Falso comp.':>12} {'Reloj (ns)':>12}")
+        print("-" * 78)
+        for nucleo in self.nucleos:
+            s = nucleo.stats
+            hit_rate = s['L1_hits'] / s['accesos'] * 100 if s['accesos'] else 0.0
+            print(f"{nucleo.id:<8} {s['accesos']:>10,} {hit_rate:>7.1f}% {s['misses_privados']:>11,} "
+                  f"{s['misses_coherencia']:>11,} {s['falso_compartir']:>12,} {nucleo.reloj:>12,}")
+
+        print(f"\n🚌 Bus de coherencia:")
+        print(f"   BusRd: {self.stats['BusRd']:,} | BusRdX: {self.stats['BusRdX']:,} | "
+              f"BusUpgr: {self.stats['BusUpgr']:,}")
+        print(f"   Invalidaciones: {self.stats['invalidaciones']:,}")
+        print(f"   Cache a cache:  {self.stats['cache_a_cache']:,}")
+        print(f"   Write-backs:    {self.stats['writebacks']:,}")
+        print(f"   Tráfico:        {self.stats['bytes_coherencia']:,} bytes")
+
+        print(f"\n🎯 L3 compartida:")
+        print(f"   Hits:   {self.stats['L3_hits']:,}")
+        print(f"   Misses: {self.stats['L3_misses']:,}")
+
+
+def trazas_incremento(elementos, hilos, reparto):
+    """
+    Trazas de `a[i] += 1` sobre un array de int32 repartido entre hilos
+
+    reparto='bloques':     cada hilo recorre un trozo contiguo
+    reparto='intercalado': el hilo t hace los i con i % hilos == t (falso compartir)
+    """
+    indices = np.arange(elementos)
+    trazas = []
+    for t in range(hilos):
+        if reparto == 'bloques':
+            mios = np.array_split(indices, hilos)[t]
+        else:
+            mios = indices[t::hilos]
+        direcciones = np.repeat(mios * 4, 2)                # load a[i]; store a[i]
+        escrituras = np.tile([False, True], len(mios))
+        trazas.append((direcciones, escrituras))
+    return trazas
+
+
+if __name__ == "__main__":
+    # ========================================
+    # EXPERIMENTO: ¿Escala a[i] += 1 con más hilos?
+    # ========================================
+    print("=" * 70)
+    print("🧵 ESCALABILIDAD: a[i] += 1 sobre 32K enteros (128 KB)")
+    print("=" * 70)
+
+    elementos = 32 * 1024
+    for reparto in ('bloques', 'intercalado'):
+        print(f"\nReparto: {reparto}")
+        print(f"{'Hilos':<6} {'Tiempo (μs)':>12} {'Speedup':>8} {'Invalid.':>10} "
+              f"{'Falso comp.':>12} {'Tráfico (KB)':>13}")
+        print("-" * 70)
+        base = None
+        for hilos in (1, 2, 4, 8):
+            sistema = SistemaMultinucleo(nucleos=hilos)
+            tiempo = sistema.ejecutar(trazas_incremento(elementos, hilos, reparto), computo_ns=1)
+            base = base or tiempo
+            print(f"{hilos:<6} {tiempo / 1000:>12.1f} {base / tiempo:>7.2f}x "
+                  f"{sistema.stats['invalidaciones']:>10,} {sistema.total('falso_compartir'):>12,} "
+                  f"{sistema.stats['bytes_coherencia'] / 1024:>13.1f}")
+
+    print("\n💡 Con reparto intercalado, varios hilos escriben la MISMA línea de")
+    print("   64 bytes: cada store invalida las copias de los demás (falso compartir)")
+    print("   y el tiempo deja de bajar aunque haya más núcleos.")
+
+    sistema = SistemaMultinucleo(nucleos=4)
+    sistema.ejecutar(trazas_incremento(elementos, 4, 'intercalado'), computo_ns=1)
+    sistema.mostrar_estadisticas()
@@ -0,0 +1,366 @@
+"""
+Simulador de sistema completo: CPU + jerarquía de memoria + bus con un solo reloj
+Cada fetch, LOAD y STORE pasa por las caches; los misses viajan por el bus como Transacciones
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from eventos_bus import SimuladorEventosBus
+from simulador_bus import Bus, Transaccion
+from simulador_jerarquia_memoria import MemoryHierarchy
+
+# El CPU y los sumideros de traza viven en la semana 1
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "semana-01"))
+from simulador_de_cpu import CPU
+from trazas import SumideroNulo
+
+# Opcodes con dirección en el segundo byte: opcode → es escritura
+OPCODES_MEMORIA = {0x1: False, 0x2: True}  # LOAD, STORE
+
+
+def crear_bus_memoria(jerarquia, **opciones_bus):
+    """
+    Bus hacia la RAM cuya latencia de memoria es la de la jerarquía
+
+    El núcleo descuenta LATENCIAS['RAM'] de cada acceso que llega a RAM y la
+    reemplaza por el viaje por el bus (cola + dirección + memoria + datos),
+    así la RAM no se cuenta dos veces.
+
+    Args:
+        jerarquia: MemoryHierarchy de donde sale la latencia de la RAM
+        **opciones_bus: argumentos de Bus (ancho_bits, modo, arbitraje, ...)
+    """
+    frecuencia_mhz = opciones_bus.setdefault('frecuencia_mhz', 5000)
+    opciones_bus.setdefault('latencia_memoria_ciclos',
+                            round(jerarquia.LATENCIAS['RAM'] * frecuencia_mhz / 1000))
+    return Bus(**opciones_bus)
+
+
+class NucleoCPU:
+    """
+    La CPU de 8 bits de la semana 1 con su jerarquía de memoria, como agente del simulador de eventos
+
+    La CPU hace el trabajo funcional (registros, flags y memoria terminan
+    igual que con CPU.ejecutar_programa); el núcleo le agrega el tiempo.
+    Cada instrucción cuesta sus ciclos base (3, o 2 el HALT) más sus accesos
+    a memoria, en orden y bloqueantes:
+
+        fetch del opcode → (LOAD/STORE) fetch de la dirección → dato
+
+    Un acceso que se resuelve en las caches cuesta su latencia en la
+    jerarquía. Si llega a RAM, la línea viaja por el bus como un READ y la
+    CPU espera a que vuelva; las escrituras a RAM (write-back de líneas
+    sucias o write-through) salen como WRITE sin bloquear (buffer de
+    escritura). Los prefetches y las faltas de página (SSD) se quedan
+    dentro del modelo de la jerarquía.
+    """
+
+    def __init__(self, sim, jerarquia=None, nombre='CPU0', frecuencia_ghz=2.5, base=0, prioridad=8):
+        """
+        Args:
+            sim: SimuladorEventosBus compartido (su reloj es el del sistema)
+            jerarquia: MemoryHierarchy privada del núcleo (por defecto una nueva);
+                       el núcleo usa su lista escrituras_ram
+            base: dirección física de memoria[0] de la CPU
+            prioridad: de sus transacciones en el bus (las escrituras van con una menos)
+        """
+        self.sim = sim
+        self.nombre = nombre
+        self.jerarquia = jerarquia or MemoryHierarchy()
+        self.ciclo_ns = 1 / frecuencia_ghz
+        self.base = base
+        self.prioridad = prioridad
+        self.cpu = CPU(traza=SumideroNulo())
+
+        self.inicio = None
+        self.fin = None
+        self.stats = {
+            'accesos_fetch': 0,
+            'accesos_datos': 0,
+            'lecturas_bus': 0,    # Líneas traídas de RAM (la CPU las espera)
+            'escrituras_bus': 0,  # Escrituras a RAM (no bloquean)
+            'ns_cache': 0.0,      # Tiempo en las caches (hits y búsqueda de los misses)
+            'ns_bus': 0.0,        # Esperando líneas de RAM: cola + bus + memoria
+        }
+
+        self._programa = b''
+        self._restantes = 0
+        self._accesos = iter(())
+        self._pc_fisico = 0
+        self._base_ns = 0.0     # Ciclos base de la instrucción en curso
+        self._halt = False
+        self._pendientes = 0    # READs en el bus que la CPU espera
+        self._marca = 0.0       # Cuándo salieron esos READs
+        self._vacio = memoryview(bytes(self.jerarquia.CACHE_LINE_SIZE))
+        self._escrituras = self.jerarquia.escrituras_ram = []  # Víctimas y write-through
+        sim.suscribir(nombre, self._volvio)
+
+    def ejecutar(self, programa, repeticiones=1):
+        """
+        Empieza a ejecutar `programa` en el instante actual del simulador
+
+        Args:
+            programa: bytes o lista de ints, como CPU.ejecutar_programa
+            repeticiones: veces seguidas (se recarga el programa y PC=0;
+                          las caches quedan calientes)
+        """
+        self._programa = bytes(programa)
+        self._restantes = repeticiones
+        # El programa ya está en RAM (cargado por el SO): no hay faltas de página
+        self.jerarquia.precargar_ram([self.base, self.base + len(self.cpu.memoria) - 1])
+        self.inicio = self.sim.reloj
+        self.sim.en(self.sim.reloj, self._arrancar)
+
+    def _arrancar(self):
+        self.cpu.cargar(self._programa)
+        self.cpu.PC = 0
+        self._halt = False
+        self._instruccion()
+
+    def _instruccion(self):
+        cpu = self.cpu
+        memoria = cpu.memoria
+        pc = cpu.PC
+        if self._halt or pc >= len(self._programa):
+            self._restantes -= 1
+            if self._restantes > 0:
+                self._arrancar()
+            else:
+                self.fin = self.sim.reloj
+            return
+
+        # Accesos que hará la instrucción (leídos antes de ejecutarla)
+        accesos = [(False, pc)]
+        escritura = OPCODES_MEMORIA.get(memoria[pc] >> 4)
+        if escritura is not None and pc + 1 < len(memoria):
+            accesos.append((False, pc + 1))
+            accesos.append((escritura, memoria[pc + 1]))
+        self.stats['accesos_fetch'] += min(len(accesos), 2)
+        self.stats['accesos_datos'] += len(accesos) > 2
+
+        ciclos = cpu.ciclos
+        cpu.fetch()
+        opcode, operando = cpu.decode()
+        self._halt = not cpu.execute(opcode, operando)
+
+        self._base_ns = (cpu.ciclos - ciclos) * self.ciclo_ns
+        self._pc_fisico = self.base + pc
+        self._accesos = iter(accesos)
+        self._acceder()
+
+    def _acceder(self):
+        """Hace los accesos que faltan; se corta si uno tiene que esperar al bus"""
+        sim = self.sim
+        jerarquia = self.jerarquia
+        stats = jerarquia.stats
+        ram_ns = jerarquia.LATENCIAS['RAM']
+        demora = 0.0
+        for escritura, direccion in self._accesos:
+            ahora = sim.reloj + demora
+            if jerarquia.reloj < ahora:
+                jerarquia.avanzar(ahora - jerarquia.reloj)  # Mismo reloj para los prefetches
+            lecturas = stats['RAM_accesses']
+            fisica = self.base + direccion
+            if escritura:
+                latencia, _ = jerarquia.escribir_memoria(fisica, tamaño=1)
+            else:
+                _, latencia, _ = jerarquia.leer_memoria(fisica, self._pc_fisico)
+            lecturas = stats['RAM_accesses'] - lecturas
+            escrituras = self._escrituras
+
+            # Lo que la jerarquía cobró por la RAM ahora lo decide el bus
+            local = latencia - (lecturas + len(escrituras)) * ram_ns
+            demora += local
+            self.stats['ns_cache'] += local
+
+            # Una WRITE por línea escrita, en su propia dirección (víctima o write-through)
+            for destino, tamaño in escrituras:
+                self._pedir('WRITE', destino, tamaño, self.prioridad - 1, ahora + local)
+            self.stats['escrituras_bus'] += len(escrituras)
+            escrituras.clear()
+            if lecturas:
+                linea = fisica - fisica % jerarquia.CACHE_LINE_SIZE
+                self._pendientes = lecturas
+                self._marca = ahora + local
+                for _ in range(lecturas):
+                    self._pedir('READ', linea, jerarquia.CACHE_LINE_SIZE, self.prioridad, self._marca)
+                self.stats['lecturas_bus'] += lecturas
+                return  # _volvio sigue con el resto
+        sim.en(sim.reloj + demora + self._base_ns, self._instruccion)
+
+    def _pedir(self, tipo, direccion, tamaño, prioridad, tiempo):
+        self.sim.programar(Transaccion(self.nombre, 'RAM', direccion, tipo, self._vacio[:tamaño],
+                                       tamaño, prioridad, tiempo))
+
+    def _volvio(self, trans):
+        if trans.tipo != 'READ':
+            return  # Escritura posteada: nadie la espera
+        self._pendientes -= 1
+        if self._pendientes == 0:
+            self.stats['ns_bus'] += self.sim.reloj - self._marca
+            self._acceder()
+
+    # ========================================
+    # Métricas
+    # ========================================
+
+    def ciclos_totales(self):
+        return (self.fin - self.inicio) / self.ciclo_ns if self.fin is not None else 0.0
+
+    def cpi(self):
+        """CPI de punta a punta: ciclos base + esperas de memoria"""
+        return self.ciclos_totales() / max(self.cpu.instrucciones_ejecutadas, 1)
+
+    def desglose_cpi(self):
+        """
+        Returns:
+            dict: ciclos por instrucción de cada parte ('base', 'cache', 'bus'); suman el CPI
+        """
+        n = max(self.cpu.instrucciones_ejecutadas, 1)
+        return {
+            'base': self.cpu.ciclos / n,
+            'cache': self.stats['ns_cache'] / self.ciclo_ns / n,
+            'bus': self.stats['ns_bus'] / self.ciclo_ns / n,
+        }
+
+    def mostrar_estadisticas(self):
+        desglose = self.desglose_cpi()
+        stats = self.jerarquia.stats
+        accesos = stats['L1_hits'] + stats['L1_misses']
+        print(f"\n🖥️  {self.nombre}: {self.cpu.instrucciones_ejecutadas:,} instrucciones en "
+              f"{self.ciclos_totales():,.0f} ciclos")
+        print(f"   CPI: {self.cpi():.2f} = {desglose['base']:.2f} base + "
+              f"{desglose['cache']:.2f} caches + {desglose['bus']:.2f} bus/RAM")
+        print(f"   Accesos: {self.stats['accesos_fetch']:,} fetch + {self.stats['accesos_datos']:,} datos | "
+              f"hit L1: {stats['L1_hits'] / max(accesos, 1) * 100:.1f}%")
+        print(f"   Bus: {self.stats['lecturas_bus']:,} líneas leídas, "
+              f"{self.stats['escrituras_bus']:,} escrituras")
+
+
+class Sistema:
+    """
+    Varios núcleos, cada uno con su jerarquía privada, que comparten un bus a RAM
+
+    Un solo SimuladorEventosBus lleva el reloj: los misses de todos los
+    núcleos compiten por el bus, así la contención aparece en el CPI.
+    """
+
+    def __init__(self, nucleos=1, frecuencia_ghz=2.5, jerarquia=None, **opciones_bus):
+        """
+        Args:
+            nucleos: cantidad de CPUs
+            jerarquia: dict de argumentos de MemoryHierarchy (iguales para todos)
+            **opciones_bus: argumentos de Bus (ver crear_bus_memoria)
+        """
+        jerarquias = [MemoryHierarchy(**(jerarquia or {})) for _ in range(nucleos)]
+        self.sim = SimuladorEventosBus(crear_bus_memoria(jerarquias[0], **opciones_bus))
+        # Cada núcleo en su propia región física (no comparten líneas)
+        self.nucleos = [NucleoCPU(self.sim, j, f'CPU{i}', frecuencia_ghz, base=i << 20)
+                        for i, j in enumerate(jerarquias)]
+
+    def ejecutar(self, programa, repeticiones=1):
+        """Todos los núcleos arrancan a la vez con el mismo programa"""
+        for nucleo in self.nucleos:
+            nucleo.ejecutar(programa, repeticiones)
+        self.sim.ejecutar()
+
+    def cpi(self):
+        """CPI promedio de los núcleos"""
+        return sum(n.cpi() for n in self.nucleos) / len(self.nucleos)
+
+    def mostrar_estadisticas(self):
+        for nucleo in self.nucleos:
+            nucleo.mostrar_estadisticas()
+        print(f"\n🚌 Bus: uso {self.sim.utilizacion() * 100:.1f}% | "
+              f"espera p99 {self.sim.percentiles((99,))[99]:.1f} ns")
+
+
+def programa_suma(paso=0x10):
+    """
+    Suma los bytes en 0x40, 0x40+paso, ... y guarda el total en [0x3F]
+
+    Returns:
+        list: código + relleno + datos (256 bytes como máximo)
+    """
+    codigo = []
+    for direccion in range(0x40, 0x100, paso):
+        codigo += [0x11, direccion, 0x31]  # LOAD R1, [dir]; ADD R0, R1
+    codigo += [0x20, 0x3F, 0xF0]            # STORE [0x3F], R0; HALT
+    datos = [(k + 1) & 0xFF for k in range(0xC0)]
+    return codigo + [0] * (0x40 - len(codigo)) + datos
+
+
+if __name__ == "__main__":
+    programa = programa_suma()
+
+    # ========================================
+    # EXPERIMENTO 1: El CPI que ve la CPU de la semana 1 vs el de verdad
+    # ========================================
+    print("=" * 70)
+    print("🖥️  SISTEMA COMPLETO: CPU + caches + bus con un solo reloj")
+    print("=" * 70)
+
+    referencia = CPU(traza=SumideroNulo())
+    referencia.ejecutar_programa(programa)
+    print(f"\n   CPU sola (memoria ideal): CPI {referencia.ciclos / referencia.instrucciones_ejecutadas:.2f}")
+
+    sistemas = []
+    for repeticiones, titulo in ((1, "una vez, en frío"), (1000, "1000 veces (caches calientes)")):
+        sistema = Sistema(jerarquia={'line_size': 16})
+        sistema.ejecutar(programa, repeticiones)
+        sistemas.append(sistema)
+        print(f"\n   ── {titulo} ──", end="")
+        sistema.nucleos[0].mostrar_estadisticas()
+
+    cpu = sistemas[0].nucleos[0].cpu
+    assert cpu.ciclos == referencia.ciclos
+    assert bytes(cpu.registros) == bytes(referencia.registros)
+    assert bytes(cpu.memoria) == bytes(referencia.memoria)
+    print(f"\n   ✅ Mismo estado final que CPU.ejecutar_programa (R0 = {cpu.registros[0]})")
+
+    # ========================================
+    # EXPERIMENTO 2: Núcleos que compiten por el bus
+    # ========================================
+    print("\n" + "=" * 70)
+    print("🚌 CONTENCIÓN: N núcleos arrancan en frío a la vez")
+    print("=" * 70)
+
+    print(f"\n   {'Núcleos':>8}  {'simple':>8}  {'split':>8}  {'uso bus (simple)':>17}")
+    for nucleos in (1, 2, 4, 8, 16):
+        fila = []
+        for modo in ('simple', 'split'):
+            sistema = Sistema(nucleos, jerarquia={'line_size': 16}, modo=modo)
+            sistema.ejecutar(programa)
+            fila.append(sistema)
+        print(f"   {nucleos:>8}  {fila[0].cpi():>8.2f}  {fila[1].cpi():>8.2f}  "
+              f"{fila[0].sim.utilizacion() * 100:>16.1f}%")
+
+    # ========================================
+    # EXPERIMENTO 3: Velocidad del simulador
+    # ========================================
+    sistema = Sistema(4, jerarquia={'line_size': 16})
+    t0 = time.perf_counter()
+    sistema.ejecutar(programa, 2000)
+    segundos = time.perf_counter() - t0
+    instrucciones = sum(n.cpu.instrucciones_ejecutadas for n in sistema.nucleos)
+    print(f"\n⚡ 4 núcleos x 2000 repeticiones: {instrucciones:,} instrucciones en {segundos:.2f} s "
+          f"({instrucciones / segundos:,.0f} instr/s)")
+
+    print("\n" + "=" * 70)
+    print("💡 LECCIONES:")
+    print("=" * 70)
+    print("""
+1. CPI = CPI base + esperas de memoria: la CPU "de 3 ciclos" de la
+   semana 1 supone memoria ideal; con caches reales el CPI real es mayor.
+
+2. En frío casi todo el tiempo se va en traer líneas de RAM; con caches
+   calientes solo queda la latencia de L1 en cada fetch y cada dato.
+
+3. Con varios núcleos los misses hacen cola en el mismo bus: el CPI sube
+   aunque cada núcleo tenga sus propias caches.
+
+4. Un bus split suelta el bus mientras la RAM busca el dato: los misses de
+   otros núcleos se solapan y la contención baja.
+""")
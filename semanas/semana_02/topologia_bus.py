@@ -0,0 +1,431 @@
+"""
+Topología de interconexión: varios Bus conectados en un grafo
+Canales de memoria, PCIe directo y por chipset, enlace NUMA; transferencias salto a salto
+"""
+
+import heapq
+import itertools
+import time
+
+from simulador_bus import Bus, Transaccion
+
+# Tipos de evento: a igual tiempo se procesa antes el FIN (libera el enlace)
+FIN, LLEGADA = 0, 1
+
+# Payload máximo por paquete (PCIe Max Payload Size típico)
+MTU = 256
+# Paquetes en vuelo por transferencia (créditos / tags de un motor DMA)
+VENTANA = 64
+
+
+class Enlace:
+    """
+    Un enlace entre dos nodos, modelado con uno o dos Bus
+
+    - duplex=True  → un Bus por sentido (PCIe, UPI: carriles separados)
+    - duplex=False → un solo Bus compartido por ambos sentidos (canal DDR)
+
+    Solo modo 'simple': los paquetes ya son la unidad del enlace (MTU) y la
+    Topologia cobra cada uno con ciclos_transaccion; ráfagas, pipeline y
+    split son del SimuladorEventosBus.
+    """
+    __slots__ = ('nombre', 'a', 'b', 'latencia_ns', 'buses')
+
+    def __init__(self, nombre, a, b, latencia_ns=0.0, duplex=True, **opciones_bus):
+        modo = opciones_bus.get('modo', 'simple')
+        if modo != 'simple':
+            raise ValueError(f"Enlace {nombre}: modo '{modo}' no soportado en la topología "
+                             f"(solo 'simple'; los demás modos van con SimuladorEventosBus)")
+        self.nombre = nombre
+        self.a = a
+        self.b = b
+        self.latencia_ns = latencia_ns  # Propagación + serialización del switch
+        ida = Bus(**opciones_bus)
+        self.buses = {(a, b): ida, (b, a): Bus(**opciones_bus) if duplex else ida}
+
+    def bus(self, desde, hacia):
+        return self.buses[(desde, hacia)]
+
+    @property
+    def bandwidth_bps(self):
+        return self.buses[(self.a, self.b)].bandwidth_bps
+
+
+class Transferencia:
+    """Una copia origen → destino, partida en paquetes de hasta MTU bytes"""
+    __slots__ = ('origen', 'destino', 'tamaño', 'inicio', 'fin', 'ruta',
+                 'tipo', 'prioridad', 'direccion', 'enviados', 'en_vuelo', 'datos')
+
+    def __init__(self, origen, destino, tamaño, inicio, ruta, tipo, prioridad, direccion,
+                 datos=None):
+        self.origen = origen
+        self.destino = destino
+        self.tamaño = tamaño
+        self.inicio = inicio
+        self.fin = None
+        self.ruta = ruta     # Lista de (Bus, latencia_ns, nombre) salto a salto
+        self.tipo = tipo
+        self.prioridad = prioridad
+        self.direccion = direccion
+        self.enviados = 0    # Bytes ya inyectados en la red
+        self.en_vuelo = 0    # Paquetes inyectados aún sin entregar
+        self.datos = datos   # memoryview del buffer fuente (o None)
+
+    @property
+    def latencia(self):
+        """ns desde que se pidió hasta que llegó el último byte"""
+        return None if self.fin is None else self.fin - self.inicio
+
+    @property
+    def bandwidth(self):
+        """Bytes/s extremo a extremo"""
+        return self.tamaño / self.latencia * 1e9 if self.latencia else 0.0
+
+
+class Topologia:
+    """
+    Grafo de nodos (CPU, RAM, GPU, chipset...) unidos por Enlaces
+
+    Cada transferencia se parte en paquetes; cada paquete recorre la ruta
+    salto a salto: espera en la cola de arbitraje del Bus de ese enlace, lo
+    ocupa `ciclos_transaccion` ciclos, tarda `latencia_ns` en cruzar y entra
+    a la cola del siguiente. Como los paquetes avanzan por separado, una
+    transferencia larga usa todos los enlaces de la ruta a la vez
+    (pipelining), y el enlace más lento o más cargado marca el ritmo.
+
+    Cada transferencia tiene a lo sumo `ventana` paquetes en vuelo: cuando
+    uno se entrega entra el siguiente (control de flujo por créditos), así
+    las transferencias que comparten un enlace se intercalan.
+    """
+
+    def __init__(self, mtu=MTU, ventana=VENTANA):
+        self.mtu = mtu
+        self.ventana = ventana
+        self.enlaces = {}   # nombre → Enlace
+        self.vecinos = {}   # nodo → lista de (vecino, Enlace)
+        self.transferencias = []
+        self.reloj = 0.0    # ns simulados
+
+        self._eventos = []  # heap de (tiempo, tipo, secuencia, paquete, bus)
+        self._secuencia = itertools.count()
+        self._paquetes = {}     # id(paquete) → [Transferencia, salto actual]
+        self._rutas = {}        # (origen, destino) → ruta (cache)
+        self._a_arbitrar = set()
+        self._ceros = memoryview(bytes(mtu))  # Payload compartido de los paquetes
+
+    # ========================================
+    # Construcción del grafo
+    # ========================================
+
+    def agregar_enlace(self, nombre, a, b, latencia_ns=0.0, duplex=True, **opciones_bus):
+        """
+        Conecta los nodos a y b
+
+        Args:
+            opciones_bus: argumentos de Bus (ancho_bits, frecuencia_mhz, arbitraje...);
+                          modo solo 'simple' (ver Enlace)
+        """
+        enlace = Enlace(nombre, a, b, latencia_ns, duplex, **opciones_bus)
+        self.enlaces[nombre] = enlace
+        self.vecinos.setdefault(a, []).append((b, enlace))
+        self.vecinos.setdefault(b, []).append((a, enlace))
+        self._rutas.clear()
+        return enlace
+
+    def ruta(self, origen, destino):
+        """
+        Camino más rápido para un paquete de MTU bytes (Dijkstra)
+
+        Costo de un enlace = tiempo de transmitir un paquete + latencia.
+
+        Returns:
+            list: (Bus, latencia_ns, nombre del enlace) por salto
+        """
+        clave = (origen, destino)
+        if clave in self._rutas:
+            return self._rutas[clave]
+        if origen not in self.vecinos or destino not in self.vecinos:
+            raise ValueError(f"Nodo desconocido: {origen if origen not in self.vecinos else destino}")
+
+        mejor = {origen: 0.0}
+        previo = {}
+        cola = [(0.0, origen)]
+        while cola:
+            costo, nodo = heapq.heappop(cola)
+            if nodo == destino:
+                break
+            if costo > mejor[nodo]:
+                continue
+            for vecino, enlace in self.vecinos[nodo]:
+                nuevo = costo + self.mtu / enlace.bandwidth_bps * 1e9 + enlace.latencia_ns
+                if nuevo < mejor.get(vecino, float('inf')):
+                    mejor[vecino] = nuevo
+                    previo[vecino] = (nodo, enlace)
+                    heapq.heappush(cola, (nuevo, vecino))
+        if destino not in previo and origen != destino:
+            raise ValueError(f"No hay camino de {origen} a {destino}")
+
+        saltos = []
+        nodo = destino
+        while nodo != origen:
+            anterior, enlace = previo[nodo]
+            saltos.append((enlace.bus(anterior, nodo), enlace.latencia_ns, enlace.nombre))
+            nodo = anterior
+        saltos.reverse()
+        self._rutas[clave] = saltos
+        return saltos
+
+    # ========================================
+    # Transferencias
+    # ========================================
+
+    def transferir(self, origen, destino, tamaño=None, tiempo_ns=0.0, prioridad=5, tipo='WRITE',
+                   direccion=0, datos=None):
+        """
+        Programa una copia de `tamaño` bytes de origen a destino
+
+        Args:
+            datos: buffer fuente opcional (bytes, array de NumPy, mmap...); cada
+                   paquete lleva una vista de su trozo, sin copiar. Sin
+                   `tamaño`, se copia el buffer entero.
+
+        Si origen y destino son el mismo nodo la ruta no tiene saltos: la
+        transferencia no ocupa ningún enlace y termina en `tiempo_ns`.
+
+        Returns:
+            Transferencia: se completa (fin, latencia, bandwidth) al ejecutar()
+        """
+        vista = None
+        if datos is not None:
+            vista = memoryview(datos)
+            if vista.ndim != 1 or vista.format != 'B':
+                vista = vista.cast('B')
+            if tamaño is None:
+                tamaño = vista.nbytes
+            elif tamaño > vista.nbytes:
+                raise ValueError(f"El buffer tiene {vista.nbytes} B, se pidieron {tamaño} B")
+        elif tamaño is None:
+            raise ValueError("Hace falta `tamaño` o `datos`")
+        ruta = self.ruta(origen, destino)
+        transferencia = Transferencia(origen, destino, tamaño, tiempo_ns, ruta,
+                                      tipo, prioridad, direccion, vista)
+        self.transferencias.append(transferencia)
+        if not ruta:
+            transferencia.enviados = tamaño
+            transferencia.fin = tiempo_ns
+            return transferencia
+        for _ in range(self.ventana):
+            if not self._inyectar(transferencia, tiempo_ns):
+                break
+        if tamaño == 0:
+            transferencia.fin = tiempo_ns
+        return transferencia
+
+    def _inyectar(self, transferencia, tiempo):
+        """Mete el siguiente paquete de la transferencia en el primer salto"""
+        desplazamiento = transferencia.enviados
+        n = min(self.mtu, transferencia.tamaño - desplazamiento)
+        if n <= 0:
+            return False
+        if transferencia.datos is not None:
+            datos = transferencia.datos[desplazamiento:desplazamiento + n]
+        else:
+            datos = self._ceros[:n]
+        paquete = Transaccion(transferencia.origen, transferencia.destino,
+                              transferencia.direccion + desplazamiento, transferencia.tipo,
+                              datos, n, transferencia.prioridad, tiempo)
+        self._paquetes[id(paquete)] = [transferencia, 0]
+        transferencia.enviados += n
+        transferencia.en_vuelo += 1
+        heapq.heappush(self._eventos, (tiempo, LLEGADA, next(self._secuencia), paquete, None))
+        return True
+
+    def ejecutar(self, hasta_ns=None):
+        """Procesa eventos hasta entregar todo (o hasta `hasta_ns`)"""
+        eventos = self._eventos
+        while eventos:
+            if hasta_ns is not None and eventos[0][0] > hasta_ns:
+                self.reloj = hasta_ns
+                break
+            tiempo, tipo, _, paquete, bus = heapq.heappop(eventos)
+            self.reloj = tiempo
+
+            if tipo == LLEGADA:
+                estado = self._paquetes[id(paquete)]
+                bus = estado[0].ruta[estado[1]][0]
+                paquete.timestamp = tiempo
+                bus.encolar(paquete)
+                if bus.metricas is not None:
+                    bus.metricas.cola(tiempo, len(bus.cola_espera))
+                self._a_arbitrar.add(bus)
+            else:
+                self._salir(paquete, bus)
+
+            # Se arbitra cuando ya llegó todo lo de este instante
+            if self._a_arbitrar and (not eventos or eventos[0][0] > tiempo):
+                for bus in self._a_arbitrar:
+                    if not bus.ocupado and bus.cola_espera:
+                        self._conceder(bus)
+                self._a_arbitrar.clear()
+
+        for enlace in self.enlaces.values():
+            for bus in set(enlace.buses.values()):
+                if bus.metricas is not None:
+                    bus.metricas.cerrar(self.reloj)
+                periodo = 1e9 / bus.ciclos_por_segundo
+                bus.stats['ciclos_totales'] = round(self.reloj / periodo)
+                bus.stats['ciclos_idle'] = max(0, bus.stats['ciclos_totales'] - bus.stats['ciclos_ocupado'])
+        return self.reloj
+
+    def _conceder(self, bus):
+        paquete = bus.arbitrar(self.reloj)
+        bus.ocupado = True
+        ciclos = bus.ciclos_transaccion(paquete)
+        bus.stats['ciclos_ocupado'] += ciclos
+        fin = self.reloj + ciclos * 1e9 / bus.ciclos_por_segundo
+        heapq.heappush(self._eventos, (fin, FIN, next(self._secuencia), paquete, bus))
+        if bus.metricas is not None:
+            bus.metricas.cola(self.reloj, len(bus.cola_espera))
+            bus.metricas.concedida(paquete.origen, self.reloj - paquete.timestamp)
+            bus.metricas.ocupado(self.reloj, fin)
+
+    def _salir(self, paquete, bus):
+        """El paquete terminó de pasar por `bus`: sigue al próximo salto o se entrega"""
+        bus.ocupado = False
+        bus.stats['transacciones_completadas'] += 1
+        bus.stats['bytes_transferidos'] += paquete.tamaño
+        if bus.metricas is not None:
+            bus.metricas.completada(paquete.origen, paquete.tamaño,
+                                    self.reloj - paquete.timestamp, self.reloj)
+        self._a_arbitrar.add(bus)
+
+        estado = self._paquetes[id(paquete)]
+        transferencia, salto = estado
+        llegada = self.reloj + transferencia.ruta[salto][1]
+        if salto + 1 < len(transferencia.ruta):
+            estado[1] = salto + 1
+            heapq.heappush(self._eventos, (llegada, LLEGADA, next(self._secuencia), paquete, None))
+            return
+        del self._paquetes[id(paquete)]
+        transferencia.en_vuelo -= 1
+        if not self._inyectar(transferencia, llegada) and transferencia.en_vuelo == 0:
+            transferencia.fin = llegada
+
+    # ========================================
+    # Métricas
+    # ========================================
+
+    def utilizacion(self):
+        """
+        Returns:
+            dict: 'enlace (a→b)' → (utilización, bytes) de cada sentido
+        """
+        resultado = {}
+        for enlace in self.enlaces.values():
+            a, b = enlace.a, enlace.b
+            if enlace.bus(a, b) is enlace.bus(b, a):
+                sentidos = [(f"{a}↔{b}", enlace.bus(a, b))]
+            else:
+                sentidos = [(f"{a}→{b}", enlace.bus(a, b)), (f"{b}→{a}", enlace.bus(b, a))]
+            for sentido, bus in sentidos:
+                total = bus.stats['ciclos_totales']
+                uso = bus.stats['ciclos_ocupado'] / total if total else 0.0
+                resultado[f"{enlace.nombre} ({sentido})"] = (uso, bus.stats['bytes_transferidos'])
+        return resultado
+
+    def mostrar_estadisticas(self):
+        print(f"\n{'='*70}")
+        print(f"🗺️  TOPOLOGÍA ({self.reloj / 1000:,.2f} μs simulados)")
+        print(f"{'='*70}")
+
+        print(f"\n   {'Transferencia':<18} {'Tamaño':>9} {'Latencia':>12} {'GB/s':>7}  Ruta")
+        for t in self.transferencias:
+            ruta = " → ".join(nombre for _, _, nombre in t.ruta)
+            latencia = f"{t.latencia / 1000:,.2f} μs" if t.latencia is not None else "(en curso)"
+            print(f"   {t.origen + '→' + t.destino:<18} {t.tamaño / 1024**2:>6.1f} MB "
+                  f"{latencia:>12} {t.bandwidth / 1e9:>7.2f}  {ruta}")
+
+        print(f"\n   {'Enlace':<40} {'Uso':>6} {'Bytes':>12}")
+        for nombre, (uso, transferidos) in self.utilizacion().items():
+            if transferidos:
+                barra = "█" * round(uso * 20)
+                print(f"   {nombre:<40} {uso * 100:>5.1f}% {transferidos:>12,}  {barra}")
+
+
+def topologia_pc_dos_sockets(mtu=MTU):
+    """
+    Servidor de 2 sockets típico (anchos de banda por sentido)
+
+        RAM0 ══ CPU0 ══ UPI ══ CPU1 ══ RAM1
+                 ║  ╲
+       PCIe x16  ║   ╲ DMI (x8)
+                GPU0  PCH ── GPU1 (x8 vía chipset)
+                       └──── NVMe (x4)
+
+    Los enlaces PCIe se modelan como un Bus de ancho = bytes por ciclo del
+    enlace completo (x16 Gen4 ≈ 16 B a 2 GHz = 32 GB/s por sentido).
+    """
+    topo = Topologia(mtu)
+    topo.agregar_enlace("DDR5 canal 0", "RAM0", "CPU0", latencia_ns=15, duplex=False,
+                        ancho_bits=64, frecuencia_mhz=4800)
+    topo.agregar_enlace("DDR5 canal 1", "RAM1", "CPU1", latencia_ns=15, duplex=False,
+                        ancho_bits=64, frecuencia_mhz=4800)
+    topo.agregar_enlace("UPI", "CPU0", "CPU1", latencia_ns=40,
+                        ancho_bits=64, frecuencia_mhz=2600)
+    topo.agregar_enlace("PCIe4 x16", "CPU0", "GPU0", latencia_ns=100,
+                        ancho_bits=128, frecuencia_mhz=2000)
+    topo.agregar_enlace("DMI x8", "CPU0", "PCH", latencia_ns=150,
+                        ancho_bits=64, frecuencia_mhz=2000)
+    topo.agregar_enlace("PCIe4 x8 (chipset)", "PCH", "GPU1", latencia_ns=100,
+                        ancho_bits=64, frecuencia_mhz=2000)
+    topo.agregar_enlace("PCIe4 x4", "PCH", "NVMe", latencia_ns=100,
+                        ancho_bits=32, frecuencia_mhz=2000)
+    return topo
+
+
+if __name__ == "__main__":
+    MB = 1024 * 1024
+
+    # ========================================
+    # EXPERIMENTO 1: ¿Dónde está conectada la GPU?
+    # ========================================
+    print("=" * 70)
+    print("🗺️  EXPERIMENTO 1: copiar 8 MB a la GPU según el camino")
+    print("=" * 70)
+
+    for origen, destino in [("RAM0", "GPU0"), ("RAM0", "GPU1"), ("RAM1", "GPU0")]:
+        topo = topologia_pc_dos_sockets()
+        transferencia = topo.transferir(origen, destino, 8 * MB)
+        inicio = time.perf_counter()
+        topo.ejecutar()
+        segundos = time.perf_counter() - inicio
+        ruta = " → ".join(nombre for _, _, nombre in transferencia.ruta)
+        print(f"\n   {origen} → {destino}: {transferencia.latencia / 1000:,.1f} μs, "
+              f"{transferencia.bandwidth / 1e9:.2f} GB/s  ({segundos:.2f} s de simulación)")
+        print(f"   Ruta: {ruta}")
+
+    # ========================================
+    # EXPERIMENTO 2: Dos dispositivos detrás del mismo chipset
+    # ========================================
+    print("\n" + "=" * 70)
+    print("🚧 EXPERIMENTO 2: GPU1 y NVMe comparten el enlace DMI")
+    print("=" * 70)
+
+    topo = topologia_pc_dos_sockets()
+    topo.transferir("RAM0", "GPU1", 8 * MB)
+    topo.transferir("RAM0", "NVMe", 8 * MB)
+    topo.transferir("RAM1", "GPU0", 8 * MB)
+    topo.ejecutar()
+    topo.mostrar_estadisticas()
+
+    print("\n💡 El cuello de botella es el enlace más cargado de la ruta, no el de la GPU:")
+    print("   GPU1 (x8) y NVMe (x4) suman 24 GB/s pero el DMI da 16 GB/s;")
+    print("   RAM1 → GPU0 cruza de socket por UPI (NUMA) y va más lento que desde RAM0")
+
+    # Una copia dentro del mismo nodo no tiene saltos: termina al pedirse
+    topo = topologia_pc_dos_sockets()
+    local = topo.transferir("RAM0", "RAM0", 1000, tiempo_ns=50.0)
+    remota = topo.transferir("RAM0", "GPU0", 1000)
+    topo.ejecutar()
+    assert local.ruta == [] and local.fin == 50.0 and local.latencia == 0.0
+    assert remota.fin is not None
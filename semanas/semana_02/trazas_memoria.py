@@ -0,0 +1,227 @@
+"""
+Trazas de direcciones en disco para el simulador de jerarquía de memoria
+Formato binario compacto + lector con mmap (sin copias) + comando de replay
+"""
+
+import argparse
+import os
+import struct
+import tempfile
+import time
+
+import numpy as np
+
+from simulador_jerarquia_memoria import MemoryHierarchy
+
+# Formato: cabecera + registros empaquetados little-endian de tamaño fijo
+MAGIC = b'MEMT'
+VERSION = 2  # v2: tamaño de 32 bits (v1 tenía 8 y no entraban líneas ni páginas)
+# magic (4s), versión (u16), opciones (u16)
+CABECERA = struct.Struct('<4sHH')
+OPCION_TIMESTAMP = 0x1
+
+LECTURA = 0
+ESCRITURA = 1
+
+# dirección (u64), tipo (u8: 0 lectura / 1 escritura), tamaño (u32)
+REGISTRO = np.dtype([('direccion', '<u8'), ('tipo', 'u1'), ('tamaño', '<u4')])
+# ... + timestamp (u64, ciclos o ns según quien capture la traza)
+REGISTRO_TS = np.dtype(REGISTRO.descr + [('timestamp', '<u8')])
+
+# Versión 1 (solo lectura): tamaño de un byte
+REGISTRO_V1 = np.dtype([('direccion', '<u8'), ('tipo', 'u1'), ('tamaño', 'u1')])
+REGISTRO_V1_TS = np.dtype(REGISTRO_V1.descr + [('timestamp', '<u8')])
+
+TAMAÑO_MAXIMO = np.iinfo(np.uint32).max
+
+
+def dtype_registro(con_timestamp, version=VERSION):
+    """dtype de NumPy de un registro según la versión y las opciones de la cabecera"""
+    if version == 1:
+        return REGISTRO_V1_TS if con_timestamp else REGISTRO_V1
+    return REGISTRO_TS if con_timestamp else REGISTRO
+
+
+def _validar_tamaños(tamaños):
+    """Los tamaños fuera de rango se rechazan (NumPy los truncaría en silencio)"""
+    tamaños = np.asarray(tamaños)
+    if tamaños.size and (tamaños.min() < 0 or tamaños.max() > TAMAÑO_MAXIMO):
+        raise ValueError(f"Tamaño de acceso fuera de rango (0..{TAMAÑO_MAXIMO}): "
+                         f"{tamaños.min()}..{tamaños.max()}")
+    return tamaños
+
+
+class EscritorTrazaMemoria:
+    """Escribe registros de acceso a memoria en el formato binario"""
+
+    def __init__(self, ruta, con_timestamp=False):
+        self.con_timestamp = con_timestamp
+        self.dtype = dtype_registro(con_timestamp)
+        self.archivo = open(ruta, 'wb')
+        self.archivo.write(CABECERA.pack(MAGIC, VERSION, OPCION_TIMESTAMP if con_timestamp else 0))
+        self._uno = np.zeros(1, dtype=self.dtype)
+        self.registros_escritos = 0
+
+    def escribir(self, direccion, escritura=False, tamaño=4, timestamp=0):
+        """Agrega un solo acceso"""
+        registro = self._uno
+        registro['direccion'] = direccion
+        registro['tipo'] = ESCRITURA if escritura else LECTURA
+        registro['tamaño'] = _validar_tamaños(tamaño)
+        if self.con_timestamp:
+            registro['timestamp'] = timestamp
+        self.archivo.write(registro.tobytes())
+        self.registros_escritos += 1
+
+    def escribir_lote(self, direcciones, escrituras=None, tamaños=4, timestamps=None):
+        """
+        Agrega muchos accesos de una vez (arrays de NumPy o escalares que se repiten)
+
+        Args:
+            direcciones: array de direcciones
+            escrituras: array booleano (None = todo lecturas)
+            tamaños: array o escalar con el tamaño de cada acceso en bytes
+            timestamps: array (solo si la traza lleva timestamp)
+        """
+        direcciones = np.asarray(direcciones)
+        lote = np.zeros(len(direcciones), dtype=self.dtype)
+        lote['direccion'] = direcciones
+        if escrituras is not None:
+            lote['tipo'] = np.asarray(escrituras, dtype=bool)
+        lote['tamaño'] = _validar_tamaños(tamaños)
+        if self.con_timestamp and timestamps is not None:
+            lote['timestamp'] = timestamps
+        lote.tofile(self.archivo)
+        self.registros_escritos += len(lote)
+
+    def cerrar(self):
+        if not self.archivo.closed:
+            self.archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class TrazaMemoria:
+    """
+    Traza abierta con mmap: los registros NO se cargan en RAM
+
+    `registros` es un array estructurado de solo lectura sobre el archivo;
+    bloques() devuelve vistas (sin copia) de tamaño fijo.
+    """
+
+    def __init__(self, ruta):
+        with open(ruta, 'rb') as f:
+            cabecera = f.read(CABECERA.size)
+        if len(cabecera) < CABECERA.size:
+            raise ValueError(f"Archivo de traza no reconocido: {ruta}")
+        magic, version, opciones = CABECERA.unpack(cabecera)
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError(f"Archivo de traza no reconocido: {ruta}")
+
+        self.ruta = ruta
+        self.version = version
+        self.con_timestamp = bool(opciones & OPCION_TIMESTAMP)
+        self.dtype = dtype_registro(self.con_timestamp, version)
+        # El número de registros sale del tamaño del archivo (un registro
+        # incompleto al final, p. ej. por una captura cortada, se ignora)
+        n = (os.path.getsize(ruta) - CABECERA.size) // self.dtype.itemsize
+        if n > 0:
+            self.registros = np.memmap(ruta, dtype=self.dtype, mode='r',
+                                       offset=CABECERA.size, shape=(n,))
+        else:
+            self.registros = np.zeros(0, dtype=self.dtype)
+
+    def __len__(self):
+        return len(self.registros)
+
+    def bloques(self, tamaño=1 << 20):
+        """
+        Yields:
+            array estructurado con hasta `tamaño` registros (vista del mmap)
+        """
+        for inicio in range(0, len(self.registros), tamaño):
+            yield self.registros[inicio:inicio + tamaño]
+
+
+def reproducir(ruta, mem=None, bloque=1 << 20):
+    """
+    Pasa una traza completa por la jerarquía con memoria constante
+
+    Solo se tiene en RAM un bloque de registros a la vez (más los arrays
+    de resultados de ese bloque).
+
+    Returns:
+        MemoryHierarchy: la jerarquía con sus estadísticas actualizadas
+    """
+    mem = mem or MemoryHierarchy()
+    traza = TrazaMemoria(ruta)
+    for registros in traza.bloques(bloque):
+        mem.acceder_lote(registros['direccion'].astype(np.int64),
+                         registros['tipo'] == ESCRITURA, registros['tamaño'])
+    return mem
+
+
+def _generar_demo(ruta, n, semilla=0):
+    """Traza sintética: mezcla de recorridos secuenciales y saltos aleatorios"""
+    rng = np.random.default_rng(semilla)
+    with EscritorTrazaMemoria(ruta, con_timestamp=True) as escritor:
+        hechos = 0
+        while hechos < n:
+            cuantos = min(n - hechos, 1 << 16)
+            bases = rng.integers(0, 1 << 24, cuantos // 64 + 1) * 64
+            direcciones = (np.repeat(bases, 64)[:cuantos]
+                           + np.tile(np.arange(64) * 4, cuantos // 64 + 1)[:cuantos])
+            escritor.escribir_lote(direcciones, escrituras=rng.random(cuantos) < 0.3,
+                                   timestamps=np.arange(hechos, hechos + cuantos))
+            hechos += cuantos
+    return ruta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Trazas de memoria: generar y reproducir")
+    sub = parser.add_subparsers(dest='comando')
+
+    gen = sub.add_parser('generar', help="crea una traza sintética")
+    gen.add_argument('ruta')
+    gen.add_argument('-n', type=int, default=1_000_000, help="número de accesos")
+
+    rep = sub.add_parser('reproducir', help="pasa una traza por MemoryHierarchy")
+    rep.add_argument('ruta')
+    rep.add_argument('--bloque', type=int, default=1 << 20, help="registros por bloque")
+    rep.add_argument('--ways', type=int, default=None, help="asociatividad (None = total)")
+    rep.add_argument('--politica', default='LRU')
+    rep.add_argument('--escritura', default='write-back', help="write-back o write-through")
+    rep.add_argument('--no-write-allocate', action='store_true')
+
+    args = parser.parse_args(argv)
+
+    if args.comando == 'generar':
+        _generar_demo(args.ruta, args.n)
+        print(f"✅ {args.n:,} accesos escritos en {args.ruta}")
+    elif args.comando == 'reproducir':
+        traza = TrazaMemoria(args.ruta)
+        print(f"📂 {args.ruta}: {len(traza):,} registros "
+              f"({'con' if traza.con_timestamp else 'sin'} timestamp)")
+        inicio = time.perf_counter()
+        mem = MemoryHierarchy(asociatividad=args.ways, politica=args.politica,
+                              escritura=args.escritura,
+                              write_allocate=not args.no_write_allocate)
+        reproducir(args.ruta, mem, bloque=args.bloque)
+        segundos = time.perf_counter() - inicio
+        mem.mostrar_estadisticas()
+        print(f"\n⏱️  Replay: {segundos:.2f} s ({len(traza) / segundos / 1e6:.2f} M accesos/s)")
+    else:
+        # Sin argumentos: demo completa con un archivo temporal
+        with tempfile.TemporaryDirectory() as carpeta:
+            ruta = os.path.join(carpeta, 'demo.memt')
+            _generar_demo(ruta, 1_000_000)
+            print(f"📝 Traza demo: {os.path.getsize(ruta) / 1e6:.1f} MB")
+            main(['reproducir', ruta, '--bloque', str(1 << 18)])
+
+
+if __name__ == "__main__":
+    main()